@@ -0,0 +1,147 @@
+"""Packed per-member weekly availability bitmaps.
+
+``AvailabilityBitmap`` keeps, for every (group, member, week), the member's
+availability as one bit per 15-minute slot: 7 * 96 = 672 slots in 84 bytes.
+Bit ``day * 96 + slot`` is set when the member's intervals cover that whole
+slot of the week starting on Monday ``weekStart``.
+
+The ``Availability`` rows stay the source of truth. Every write recomputes the
+bitmaps of the weeks its old and new intervals touch from that member's rows,
+and :func:`rebuild_bitmaps` recomputes a whole group (or every group) when the
+index has to be repaired.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+BITMAP_BYTES = SLOTS_PER_WEEK // 8
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+_SLOT = timedelta(minutes=SLOT_MINUTES)
+_WEEK = timedelta(days=7)
+
+
+def week_of(day: date) -> date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def encode(mask: int) -> bytes:
+    return mask.to_bytes(BITMAP_BYTES, "little")
+
+
+def decode(slots: bytes) -> int:
+    return int.from_bytes(slots, "little")
+
+
+def interval_masks(start: datetime, end: datetime) -> Iterator[tuple[date, int]]:
+    """(weekStart, mask) of every week an interval covers a whole slot of."""
+    week = week_of(start.date())
+    week_midnight = datetime.combine(week, time.min, tzinfo=start.tzinfo)
+    # Only whole slots count: round the start up and the end down
+    first = -((week_midnight - start) // _SLOT)
+    last = (end - week_midnight) // _SLOT
+    while first < last:
+        upto = min(last, SLOTS_PER_WEEK)
+        yield week, ((1 << upto) - 1) ^ ((1 << first) - 1)
+        week += _WEEK
+        first, last = max(first - SLOTS_PER_WEEK, 0), last - SLOTS_PER_WEEK
+
+
+def weeks_touched(start: datetime, end: datetime) -> list[date]:
+    """Weeks an interval overlaps, including ones it covers no whole slot of."""
+    first, last = week_of(start.date()), week_of(end.date())
+    return [first + _WEEK * i for i in range((last - first).days // 7 + 1)]
+
+
+def build_masks(all_availability: Iterable) -> dict[tuple[str, date], int]:
+    """(userId, weekStart) -> mask of the given rows."""
+    masks: dict[tuple[str, date], int] = defaultdict(int)
+    for avail in all_availability:
+        for week, mask in interval_masks(avail.startDateTime, avail.endDateTime):
+            masks[(avail.userId, week)] |= mask
+    return masks
+
+
+def refresh_bitmaps(db: Session, group_id: str, user_id: str, weeks: Iterable[date]) -> None:
+    """
+    Recompute one member's bitmaps for ``weeks`` from their Availability rows.
+
+    Call within the write's transaction, before the commit; pending changes are
+    flushed first so the recomputation sees them.
+    """
+    weeks = sorted(set(weeks))
+    if not weeks:
+        return
+    db.flush()
+
+    first = datetime.combine(weeks[0], time.min)
+    last = datetime.combine(weeks[-1], time.min) + _WEEK
+    rows = (
+        db.query(models.Availability)
+        .filter(
+            models.Availability.groupId == group_id,
+            models.Availability.userId == user_id,
+            models.Availability.endDateTime > first,
+            models.Availability.startDateTime < last,
+        )
+        .all()
+    )
+    masks = build_masks(rows)
+    existing = {
+        bitmap.weekStart: bitmap
+        for bitmap in db.query(models.AvailabilityBitmap).filter(
+            models.AvailabilityBitmap.groupId == group_id,
+            models.AvailabilityBitmap.userId == user_id,
+            models.AvailabilityBitmap.weekStart.in_(weeks),
+        )
+    }
+    for week in weeks:
+        mask = masks.get((user_id, week), 0)
+        bitmap = existing.get(week)
+        if not mask:
+            if bitmap is not None:
+                db.delete(bitmap)
+        elif bitmap is None:
+            db.add(models.AvailabilityBitmap(groupId=group_id, userId=user_id, weekStart=week, slots=encode(mask)))
+        else:
+            bitmap.slots = encode(mask)
+
+
+def rebuild_bitmaps(db: Session, group_id: Optional[str] = None) -> int:
+    """Recompute the bitmaps of one group, or of every group; returns the number of rows written."""
+    bitmaps = db.query(models.AvailabilityBitmap)
+    rows = db.query(
+        models.Availability.groupId,
+        models.Availability.userId,
+        models.Availability.startDateTime,
+        models.Availability.endDateTime,
+    )
+    if group_id is not None:
+        bitmaps = bitmaps.filter(models.AvailabilityBitmap.groupId == group_id)
+        rows = rows.filter(models.Availability.groupId == group_id)
+    bitmaps.delete(synchronize_session=False)
+
+    by_group: dict[str, list] = defaultdict(list)
+    for avail in rows:
+        by_group[avail.groupId].append(avail)
+    written = 0
+    for row_group_id, group_rows in by_group.items():
+        for (user_id, week), mask in build_masks(group_rows).items():
+            if mask:
+                db.add(models.AvailabilityBitmap(
+                    groupId=row_group_id, userId=user_id, weekStart=week, slots=encode(mask)
+                ))
+                written += 1
+    db.commit()
+    return written
@@ -0,0 +1,173 @@
+"""Bulk availability writes.
+
+``PUT /groups/{id}/availability/bulk`` writes hundreds of a member's intervals in
+one transaction instead of one request (and commit) per interval:
+1. Items are validated in one pass over them sorted by start: empty or inverted
+   intervals, intervals overlapping another item, and with a replace range items
+   starting outside it are rejected with a per-item status
+2. With a replace range, the member's entries starting in it are removed with one
+   range ``DELETE``
+3. Items overlapping the member's remaining entries (for a replace range, the ones
+   starting before it and reaching into it) are rejected as ``overlap`` too
+4. The valid items are written with one multi-row ``INSERT ... ON CONFLICT`` on the
+   unique (userId, groupId, startDateTime) index: an item starting where an entry
+   already starts updates its end and notes
+"""
+
+from __future__ import annotations
+
+import uuid
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.availability_bitmap import weeks_touched
+
+
+def check_items(
+    items: Sequence[schemas.AvailabilityCreateSchema],
+    replace_start: Optional[datetime] = None,
+    replace_end: Optional[datetime] = None,
+) -> list[Optional[str]]:
+    """Status of every item that cannot be written (``None`` for the valid ones)."""
+    statuses: list[Optional[str]] = [None] * len(items)
+    for i, item in enumerate(items):
+        if item.endDateTime <= item.startDateTime:
+            statuses[i] = "invalid"
+        elif replace_start is not None and not replace_start <= item.startDateTime < replace_end:
+            statuses[i] = "out_of_range"
+
+    # Sorted by start, an item overlaps another exactly when it starts before the
+    # latest end seen so far
+    order = sorted((i for i, status in enumerate(statuses) if status is None), key=lambda i: items[i].startDateTime)
+    latest: Optional[int] = None
+    for i in order:
+        if latest is not None and items[i].startDateTime < items[latest].endDateTime:
+            statuses[i] = statuses[latest] = "overlap"
+        if latest is None or items[i].endDateTime > items[latest].endDateTime:
+            latest = i
+    return statuses
+
+
+def delete_range(
+    db: Session, group_id: str, user_id: str, start: datetime, end: datetime
+) -> list[tuple[datetime, datetime]]:
+    """Delete the member's entries starting in ``[start, end)``; returns their intervals."""
+    result = db.execute(
+        delete(models.Availability)
+        .where(
+            models.Availability.groupId == group_id,
+            models.Availability.userId == user_id,
+            models.Availability.startDateTime >= start,
+            models.Availability.startDateTime < end,
+        )
+        .returning(models.Availability.startDateTime, models.Availability.endDateTime)
+        .execution_options(synchronize_session=False)
+    )
+    return [tuple(row) for row in result]
+
+
+def check_existing(
+    db: Session,
+    group_id: str,
+    user_id: str,
+    items: Sequence[schemas.AvailabilityCreateSchema],
+    statuses: list[Optional[str]],
+) -> None:
+    """
+    Mark the valid items overlapping the member's entries as ``overlap``, in place.
+
+    An entry starting where a valid item starts is updated by it and not checked;
+    once that item is rejected the entry stays, so the check repeats until no
+    status changes. Touching intervals do not overlap.
+    """
+    valid = [i for i, status in enumerate(statuses) if status is None]
+    if not valid:
+        return
+    rows = db.query(models.Availability.startDateTime, models.Availability.endDateTime).filter(
+        models.Availability.groupId == group_id,
+        models.Availability.userId == user_id,
+        models.Availability.startDateTime < max(items[i].endDateTime for i in valid),
+        models.Availability.endDateTime > min(items[i].startDateTime for i in valid),
+    ).order_by(models.Availability.startDateTime).all()
+
+    while valid:
+        replaced = {items[i].startDateTime for i in valid}
+        kept = [(start, end) for start, end in rows if start not in replaced]
+        starts = [start for start, _ in kept]
+        # latest[k]: the latest end of the first k entries by start
+        latest: list[Optional[datetime]] = [None]
+        for _, end in kept:
+            latest.append(end if latest[-1] is None or end > latest[-1] else latest[-1])
+
+        rejected = []
+        for i in valid:
+            reaching = latest[bisect_left(starts, items[i].endDateTime)]
+            if reaching is not None and reaching > items[i].startDateTime:
+                statuses[i] = "overlap"
+                rejected.append(i)
+        if not rejected:
+            return
+        valid = [i for i in valid if statuses[i] is None]
+
+
+def upsert_items(
+    db: Session,
+    group_id: str,
+    user_id: str,
+    items: Sequence[schemas.AvailabilityCreateSchema],
+) -> tuple[dict[datetime, str], dict[datetime, datetime]]:
+    """
+    Insert items, updating entries that already start at the same time.
+
+    Returns:
+        startDateTime -> id of every written row, and startDateTime -> previous
+        endDateTime of the entries that already existed
+    """
+    if not items:
+        return {}, {}
+
+    existing = {
+        start: end
+        for start, end in db.query(models.Availability.startDateTime, models.Availability.endDateTime).filter(
+            models.Availability.groupId == group_id,
+            models.Availability.userId == user_id,
+            models.Availability.startDateTime.in_([item.startDateTime for item in items]),
+        )
+    }
+
+    now = datetime.utcnow()
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = models.Availability.__table__
+    statement = dialect.insert(table).values([
+        {
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "groupId": group_id,
+            "startDateTime": item.startDateTime,
+            "endDateTime": item.endDateTime,
+            "notes": item.notes,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for item in items
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=["userId", "groupId", "startDateTime"],
+        set_={
+            "endDateTime": statement.excluded.endDateTime,
+            "notes": statement.excluded.notes,
+            "updatedAt": statement.excluded.updatedAt,
+        },
+    ).returning(table.c.startDateTime, table.c.id)
+    ids = {start: availability_id for start, availability_id in db.execute(statement)}
+    return ids, existing
+
+
+def weeks_of(intervals: Sequence[tuple[datetime, datetime]]) -> set[date]:
+    return {week for start, end in intervals for week in weeks_touched(start, end)}
@@ -0,0 +1,141 @@
+"""Coalescing of a member's overlapping or touching availability.
+
+18:00-20:00, 19:00-22:00 and 22:00-23:00 of the same member in the same group
+mean 18:00-23:00. ``create_availability`` and ``update_availability`` keep such
+intervals as one canonical row: the written row is stretched over every row of
+the caller it overlaps or touches, and those rows are deleted in the same
+transaction. Their notes are kept on the canonical row.
+
+Rows written with ``merge=false``, or before coalescing existed, are merged by the
+maintenance command::
+
+    python -m app.availability_coalesce [--group GROUP_ID]
+
+Running servers keep serving their cached suggestions, and answering 304 for
+their ETags, until the overlap cache TTL; restart them to serve the merged rows at
+once.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_bitmap import rebuild_bitmaps
+from app.database import SessionLocal
+
+
+def join_notes(notes: Iterable[Optional[str]]) -> Optional[str]:
+    """Distinct non-empty notes, in order, one per line."""
+    distinct = list(dict.fromkeys(note for note in notes if note))
+    return "\n".join(distinct) or None
+
+
+def absorb_touching(
+    db: Session,
+    group_id: str,
+    user_id: str,
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[str] = None,
+) -> tuple[datetime, datetime, list[models.Availability]]:
+    """
+    Delete the member's rows overlapping or touching ``[start, end]``.
+
+    Rows reached only through an absorbed row are absorbed too. The deletes are
+    flushed, so the written row may take the start of a deleted one afterwards;
+    call this before changing the written row.
+
+    Returns:
+        The merged start and end, and the deleted rows ordered by start
+    """
+    absorbed: list[models.Availability] = []
+    while True:
+        with db.no_autoflush:
+            query = db.query(models.Availability).filter(
+                models.Availability.groupId == group_id,
+                models.Availability.userId == user_id,
+                models.Availability.startDateTime <= end,
+                models.Availability.endDateTime >= start,
+            )
+            if exclude_id is not None:
+                query = query.filter(models.Availability.id != exclude_id)
+            if absorbed:
+                query = query.filter(models.Availability.id.notin_([row.id for row in absorbed]))
+            rows = query.all()
+        if not rows:
+            break
+        for row in rows:
+            start = min(start, row.startDateTime)
+            end = max(end, row.endDateTime)
+        absorbed.extend(rows)
+
+    for row in absorbed:
+        db.delete(row)
+    if absorbed:
+        db.flush()
+    absorbed.sort(key=lambda row: row.startDateTime)
+    return start, end, absorbed
+
+
+def coalesce_availability(db: Session, group_id: Optional[str] = None) -> dict[str, int]:
+    """
+    Merge every member's overlapping or touching rows of one group, or of every group.
+
+    The earliest row of each run is kept and stretched. Bitmaps of the changed
+    groups are rebuilt; the caller commits.
+
+    Returns:
+        groupId -> number of rows deleted, for the groups that changed
+    """
+    query = db.query(models.Availability)
+    if group_id is not None:
+        query = query.filter(models.Availability.groupId == group_id)
+    rows = query.order_by(
+        models.Availability.groupId, models.Availability.userId, models.Availability.startDateTime
+    )
+
+    deleted: dict[str, int] = defaultdict(int)
+    keeper: Optional[models.Availability] = None
+    notes: list[Optional[str]] = []
+    for row in rows:
+        if (
+            keeper is not None
+            and (row.groupId, row.userId) == (keeper.groupId, keeper.userId)
+            and row.startDateTime <= keeper.endDateTime
+        ):
+            keeper.endDateTime = max(keeper.endDateTime, row.endDateTime)
+            notes.append(row.notes)
+            keeper.notes = join_notes(notes)
+            db.delete(row)
+            deleted[row.groupId] += 1
+        else:
+            keeper = row
+            notes = [row.notes]
+
+    db.flush()
+    for changed_group_id in deleted:
+        rebuild_bitmaps(db, changed_group_id)
+    return dict(deleted)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge overlapping or touching availability rows.")
+    parser.add_argument("--group", help="Only this group")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        deleted = coalesce_availability(db, args.group)
+        db.commit()
+    for changed_group_id, count in sorted(deleted.items()):
+        print(f"{changed_group_id}: {count} rows merged")
+    print(f"{sum(deleted.values())} rows merged in {len(deleted)} groups")
+
+
+if __name__ == "__main__":
+    main()
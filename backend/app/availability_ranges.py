@@ -0,0 +1,123 @@
+"""Range lookups of availability on PostgreSQL.
+
+Date filters select the entries overlapping ``[start_date, end_date]``:
+``endDateTime >= start_date AND startDateTime <= end_date``. The btree on
+(groupId, startDateTime) bounds only the second half, so a filter early in a long
+history still scans every later entry of the group. On PostgreSQL every entry
+also keeps its interval in the generated ``during`` column (``tsrange``, both
+bounds inclusive like the filters), indexed with GiST together with the group
+where the ``btree_gist`` extension is available and alone otherwise, and the
+filters become one ``during && tsrange(...)`` the index answers from both sides.
+Other databases keep the two comparisons.
+
+The exclusion constraint rejecting overlapping entries of a member in a group is
+opt-in, since ``merge=false`` writes and rows older than coalescing may overlap.
+It needs ``btree_gist``::
+
+    python -m app.availability_ranges --exclusion on   # coalesce, then enforce
+    python -m app.availability_ranges --exclusion off
+
+Writes rejected by it answer 409 ``overlapping_availability``. Touching entries
+(one ending where the next starts) do not conflict. Like ``availability_coalesce``,
+enabling it merges rows behind the running servers' caches: restart them to serve
+the merged rows before the overlap cache TTL.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, cast, func, literal_column, text
+from sqlalchemy.dialects.postgresql import TSRANGE
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_coalesce import coalesce_availability
+from app.database import SessionLocal
+
+EXCLUSION_CONSTRAINT = "ex_availability_user_group_overlap"
+
+# The generated column exists only on PostgreSQL and is not mapped
+DURING = literal_column('"Availability"."during"', TSRANGE)
+
+
+def uses_ranges(db: Session) -> bool:
+    """Whether the session's database has the ``during`` column."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def overlapping(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]) -> list[Any]:
+    """Criteria for entries ending at or after ``start_date`` and starting at or before ``end_date``."""
+    if start_date is None and end_date is None:
+        return []
+    if not uses_ranges(db):
+        criteria = []
+        if start_date:
+            criteria.append(models.Availability.endDateTime >= start_date)
+        if end_date:
+            criteria.append(models.Availability.startDateTime <= end_date)
+        return criteria
+    if start_date is not None and end_date is not None and start_date > end_date:
+        # tsrange() rejects an inverted range; the comparisons then select the
+        # entries covering all of [end_date, start_date]
+        return [DURING.op("@>")(func.tsrange(cast(end_date, DateTime), cast(start_date, DateTime), "[]"))]
+    # A missing bound leaves the range unbounded on that side
+    return [DURING.op("&&")(func.tsrange(cast(start_date, DateTime), cast(end_date, DateTime), "[]"))]
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    """Whether a write was rejected by the exclusion constraint."""
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == EXCLUSION_CONSTRAINT
+
+
+def has_exclusion(db: Session) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": EXCLUSION_CONSTRAINT}
+    ).first() is not None
+
+
+def set_exclusion(db: Session, enabled: bool) -> dict[str, int]:
+    """
+    Add or drop the exclusion constraint; the caller commits.
+
+    Overlapping rows are merged with ``coalesce_availability`` before the
+    constraint is added.
+
+    Returns:
+        groupId -> number of rows merged, for the groups that changed
+    """
+    if not enabled:
+        db.execute(text(f'ALTER TABLE "Availability" DROP CONSTRAINT IF EXISTS {EXCLUSION_CONSTRAINT}'))
+        return {}
+    if has_exclusion(db):
+        return {}
+    db.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    merged = coalesce_availability(db)
+    db.execute(text(
+        f'ALTER TABLE "Availability" ADD CONSTRAINT {EXCLUSION_CONSTRAINT} '
+        'EXCLUDE USING gist ("groupId" WITH =, "userId" WITH =, '
+        'tsrange("startDateTime", "endDateTime") WITH &&)'
+    ))
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Enforce or lift non-overlapping availability per member.")
+    parser.add_argument("--exclusion", choices=["on", "off"], required=True)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if not uses_ranges(db):
+            parser.error("the exclusion constraint needs PostgreSQL")
+        merged = set_exclusion(db, args.exclusion == "on")
+        db.commit()
+    print(f"{sum(merged.values())} rows merged in {len(merged)} groups")
+    print(f"{EXCLUSION_CONSTRAINT}: {args.exclusion}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Per-user index of busy time from scheduled events.
+
+A player is busy during every ``Event`` of every group they belong to.
+:class:`UserBusyIndex` keeps those intervals sorted by start, so "is this user
+booked between ``start`` and ``end``?" is two binary searches plus a scan of the
+events starting from one (longest) event length before ``start`` up to ``end``.
+
+Indexes are built from the database on first use, for several users in one
+query, and kept in a bounded LRU/TTL store. Event writes and membership changes
+must call :func:`invalidate_users` after committing; a per-user version keeps an
+index loaded before a concurrent write from being stored.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+from app.overlap_cache import OverlapCache, WriteVersions
+
+
+class BusyInterval(NamedTuple):
+    start: datetime
+    end: datetime
+    eventId: str
+    groupId: str
+    groupName: str
+    title: str
+
+
+class UserBusyIndex:
+    """One user's busy intervals, sorted by start."""
+
+    def __init__(self, intervals: Iterable[BusyInterval]) -> None:
+        self.intervals = sorted(intervals)
+        self._starts = [interval.start for interval in self.intervals]
+        # Only events starting less than this before a query start can reach into it
+        self._longest = max((i.end - i.start for i in self.intervals), default=timedelta())
+
+    def overlapping(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> list[BusyInterval]:
+        """Intervals overlapping ``[start, end)``, ordered by start; ``None`` leaves a side open."""
+        lo = 0 if start is None else bisect_right(self._starts, start - self._longest)
+        hi = len(self._starts) if end is None else bisect_left(self._starts, end)
+        if start is None:
+            return self.intervals[lo:hi]
+        return [interval for interval in self.intervals[lo:hi] if interval.end > start]
+
+    def is_busy(self, start: datetime, end: datetime) -> bool:
+        return bool(self.overlapping(start, end))
+
+
+def _load(db: Session, user_ids: set[str]) -> dict[str, UserBusyIndex]:
+    rows = (
+        db.query(
+            models.Membership.userId,
+            models.Event.id,
+            models.Event.groupId,
+            models.Group.name,
+            models.Event.title,
+            models.Event.scheduledAt,
+            models.Event.durationMinutes,
+        )
+        .join(models.Event, models.Event.groupId == models.Membership.groupId)
+        .join(models.Group, models.Group.id == models.Event.groupId)
+        .filter(models.Membership.userId.in_(user_ids))
+    )
+    intervals: dict[str, list[BusyInterval]] = defaultdict(list)
+    for user_id, event_id, group_id, group_name, title, scheduled_at, duration_minutes in rows:
+        intervals[user_id].append(BusyInterval(
+            scheduled_at,
+            scheduled_at + timedelta(minutes=duration_minutes),
+            event_id,
+            group_id,
+            group_name,
+            title,
+        ))
+    return {user_id: UserBusyIndex(intervals.get(user_id, ())) for user_id in user_ids}
+
+
+def get_busy_indexes(db: Session, user_ids: Iterable[str]) -> dict[str, UserBusyIndex]:
+    """Busy indexes of several users; the missing ones are built with one query."""
+    indexes: dict[str, UserBusyIndex] = {}
+    missing = set()
+    for user_id in user_ids:
+        index = busy_indexes.get((user_id,))
+        if index is None:
+            missing.add(user_id)
+        else:
+            indexes[user_id] = index
+    if missing:
+        versions = {user_id: user_version(user_id) for user_id in missing}
+        for user_id, index in _load(db, missing).items():
+            indexes[user_id] = index
+            _store(user_id, index, versions[user_id])
+    return indexes
+
+
+def get_busy_index(db: Session, user_id: str) -> UserBusyIndex:
+    return get_busy_indexes(db, [user_id])[user_id]
+
+
+def group_member_ids(db: Session, group_id: str) -> list[str]:
+    return [user_id for (user_id,) in db.query(models.Membership.userId).filter(models.Membership.groupId == group_id)]
+
+
+_settings = get_settings()
+busy_indexes = OverlapCache(
+    max_entries=_settings.busy_index_users,
+    ttl_seconds=_settings.overlap_cache_ttl_seconds,
+)
+_versions = WriteVersions(_settings.write_versions_keys)
+_versions_lock = threading.Lock()
+
+
+def user_version(user_id: str) -> int:
+    """Current write version of a user's busy time; capture it before loading events."""
+    with _versions_lock:
+        return _versions.get(user_id)
+
+
+def _store(user_id: str, index: UserBusyIndex, version: int) -> None:
+    with _versions_lock:
+        if _versions.get(user_id) == version:
+            busy_indexes.set((user_id,), index)
+
+
+def invalidate_users(user_ids: Iterable[str]) -> None:
+    """Forget the busy indexes of users after a committed event or membership write."""
+    user_ids = list(user_ids)
+    with _versions_lock:
+        for user_id in user_ids:
+            _versions.bump(user_id)
+    for user_id in user_ids:
+        busy_indexes.invalidate_prefix(user_id)
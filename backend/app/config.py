@@ -13,6 +13,16 @@ class Settings(BaseSettings):
     google_client_id: str | None = None
     resend_api_key: str = ""
     frontend_url: str = "http://localhost:5173"
+    overlap_cache_size: int = 1024
+    overlap_cache_ttl_seconds: float = 300
+    overlap_state_groups: int = 256
+    overlap_pool_workers: int = 2
+    overlap_pool_min_entries: int = 20_000
+    overlap_pool_max_queue: int = 16
+    overlap_pool_timeout_seconds: float = 10
+    availability_rule_horizon_days: int = 90
+    busy_index_users: int = 4096
+    write_versions_keys: int = 65536
 
     model_config = ConfigDict(
         env_file=Path(__file__).resolve().parents[2] / ".env",
@@ -0,0 +1,82 @@
+"""Conditional GET for group resources.
+
+Group reads (availability, overlaps, events, group detail) answer ``If-None-Match``
+with 304 before loading any rows. Their ETag is derived from per-group counters
+instead of the payload:
+- ``overlap_state.group_version``, bumped by every availability, rule, event and
+  membership write and by profile changes of a member
+- the group's detail version here, bumped by writes only the group detail shows
+  (invites)
+
+Counters live in process memory like the overlap caches, so the ETag also carries
+a nonce of this process: a restart never answers 304 for an older stamp. The
+request path, query and Accept header, and today's date for rule occurrences
+expanded from today, are hashed in too.
+
+Writes made outside the server (``app.availability_coalesce``,
+``app.availability_ranges --exclusion on``, migrations) bump no counter. The ETag
+therefore also carries the current period of the overlap cache TTL: it changes at
+least once per TTL, when the caches have let go of anything such a write made
+stale too. Restart the servers to see those writes at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from datetime import date
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app import overlap_state
+from app.config import get_settings
+from app.overlap_cache import WriteVersions
+
+_BOOT = uuid.uuid4().hex
+_TTL_SECONDS = get_settings().overlap_cache_ttl_seconds
+_versions = WriteVersions(get_settings().write_versions_keys)
+_versions_lock = threading.Lock()
+
+
+def touch_group(group_id: str) -> None:
+    """Change the ETag of a group's resources after a committed write."""
+    with _versions_lock:
+        _versions.bump(group_id)
+
+
+def group_etag(request: Request, group_id: str) -> str:
+    """Strong ETag of a group resource; compute it before reading any row."""
+    with _versions_lock:
+        version = _versions.get(group_id)
+    stamp = "|".join((
+        _BOOT,
+        group_id,
+        str(overlap_state.group_version(group_id)),
+        str(version),
+        str(int(time.time() // _TTL_SECONDS)),
+        date.today().isoformat(),
+        request.url.path,
+        request.url.query,
+        request.headers.get("accept", ""),
+    ))
+    return '"' + hashlib.sha256(stamp.encode()).hexdigest()[:32] + '"'
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """Headers of a tagged response, for responses built by the endpoint itself."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """A 304 response if ``If-None-Match`` matches ``etag``; otherwise tag ``response``."""
+    headers = etag_headers(etag)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or etag in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
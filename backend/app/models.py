@@ -1,10 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, time
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Connection,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    Time,
+    event,
+)
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
@@ -44,6 +58,9 @@ class Group(Base):
     invites: Mapped[list["Invite"]] = relationship(back_populates="group", cascade="all, delete-orphan")
     events: Mapped[list["Event"]] = relationship(back_populates="group", cascade="all, delete-orphan")
     availabilities: Mapped[list["Availability"]] = relationship(back_populates="group", cascade="all, delete-orphan")
+    availabilityRules: Mapped[list["AvailabilityRule"]] = relationship(
+        back_populates="group", cascade="all, delete-orphan"
+    )
 
 
 class Membership(Base):
@@ -74,6 +91,7 @@ class Invite(Base):
 
 class Event(Base):
     __tablename__ = "Event"
+    __table_args__ = (Index("ix_event_group_scheduled", "groupId", "scheduledAt"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     groupId: Mapped[str] = mapped_column(String, ForeignKey("Group.id", ondelete="CASCADE"), nullable=False)
@@ -89,6 +107,10 @@ class Event(Base):
 
 class Availability(Base):
     __tablename__ = "Availability"
+    __table_args__ = (
+        Index("ix_availability_group_start", "groupId", "startDateTime"),
+        Index("ix_availability_user_group_start_unique", "userId", "groupId", "startDateTime", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     userId: Mapped[str] = mapped_column(String, ForeignKey("User.id", ondelete="CASCADE"), nullable=False)
@@ -105,6 +127,70 @@ class Availability(Base):
     group: Mapped[Group] = relationship(back_populates="availabilities")
 
 
+def add_availability_range(connection: Connection) -> None:
+    """
+    Add the generated ``during`` range of Availability and its GiST index on PostgreSQL.
+
+    The index leads with the group when ``btree_gist`` is available; see
+    availability_ranges.
+    """
+    connection.exec_driver_sql(
+        'ALTER TABLE "Availability" ADD COLUMN during tsrange '
+        """GENERATED ALWAYS AS (tsrange("startDateTime", "endDateTime", '[]')) STORED"""
+    )
+    columns = "during"
+    if connection.exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'").first():
+        connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        columns = '"groupId", during'
+    connection.exec_driver_sql(f'CREATE INDEX ix_availability_group_during ON "Availability" USING gist ({columns})')
+
+
+@event.listens_for(Availability.__table__, "after_create")
+def _add_availability_range(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "postgresql":
+        add_availability_range(connection)
+
+
+class AvailabilityRule(Base):
+    __tablename__ = "AvailabilityRule"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
+    userId: Mapped[str] = mapped_column(String, ForeignKey("User.id", ondelete="CASCADE"), nullable=False)
+    groupId: Mapped[str] = mapped_column(String, ForeignKey("Group.id", ondelete="CASCADE"), nullable=False)
+    # Bit 0 is Monday, bit 6 is Sunday
+    weekdays: Mapped[int] = mapped_column(Integer, nullable=False)
+    startTime: Mapped[time] = mapped_column(Time, nullable=False)
+    # At or before startTime: the occurrence ends the next day
+    endTime: Mapped[time] = mapped_column(Time, nullable=False)
+    # IANA timezone the weekdays, times and dates are local to
+    timezone: Mapped[str] = mapped_column(String, default="UTC", nullable=False)
+    validFrom: Mapped[date] = mapped_column(Date, nullable=False)
+    validUntil: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # ISO dates on which the rule does not apply
+    exceptions: Mapped[list[str]] = mapped_column(JSON, default=list, nullable=False)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    createdAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updatedAt: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    user: Mapped["User"] = relationship()
+    group: Mapped[Group] = relationship(back_populates="availabilityRules")
+
+
+class AvailabilityBitmap(Base):
+    """Derived index of Availability: one bit per 15-minute slot of a member's week."""
+
+    __tablename__ = "AvailabilityBitmap"
+
+    groupId: Mapped[str] = mapped_column(String, ForeignKey("Group.id", ondelete="CASCADE"), primary_key=True)
+    userId: Mapped[str] = mapped_column(String, ForeignKey("User.id", ondelete="CASCADE"), primary_key=True)
+    # Monday of the week
+    weekStart: Mapped[date] = mapped_column(Date, primary_key=True)
+    # 672 slots, bit day * 96 + slot, little-endian
+    slots: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
 class BlacklistedToken(Base):
     __tablename__ = "BlacklistedToken"
 
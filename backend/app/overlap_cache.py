@@ -0,0 +1,150 @@
+"""In-process cache of availability overlap suggestions.
+
+Suggestions are cached per group and query shape. Every write that can change a
+group's suggestions (availability create/update/delete, a member leaving or being
+removed) must call :func:`invalidate_group` after committing, so a repeated read
+is a single dictionary lookup. The TTL bounds staleness across worker processes,
+which each hold their own cache.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.config import get_settings
+
+# The first element of every key is the group id
+OverlapKey = tuple[str, ...]
+
+
+class OverlapCache:
+    """Bounded LRU cache with per-entry TTL and a per-group key index."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._group_keys: dict[str, set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: OverlapKey) -> Any | None:
+        """Return the cached value or ``None`` on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: OverlapKey) -> Any | None:
+        """Return a live value without touching counters or recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: OverlapKey, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond the bound."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            self._group_keys.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate_group(self, group_id: str) -> None:
+        """Drop every cached result of a group."""
+        self.invalidate_prefix(group_id)
+
+    def invalidate_prefix(self, first: str) -> None:
+        """Drop every cached result whose key starts with ``first``, e.g. a user id."""
+        with self._lock:
+            for key in self._group_keys.pop(first, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._group_keys.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        keys = self._group_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._group_keys[key[0]]
+
+
+class WriteVersions:
+    """
+    Bounded write versions of groups or users, to discard results computed across a write.
+
+    Versions come from one counter, so a key's version only grows. Beyond
+    ``max_keys`` the least recently written key is forgotten, and forgotten or
+    unknown keys report the highest forgotten version: a version captured before
+    a write never matches one read after it, at worst a result is not cached.
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._counter = 0
+        self._forgotten = 0
+        self._versions: OrderedDict[str, int] = OrderedDict()
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, self._forgotten)
+
+    def bump(self, key: str) -> None:
+        """Record a committed write of ``key``."""
+        self._counter += 1
+        self._versions[key] = self._counter
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_keys:
+            _, version = self._versions.popitem(last=False)
+            self._forgotten = max(self._forgotten, version)
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+_settings = get_settings()
+overlap_cache = OverlapCache(
+    max_entries=_settings.overlap_cache_size,
+    ttl_seconds=_settings.overlap_cache_ttl_seconds,
+)
+
+
+def invalidate_group(group_id: str) -> None:
+    """Invalidate cached overlap suggestions after a write affecting the group."""
+    overlap_cache.invalidate_group(group_id)
@@ -0,0 +1,242 @@
+"""Process pool for the overlap sweep of very large groups.
+
+The sweep is CPU-bound and would hold the GIL of the API worker for the whole
+request. Above ``overlap_pool_min_entries`` entries the sweep-per-day strategy
+hands the group to this pool instead:
+1. Entries are encoded into compact arrays: user index, start and end as
+   microseconds since the epoch
+2. The covered days are split into one contiguous chunk per worker; a chunk
+   receives every entry covering one of its days, in the original order
+3. Workers run the reference bucketing and sweep on their days and return the
+   best window of each day with player indices only
+4. The windows are merged with the shared ranking stage and serialized here
+
+Submissions beyond ``overlap_pool_max_queue`` pending chunks are rejected with
+:class:`OverlapPoolBusy` and slow computations raise :class:`OverlapPoolTimeout`,
+so callers can answer quickly instead of queueing behind a huge group.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.routers.availability_ranking import top_k
+from app.routers.availability_sweep import (
+    bucket_by_day,
+    find_best_window,
+    find_daily_overlaps,
+    serialize_suggestion,
+)
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DATE = EPOCH.date()
+_MICROSECOND = timedelta(microseconds=1)
+_DAY = 86_400_000_000
+
+# Stand-in for an Availability row inside a worker; the user is an index
+_Entry = namedtuple("_Entry", "userId user startDateTime endDateTime")
+
+# (days since the epoch, window start, window end, player count, duration in minutes, player indices)
+Candidate = tuple[int, datetime, datetime, int, float, list[int]]
+
+
+class OverlapPoolBusy(RuntimeError):
+    """Too many chunks are already queued."""
+
+
+class OverlapPoolTimeout(RuntimeError):
+    """The workers did not finish within the timeout."""
+
+
+def sweep_chunk(
+    first_day: int,
+    last_day: int,
+    users: array,
+    starts: array,
+    ends: array,
+    min_players: int,
+    duration_hours: int,
+) -> list[Candidate]:
+    """Best window of every day in ``[first_day, last_day]`` (days since the epoch); runs in a worker."""
+    entries = [
+        _Entry(user, user, EPOCH + start * _MICROSECOND, EPOCH + end * _MICROSECOND)
+        for user, start, end in zip(users, starts, ends)
+    ]
+    candidates = []
+    for day, players_dict in bucket_by_day(entries).items():
+        day_number = (day - EPOCH_DATE).days
+        if not first_day <= day_number <= last_day:
+            continue
+        window = find_best_window(players_dict, min_players, duration_hours)
+        if window:
+            candidates.append((
+                day_number,
+                window['start'],
+                window['end'],
+                window['count'],
+                window['duration_mins'],
+                list(window['players']),
+            ))
+    return candidates
+
+
+class OverlapPool:
+    """Bounded process pool computing the day sweep in chunks of days."""
+
+    def __init__(self, workers: int, min_entries: int, max_queue: int, timeout_seconds: float) -> None:
+        self.workers = workers
+        self.min_entries = min_entries
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.submitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def should_offload(self, all_availability: list) -> bool:
+        """Whether a group is large enough to be computed out of process."""
+        return (
+            self.workers > 0
+            and len(all_availability) >= max(self.min_entries, 1)
+            # Epoch offsets are naive; timezone-aware input stays in process
+            and all_availability[0].startDateTime.tzinfo is None
+        )
+
+    def find_daily_overlaps(
+        self,
+        all_availability: list,
+        min_players: int,
+        duration_hours: int,
+        max_suggestions: int = 10,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Same result as ``availability_sweep.find_daily_overlaps``, computed by the workers."""
+        if not all_availability:
+            return []
+
+        users: list[Any] = []
+        user_index: dict[str, int] = {}
+        entry_users = []
+        for avail in all_availability:
+            index = user_index.get(avail.userId)
+            if index is None:
+                index = user_index[avail.userId] = len(users)
+                users.append(avail.user)
+            entry_users.append(index)
+        starts = [(avail.startDateTime - EPOCH) // _MICROSECOND for avail in all_availability]
+        ends = [(avail.endDateTime - EPOCH) // _MICROSECOND for avail in all_availability]
+        # Days since the epoch covered by each entry; an end at midnight does not cover that day
+        first_days = [start // _DAY for start in starts]
+        last_days = [max((end - 1) // _DAY, first) for end, first in zip(ends, first_days)]
+
+        first_day, last_day = min(first_days), max(last_days)
+        chunk_days = -(-(last_day - first_day + 1) // self.workers)
+        chunks = []
+        for lo in range(first_day, last_day + 1, chunk_days):
+            hi = lo + chunk_days - 1
+            selected = [
+                i for i, (first, last) in enumerate(zip(first_days, last_days))
+                if first <= hi and last >= lo
+            ]
+            if selected:
+                chunks.append((
+                    lo,
+                    hi,
+                    array('q', [entry_users[i] for i in selected]),
+                    array('q', [starts[i] for i in selected]),
+                    array('q', [ends[i] for i in selected]),
+                ))
+
+        futures = self._submit(chunks, min_players, duration_hours)
+        _, not_done = wait(futures, timeout=self.timeout_seconds)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise OverlapPoolTimeout(f"overlap chunks did not finish in {self.timeout_seconds}s")
+
+        try:
+            candidates = [candidate for future in futures for candidate in future.result()]
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and answer this request in process
+            self._reset()
+            return find_daily_overlaps(all_availability, min_players, duration_hours, max_suggestions, offset)
+
+        top = top_k(
+            candidates,
+            # Rank by player count (desc), duration (desc), then date (asc)
+            key=lambda c: (-c[3], -c[4], c[0]),
+            limit=max_suggestions,
+            offset=offset,
+        )
+        return [
+            serialize_suggestion(EPOCH_DATE + timedelta(days=day), {
+                'start': start,
+                'end': end,
+                'count': count,
+                'duration_mins': duration_mins,
+                'players': {index: users[index] for index in players},
+            })
+            for day, start, end, count, duration_mins, players in top
+        ]
+
+    def _submit(self, chunks: list[tuple], min_players: int, duration_hours: int) -> list[Future]:
+        with self._lock:
+            if self._pending + len(chunks) > self.max_queue:
+                self.rejected += 1
+                raise OverlapPoolBusy(f"{self._pending} overlap chunks already queued")
+            if self._executor is None:
+                # Forking a threaded server is unsafe; spawned workers start clean
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+            self._pending += len(chunks)
+            self.submitted += 1
+            futures = [
+                self._executor.submit(sweep_chunk, *chunk, min_players, duration_hours)
+                for chunk in chunks
+            ]
+        for future in futures:
+            future.add_done_callback(self._chunk_done)
+        return futures
+
+    def _chunk_done(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> dict[str, int]:
+        """Queue depth and submission counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._pending,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+    def shutdown(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_settings = get_settings()
+overlap_pool = OverlapPool(
+    workers=_settings.overlap_pool_workers,
+    min_entries=_settings.overlap_pool_min_entries,
+    max_queue=_settings.overlap_pool_max_queue,
+    timeout_seconds=_settings.overlap_pool_timeout_seconds,
+)
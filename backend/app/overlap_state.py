@@ -0,0 +1,197 @@
+"""Incrementally maintained day-bucketed overlap state per group.
+
+The sweep behind ``/availability/overlaps`` works day by day: availability is
+bucketed per date and every date gets its own best window. :class:`GroupDayState`
+keeps that intermediate state (the ``dates_availability`` map and each day's best
+window per query shape) for a group, so a write only re-buckets and re-sweeps the
+days touched by the old and new intervals, and a read re-merges the cached per-day
+winners instead of reloading every row.
+
+States live in a bounded LRU/TTL store. Each write bumps the group's version so a
+read that loaded rows before a concurrent write never stores a stale state or
+a stale cached result.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.overlap_cache import OverlapCache, OverlapKey, WriteVersions, invalidate_group, overlap_cache
+from app.routers.availability_ranking import top_k
+from app.routers.availability_sweep import (
+    bucket_by_day,
+    day_span,
+    find_best_window,
+    serialize_suggestion,
+    suggestion_sort_key,
+)
+
+# (availability id, user id, user, start, end)
+Entry = tuple[str, str, Any, datetime, datetime]
+
+
+def _days(start: datetime, end: datetime) -> list[date]:
+    first, last = day_span(start, end)
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+class GroupDayState:
+    """Day-bucketed availability of one group with per-day best windows."""
+
+    def __init__(self, all_availability: list) -> None:
+        self._lock = threading.Lock()
+        self.entries: dict[str, Entry] = {}
+        # date -> userId -> ids of that user's entries touching the date
+        self.day_entries: dict[date, dict[str, set[str]]] = {}
+        for avail in all_availability:
+            entry = (avail.id, avail.userId, avail.user, avail.startDateTime, avail.endDateTime)
+            self.entries[avail.id] = entry
+            for day in _days(avail.startDateTime, avail.endDateTime):
+                self.day_entries.setdefault(day, {}).setdefault(avail.userId, set()).add(avail.id)
+        self.dates_availability = dict(bucket_by_day(all_availability))
+        # (min_players, duration_hours) -> date -> best window or None
+        self.best_windows: dict[tuple[int, int], dict[date, Optional[dict[str, Any]]]] = {}
+
+    def apply(self, removed: Optional[Entry], added: Optional[Entry]) -> None:
+        """Apply one write and recompute only the days its intervals touch."""
+        with self._lock:
+            touched: set[tuple[date, str]] = set()
+            if removed is not None and removed[0] in self.entries:
+                entry_id, user_id, _, start, end = self.entries.pop(removed[0])
+                for day in _days(start, end):
+                    users = self.day_entries.get(day, {})
+                    users.get(user_id, set()).discard(entry_id)
+                    touched.add((day, user_id))
+            if added is not None:
+                entry_id, user_id, _, start, end = added
+                self.entries[entry_id] = added
+                for day in _days(start, end):
+                    self.day_entries.setdefault(day, {}).setdefault(user_id, set()).add(entry_id)
+                    touched.add((day, user_id))
+
+            for day, user_id in touched:
+                self._rebucket(day, user_id)
+
+            touched_days = {day for day, _ in touched}
+            for (min_players, duration_hours), windows in self.best_windows.items():
+                for day in touched_days:
+                    players_dict = self.dates_availability.get(day)
+                    if players_dict:
+                        windows[day] = find_best_window(players_dict, min_players, duration_hours)
+                    else:
+                        windows.pop(day, None)
+
+    def suggestions(
+        self,
+        min_players: int,
+        duration_hours: int,
+        max_suggestions: int = 10,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Merge the cached per-day winners into a page of ranked suggestions."""
+        with self._lock:
+            windows = self.best_windows.get((min_players, duration_hours))
+            if windows is None:
+                windows = {
+                    day: find_best_window(players_dict, min_players, duration_hours)
+                    for day, players_dict in self.dates_availability.items()
+                }
+                self.best_windows[(min_players, duration_hours)] = windows
+            top = top_k(
+                ((day, window) for day, window in windows.items() if window),
+                key=lambda item: suggestion_sort_key(*item),
+                limit=max_suggestions,
+                offset=offset,
+            )
+            return [serialize_suggestion(day, window) for day, window in top]
+
+    def _rebucket(self, day: date, user_id: str) -> None:
+        """Recompute one user's earliest start and latest end within one day."""
+        users = self.day_entries.get(day, {})
+        entry_ids = users.get(user_id)
+        players_dict = self.dates_availability.setdefault(day, {})
+        if not entry_ids:
+            users.pop(user_id, None)
+            players_dict.pop(user_id, None)
+        else:
+            entries = [self.entries[entry_id] for entry_id in entry_ids]
+            midnight = datetime.combine(day, time.min, tzinfo=entries[0][3].tzinfo)
+            players_dict[user_id] = {
+                'user': entries[0][2],
+                'start': max(min(entry[3] for entry in entries), midnight),
+                'end': min(max(entry[4] for entry in entries), midnight + timedelta(days=1)),
+            }
+            # Keep the sweep's player order: players appear by earliest start
+            self.dates_availability[day] = dict(
+                sorted(players_dict.items(), key=lambda item: item[1]['start'])
+            )
+        if not users:
+            self.day_entries.pop(day, None)
+        if not self.dates_availability.get(day):
+            self.dates_availability.pop(day, None)
+
+
+def as_entry(availability: Any) -> Entry:
+    """Snapshot an Availability row; take it before mutating the row."""
+    return (
+        availability.id,
+        availability.userId,
+        availability.user,
+        availability.startDateTime,
+        availability.endDateTime,
+    )
+
+
+_settings = get_settings()
+day_states = OverlapCache(
+    max_entries=_settings.overlap_state_groups,
+    ttl_seconds=_settings.overlap_cache_ttl_seconds,
+)
+_versions = WriteVersions(_settings.write_versions_keys)
+_versions_lock = threading.Lock()
+
+
+def group_version(group_id: str) -> int:
+    """Current write version of a group; capture it before loading rows."""
+    with _versions_lock:
+        return _versions.get(group_id)
+
+
+def get_state(group_id: str) -> Optional[GroupDayState]:
+    return day_states.get((group_id,))
+
+
+def store_state(group_id: str, state: GroupDayState, version: int) -> None:
+    """Keep a freshly built state unless the group was written while it was loading."""
+    with _versions_lock:
+        if _versions.get(group_id) != version:
+            return
+        day_states.set((group_id,), state)
+
+
+def store_suggestions(cache_key: OverlapKey, suggestions: list[dict[str, Any]], version: int) -> None:
+    """Cache a result unless the group was written while it was computed."""
+    with _versions_lock:
+        if _versions.get(cache_key[0]) == version:
+            overlap_cache.set(cache_key, suggestions)
+
+
+def apply_change(group_id: str, removed: Optional[Entry] = None, added: Optional[Entry] = None) -> None:
+    """Record a committed availability write in the group's state, if one is held."""
+    with _versions_lock:
+        _versions.bump(group_id)
+        state = day_states.peek((group_id,))
+    if state is not None:
+        state.apply(removed, added)
+    invalidate_group(group_id)
+
+
+def drop_state(group_id: str) -> None:
+    """Forget a group's state; the next read rebuilds it from the database."""
+    with _versions_lock:
+        _versions.bump(group_id)
+    day_states.invalidate_group(group_id)
+    invalidate_group(group_id)
@@ -2,30 +2,92 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Any, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
 
-from app import models, schemas
+from app import models, overlap_state, schemas
+from app.availability_bitmap import refresh_bitmaps, weeks_touched
+from app.availability_bulk import check_existing, check_items, delete_range, upsert_items, weeks_of
+from app.availability_coalesce import absorb_touching, join_notes
+from app.availability_ranges import is_overlap_violation
 from app.auth import get_current_user
 from app.database import get_db
+from app.etags import etag_headers, group_etag, not_modified
+from app.overlap_cache import overlap_cache
+from app.overlap_pool import OverlapPoolBusy, OverlapPoolTimeout
 from app.permissions import verify_group_membership
+from app.routers.availability_columnar import columnar_entries, columnar_response, columnar_suggestions
+from app.routers.availability_events import has_events, load_busy
+from app.routers.availability_heatmap import MAX_SLOTS, RESOLUTIONS, availability_heatmap
+from app.routers.availability_pages import (
+    decode_cursor,
+    encode_cursor,
+    merged,
+    ndjson_lines,
+    occurrences_after,
+    seek,
+    stream_lines,
+)
+from app.routers.availability_rows import (
+    encode_availability,
+    encode_listing,
+    json_array,
+    listing_select,
+    member_select,
+    occurrence_row,
+)
+from app.routers.availability_recurring import expand_rules, rule_window, with_occurrences
+from app.routers.availability_strategies import (
+    DEFAULT_STRATEGY,
+    STRATEGIES,
+    PreparedAvailability,
+    run_strategy,
+)
+from app.routers.availability_timezones import is_valid_timezone
 
 router = APIRouter(prefix="/groups", tags=["availability"])
 
 
+def _record_write(
+    db: Session,
+    group_id: str,
+    removed: list[overlap_state.Entry],
+    added: Optional[overlap_state.Entry] = None,
+) -> None:
+    """
+    Record a committed write in the group's held day state.
+
+    The state holds no busy time: it is only built while no entry meets an event.
+    When the added interval meets an event of its member, the state is dropped
+    instead, so the next read subtracts the busy time.
+    """
+    if added is not None and has_events(db, [added[1]], added[3], added[4]):
+        overlap_state.drop_state(group_id)
+        return
+    for entry in removed:
+        overlap_state.apply_change(group_id, removed=entry)
+    if added is not None:
+        overlap_state.apply_change(group_id, added=added)
+
+
 @router.post("/{group_id}/availability", response_model=schemas.AvailabilitySchema, status_code=status.HTTP_201_CREATED)
 def create_availability(
     group_id: str,
     payload: schemas.AvailabilityCreateSchema,
+    merge: bool = Query(default=True, description="Merge with the caller's overlapping or touching entries"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> models.Availability:
     """Create a new availability entry for the current user in a group.
 
-    Any member of the group can mark their availability.
+    Any member of the group can mark their availability. Unless ``merge=false``,
+    the caller's entries overlapping or touching the new one are merged into it.
     """
     # Verify user is a member of the group
     verify_group_membership(db, current_user, group_id)
@@ -37,19 +99,34 @@ def create_availability(
             detail="endDateTime must be after startDateTime"
         )
 
+    start, end, absorbed = payload.startDateTime, payload.endDateTime, []
+    if merge:
+        start, end, absorbed = absorb_touching(db, group_id, current_user.id, start, end)
+    removed = [overlap_state.as_entry(row) for row in absorbed]
+
     # Create availability
     availability = models.Availability(
         userId=current_user.id,
         groupId=group_id,
-        startDateTime=payload.startDateTime,
-        endDateTime=payload.endDateTime,
-        notes=payload.notes,
+        startDateTime=start,
+        endDateTime=end,
+        notes=join_notes([payload.notes, *(row.notes for row in absorbed)]),
     )
     db.add(availability)
 
     try:
+        refresh_bitmaps(db, group_id, current_user.id, weeks_touched(start, end))
         db.commit()
         db.refresh(availability)
+    except IntegrityError as exc:
+        db.rollback()
+        if is_overlap_violation(exc):
+            # Rejected by the optional exclusion constraint, see availability_ranges
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="overlapping_availability")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Availability already exists for this time slot"
+        )
     except Exception:
         db.rollback()
         raise HTTPException(
@@ -57,41 +134,119 @@ def create_availability(
             detail="Availability already exists for this time slot"
         )
 
+    _record_write(db, group_id, removed, overlap_state.as_entry(availability))
+
     return availability
 
 
-@router.get("/{group_id}/availability", response_model=list[schemas.AvailabilityWithUserSchema])
+@router.get(
+    "/{group_id}/availability",
+    response_model=list[Union[schemas.AvailabilityWithUserSchema, schemas.AvailabilityRuleWithUserSchema]],
+)
 def list_availability(
     group_id: str,
-    start_date: Optional[datetime] = Query(default=None, description="Filter by start date (inclusive)"),
-    end_date: Optional[datetime] = Query(default=None, description="Filter by end date (inclusive)"),
+    request: Request,
+    response: Response,
+    start_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by start date (inclusive)"),
+    end_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by end date (inclusive)"),
+    rules: str = Query(
+        default="expanded",
+        pattern="^(expanded|unexpanded)$",
+        description="Return recurring rules as occurrences in the date range or as rules",
+    ),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Page size; all entries without it"),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor of the previous page"),
+    response_format: str = Query(
+        default="rows", alias="format", pattern="^(rows|columnar)$", description="Entry objects or columns"
+    ),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[models.Availability]:
+) -> Any:
     """List all availability entries for a group, optionally filtered by date range.
 
-    Any member of the group can view all availability.
+    Any member of the group can view all availability. Recurring rules are expanded
+    into occurrences (with ``ruleId`` set) inside the date range, or from today over
+    the rule horizon without one; ``rules=unexpanded`` appends the rules themselves.
+    Answers ``If-None-Match`` with 304 while the group's availability is unchanged.
+
+    Entries are ordered by start and id. With ``limit`` one page is returned and the
+    ``X-Next-Cursor`` header, when set, requests the next one; with ``unexpanded``
+    the rules come with the first page. ``Accept: application/x-ndjson`` returns
+    the entries as one JSON object per line instead, streamed without ``limit``. ``format=columnar`` returns
+    the users once and the entries as parallel arrays, see ``availability_columnar``.
     """
     # Verify user is a member of the group
     verify_group_membership(db, current_user, group_id)
 
-    # Build query
-    query = (
-        db.query(models.Availability)
-        .options(selectinload(models.Availability.user))
-        .filter(models.Availability.groupId == group_id)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="invalid_cursor"
+            )
+
+    etag = group_etag(request, group_id)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+
+    # Columns of the filtered entries and their users, ordered by start time and id
+    # after the cursor
+    query = seek(listing_select(db, group_id, start_date, end_date), after)
+
+    group_rules = (
+        db.query(models.AvailabilityRule)
+        .options(selectinload(models.AvailabilityRule.user))
+        .filter(models.AvailabilityRule.groupId == group_id)
+        .order_by(models.AvailabilityRule.createdAt)
+        .all()
     )
+    occurrences = []
+    if rules == "expanded":
+        occurrences = [
+            occurrence_row(occurrence)
+            for occurrence in occurrences_after(expand_rules(group_rules, *rule_window(start_date, end_date)), after)
+        ]
+    listed_rules = group_rules if rules == "unexpanded" and after is None else []
+
+    ndjson = response_format == "rows" and "application/x-ndjson" in request.headers.get("accept", "")
+    if ndjson and limit is None:
+        return StreamingResponse(
+            stream_lines(db, query, occurrences, listed_rules),
+            media_type="application/x-ndjson",
+            headers=etag_headers(etag),
+        )
 
-    # Apply filters
-    if start_date:
-        query = query.filter(models.Availability.endDateTime >= start_date)
-    if end_date:
-        query = query.filter(models.Availability.startDateTime <= end_date)
-
-    # Order by start time
-    availability = query.order_by(models.Availability.startDateTime).all()
-
-    return availability
+    headers = etag_headers(etag)
+    if limit is None:
+        entries = list(merged(db.execute(query).all(), occurrences))
+    else:
+        # One extra entry tells whether another page follows
+        entries = list(islice(merged(db.execute(query.limit(limit + 1)).all(), occurrences), limit + 1))
+        if len(entries) > limit:
+            entries = entries[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(entries[-1])
+
+    if ndjson:
+        return Response(
+            content="".join(ndjson_lines(entries, listed_rules)), media_type="application/x-ndjson", headers=headers
+        )
+    if response_format == "columnar":
+        serialized_rules = [
+            schemas.AvailabilityRuleWithUserSchema.model_validate(rule).model_dump(mode="json") for rule in listed_rules
+        ]
+        return columnar_response(columnar_entries(entries, serialized_rules), headers)
+    return Response(
+        content=json_array([
+            *(encode_listing(row) for row in entries),
+            *(schemas.AvailabilityRuleWithUserSchema.model_validate(rule).model_dump_json() for rule in listed_rules),
+        ]),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/{group_id}/availability/me", response_model=list[schemas.AvailabilitySchema])
@@ -99,23 +254,82 @@ def list_my_availability(
     group_id: str,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[models.Availability]:
+) -> Response:
     """List availability entries for the current user in a group."""
     # Verify user is a member of the group
     verify_group_membership(db, current_user, group_id)
 
     # Get current user's availability
-    availability = (
-        db.query(models.Availability)
-        .filter(
-            models.Availability.groupId == group_id,
-            models.Availability.userId == current_user.id
+    rows = db.execute(member_select(group_id, current_user.id))
+
+    return Response(content=json_array(encode_availability(row) for row in rows), media_type="application/json")
+
+
+@router.put("/{group_id}/availability/bulk", response_model=schemas.AvailabilityBulkResultSchema)
+def bulk_upsert_availability(
+    group_id: str,
+    payload: schemas.AvailabilityBulkSchema,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """Write many availability entries of the current user in one transaction.
+
+    With ``replaceStart``/``replaceEnd`` the caller's entries starting in that range
+    are replaced, and every item must start in it. Items that are empty, overlap
+    another item or one of the caller's remaining entries, or start outside the
+    range are skipped with their status; an item
+    starting where an entry of the caller already starts updates it. Entries are
+    not merged with touching ones, see ``create_availability``.
+    """
+    verify_group_membership(db, current_user, group_id)
+
+    replace = payload.replaceStart is not None or payload.replaceEnd is not None
+    if replace and (
+        payload.replaceStart is None or payload.replaceEnd is None or payload.replaceEnd <= payload.replaceStart
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="replaceEnd must be after replaceStart"
         )
-        .order_by(models.Availability.startDateTime)
-        .all()
-    )
 
-    return availability
+    statuses = check_items(payload.items, payload.replaceStart, payload.replaceEnd)
+
+    deleted = []
+    if replace:
+        deleted = delete_range(db, group_id, current_user.id, payload.replaceStart, payload.replaceEnd)
+    check_existing(db, group_id, current_user.id, payload.items, statuses)
+    valid = [item for item, item_status in zip(payload.items, statuses) if item_status is None]
+    try:
+        ids, existing = upsert_items(db, group_id, current_user.id, valid)
+        # Updated entries may have been shortened: their old weeks change too
+        refresh_bitmaps(
+            db,
+            group_id,
+            current_user.id,
+            weeks_of(deleted)
+            | weeks_of(list(existing.items()))
+            | weeks_of([(item.startDateTime, item.endDateTime) for item in valid]),
+        )
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_overlap_violation(exc):
+            raise
+        # Rejected by the optional exclusion constraint, see availability_ranges
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="overlapping_availability")
+    overlap_state.drop_state(group_id)
+
+    results = []
+    for index, (item, item_status) in enumerate(zip(payload.items, statuses)):
+        if item_status is not None:
+            results.append({"index": index, "status": item_status})
+        else:
+            results.append({
+                "index": index,
+                "status": "updated" if item.startDateTime in existing else "created",
+                "id": ids[item.startDateTime],
+            })
+    return {"items": results, "deleted": len(deleted)}
 
 
 @router.put("/{group_id}/availability/{availability_id}", response_model=schemas.AvailabilitySchema)
@@ -123,10 +337,15 @@ def update_availability(
     group_id: str,
     availability_id: str,
     payload: schemas.AvailabilityUpdateSchema,
+    merge: bool = Query(default=True, description="Merge with the caller's overlapping or touching entries"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> models.Availability:
-    """Update an availability entry. Only the owner can update their availability."""
+    """Update an availability entry. Only the owner can update their availability.
+
+    Unless ``merge=false``, the caller's other entries overlapping or touching the
+    updated one are merged into it.
+    """
     # Verify user is a member of the group
     verify_group_membership(db, current_user, group_id)
 
@@ -147,23 +366,51 @@ def update_availability(
     if availability.userId != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
 
-    # Update fields
-    if payload.startDateTime is not None:
-        availability.startDateTime = payload.startDateTime
-    if payload.endDateTime is not None:
-        availability.endDateTime = payload.endDateTime
-    if payload.notes is not None:
-        availability.notes = payload.notes
+    previous = overlap_state.as_entry(availability)
+    previous_weeks = weeks_touched(availability.startDateTime, availability.endDateTime)
+
+    start = payload.startDateTime if payload.startDateTime is not None else availability.startDateTime
+    end = payload.endDateTime if payload.endDateTime is not None else availability.endDateTime
 
     # Validate datetime range
-    if availability.endDateTime <= availability.startDateTime:
+    if end <= start:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="endDateTime must be after startDateTime"
         )
 
-    db.commit()
+    # Merge before changing the row: it may take the start of a row it absorbs
+    absorbed = []
+    if merge:
+        start, end, absorbed = absorb_touching(
+            db, group_id, availability.userId, start, end, exclude_id=availability.id
+        )
+    removed = [overlap_state.as_entry(row) for row in absorbed]
+
+    # Update fields
+    availability.startDateTime = start
+    availability.endDateTime = end
+    if payload.notes is not None:
+        availability.notes = payload.notes
+    if absorbed:
+        availability.notes = join_notes([availability.notes, *(row.notes for row in absorbed)])
+
+    refresh_bitmaps(
+        db,
+        group_id,
+        availability.userId,
+        previous_weeks + weeks_touched(availability.startDateTime, availability.endDateTime),
+    )
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_overlap_violation(exc):
+            raise
+        # Rejected by the optional exclusion constraint, see availability_ranges
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="overlapping_availability")
     db.refresh(availability)
+    _record_write(db, group_id, [*removed, previous], overlap_state.as_entry(availability))
 
     return availability
 
@@ -196,17 +443,215 @@ def delete_availability(
     if availability.userId != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
 
+    removed = overlap_state.as_entry(availability)
     db.delete(availability)
+    refresh_bitmaps(
+        db, group_id, availability.userId, weeks_touched(availability.startDateTime, availability.endDateTime)
+    )
     db.commit()
+    overlap_state.apply_change(group_id, removed=removed)
+
+
+def _validate_rule(rule: models.AvailabilityRule) -> None:
+    if not is_valid_timezone(rule.timezone):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unknown_timezone")
+    if rule.validUntil is not None and rule.validUntil < rule.validFrom:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="validUntil must not be before validFrom"
+        )
+
+
+def _get_own_rule(db: Session, current_user: models.User, group_id: str, rule_id: str) -> models.AvailabilityRule:
+    rule = (
+        db.query(models.AvailabilityRule)
+        .filter(
+            models.AvailabilityRule.id == rule_id,
+            models.AvailabilityRule.groupId == group_id
+        )
+        .one_or_none()
+    )
+
+    if rule is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
+
+    # Verify ownership
+    if rule.userId != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+
+    return rule
+
+
+@router.post(
+    "/{group_id}/availability/rules",
+    response_model=schemas.AvailabilityRuleSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_availability_rule(
+    group_id: str,
+    payload: schemas.AvailabilityRuleCreateSchema,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> models.AvailabilityRule:
+    """Create a weekly recurring availability rule for the current user in a group.
+
+    ``weekdays`` is a mask with bit 0 for Monday; an ``endTime`` at or before
+    ``startTime`` ends each occurrence the next day. Days, times and dates are
+    local to the rule's IANA ``timezone`` (UTC by default), so an occurrence
+    keeps its wall-clock time across DST changes.
+    """
+    # Verify user is a member of the group
+    verify_group_membership(db, current_user, group_id)
+
+    rule = models.AvailabilityRule(
+        userId=current_user.id,
+        groupId=group_id,
+        weekdays=payload.weekdays,
+        startTime=payload.startTime,
+        endTime=payload.endTime,
+        timezone=payload.timezone,
+        validFrom=payload.validFrom,
+        validUntil=payload.validUntil,
+        exceptions=sorted(day.isoformat() for day in payload.exceptions),
+        notes=payload.notes,
+    )
+    _validate_rule(rule)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    overlap_state.drop_state(group_id)
+
+    return rule
+
+
+@router.put("/{group_id}/availability/rules/{rule_id}", response_model=schemas.AvailabilityRuleSchema)
+def update_availability_rule(
+    group_id: str,
+    rule_id: str,
+    payload: schemas.AvailabilityRuleUpdateSchema,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> models.AvailabilityRule:
+    """Update a recurring rule. Only the owner can update their rules."""
+    # Verify user is a member of the group
+    verify_group_membership(db, current_user, group_id)
+
+    rule = _get_own_rule(db, current_user, group_id, rule_id)
+
+    # Update fields
+    for field in ("weekdays", "startTime", "endTime", "timezone", "validFrom", "validUntil", "notes"):
+        value = getattr(payload, field)
+        if value is not None:
+            setattr(rule, field, value)
+    if payload.exceptions is not None:
+        rule.exceptions = sorted(day.isoformat() for day in payload.exceptions)
+
+    _validate_rule(rule)
+    db.commit()
+    db.refresh(rule)
+    overlap_state.drop_state(group_id)
+
+    return rule
+
+
+@router.delete("/{group_id}/availability/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_availability_rule(
+    group_id: str,
+    rule_id: str,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Delete a recurring rule. Only the owner can delete their rules."""
+    # Verify user is a member of the group
+    verify_group_membership(db, current_user, group_id)
+
+    rule = _get_own_rule(db, current_user, group_id, rule_id)
+    db.delete(rule)
+    db.commit()
+    overlap_state.drop_state(group_id)
+
+
+@router.get("/{group_id}/availability/heatmap")
+def get_availability_heatmap(
+    group_id: str,
+    request: Request,
+    response: Response,
+    resolution: str = Query(default="30m", pattern="^(15m|30m|1h)$", description="Slot length"),
+    start_date: Optional[schemas.UtcDateTime] = Query(
+        default=None, description="Start of the first slot; today by default"
+    ),
+    end_date: Optional[schemas.UtcDateTime] = Query(
+        default=None, description="End of the range; a week after the start by default"
+    ),
+    masks: bool = Query(default=False, description="Also return which members are free in each slot"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Number of players free for each whole slot of a time range.
+
+    ``counts`` holds one number per slot from ``startDateTime``; with ``masks``,
+    ``masks`` is base64 of ``maskBytes`` bytes per slot whose bit i (least significant
+    first) marks ``members[i]`` as free. Rule occurrences count and scheduled events
+    are busy time, like in ``/overlaps``.
+    """
+    verify_group_membership(db, current_user, group_id)
+
+    if start_date is None:
+        start_date = datetime.combine(date.today(), time.min)
+    if end_date is None:
+        end_date = start_date + timedelta(days=7)
+    resolution_minutes = RESOLUTIONS[resolution]
+    if (end_date - start_date) // timedelta(minutes=resolution_minutes) > MAX_SLOTS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="range_too_large")
+
+    unchanged = not_modified(request, response, group_etag(request, group_id))
+    if unchanged is not None:
+        return unchanged
+
+    rows = (
+        db.query(models.Availability)
+        .options(selectinload(models.Availability.user))
+        .filter(
+            models.Availability.groupId == group_id,
+            models.Availability.endDateTime > start_date,
+            models.Availability.startDateTime < end_date,
+        )
+        .order_by(models.Availability.startDateTime)
+        .all()
+    )
+    rules = (
+        db.query(models.AvailabilityRule)
+        .options(selectinload(models.AvailabilityRule.user))
+        .filter(models.AvailabilityRule.groupId == group_id)
+        .all()
+    )
+    entries = with_occurrences(rows, expand_rules(rules, start_date, end_date))
+    busy = load_busy(db, {avail.userId for avail in entries}, start_date, end_date)
+
+    return availability_heatmap(entries, busy, start_date, end_date, resolution_minutes, masks)
 
 
 @router.get("/{group_id}/availability/overlaps")
 def get_availability_overlaps(
     group_id: str,
+    request: Request,
+    response: Response,
     min_players: Optional[int] = Query(default=None, ge=1, description="Minimum number of players required"),
     duration_hours: Optional[int] = Query(default=3, ge=1, le=12, description="Minimum duration in hours"),
-    start_date: Optional[datetime] = Query(default=None, description="Filter by start date (inclusive)"),
-    end_date: Optional[datetime] = Query(default=None, description="Filter by end date (inclusive)"),
+    start_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by start date (inclusive)"),
+    end_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by end date (inclusive)"),
+    strategy: str = Query(default=DEFAULT_STRATEGY, description="Overlap strategy to use"),
+    limit: int = Query(default=10, ge=1, le=100, description="Maximum number of suggestions to return"),
+    offset: int = Query(default=0, ge=0, description="Number of best suggestions to skip"),
+    required_user_ids: list[str] = Query(default=[], description="Players every window must include"),
+    optional_user_ids: Optional[list[str]] = Query(
+        default=None, description="Other players who may count; omit to count every member"
+    ),
+    require_gm: bool = Query(default=False, description="Require the group's GMs"),
+    tz: Optional[str] = Query(default=None, description="IANA timezone whose local days group the suggestions"),
+    response_format: str = Query(
+        default="rows", alias="format", pattern="^(rows|columnar)$", description="Suggestion objects or columns"
+    ),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -214,137 +659,73 @@ def get_availability_overlaps(
 
     Groups availability by DATE and finds days where the minimum number of players are available.
     For each suggested date, returns the time window when ALL suggested players overlap.
-    Results are ranked by player count, duration, then date.
+    Results are ranked by player count, duration, then date and paged with ``limit``/``offset``.
+    They are cached per group until the group's availability or membership changes.
+
+    ``strategy`` selects one of the algorithms registered in ``availability_strategies``:
+    ``sweep-per-day`` (default), ``merged-windows``, ``by-days``, ``vectorized`` or ``sql``.
+    Very large groups are swept in a process pool; a full pool or a timeout answers 503.
+
+    ``required_user_ids`` (plus every GM with ``require_gm``) restricts suggestions to
+    windows all of them attend; ``optional_user_ids`` restricts who else may count.
+    Days and segments missing a required player are pruned before the sweep.
+
+    Days are UTC dates unless ``tz`` names a timezone whose local days to use instead;
+    suggestion times stay in UTC either way.
+
+    ``If-None-Match`` is answered with 304 before any cache lookup or sweep while the
+    group's data is unchanged.
+
+    ``format=columnar`` returns the players once and the suggestions as parallel
+    arrays, see ``availability_columnar``.
     """
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unknown_strategy")
+    if tz is not None and not is_valid_timezone(tz):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unknown_timezone")
+
     # Verify user is a member of the group
-    group = verify_group_membership(db, current_user, group_id)
+    verify_group_membership(db, current_user, group_id)
 
-    # Get total member count
-    member_count = db.query(models.Membership).filter(models.Membership.groupId == group_id).count()
+    etag = group_etag(request, group_id)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
 
     # Default min_players to 2 (at least 2 players must overlap)
     if min_players is None:
         min_players = 2
 
-    # Get all availability entries for the group
-    query = (
-        db.query(models.Availability)
-        .options(selectinload(models.Availability.user))
-        .filter(models.Availability.groupId == group_id)
-    )
-
-    if start_date:
-        query = query.filter(models.Availability.endDateTime >= start_date)
-    if end_date:
-        query = query.filter(models.Availability.startDateTime <= end_date)
-
-    all_availability = query.order_by(models.Availability.startDateTime).all()
-
-    if not all_availability:
-        return []
-
-    # Day-based overlap algorithm: Find DATES where >= min_players are available
-    # Groups availability by date and finds overlapping time windows for each date
-    from collections import defaultdict
-    from datetime import timedelta
-
-    # Group availability by date
-    dates_availability = defaultdict(dict)
-
-    for avail in all_availability:
-        # Get all dates covered by this availability period
-        start_date = avail.startDateTime.date()
-        end_date = avail.endDateTime.date()
-
-        current_date = start_date
-        while current_date <= end_date:
-            user_id = avail.userId
-
-            # Track earliest start and latest end for this user on this date
-            if user_id in dates_availability[current_date]:
-                existing = dates_availability[current_date][user_id]
-                # Update to earliest start
-                if avail.startDateTime < existing['start']:
-                    existing['start'] = avail.startDateTime
-                # Update to latest end
-                if avail.endDateTime > existing['end']:
-                    existing['end'] = avail.endDateTime
-            else:
-                dates_availability[current_date][user_id] = {
-                    'user': avail.user,
-                    'start': avail.startDateTime,
-                    'end': avail.endDateTime,
-                }
-
-            current_date += timedelta(days=1)
-
-    # Find dates with enough players using a sweep line algorithm.
-    # Instead of requiring ALL players on a date to overlap simultaneously,
-    # we find the best time segment where the maximum number of players overlap.
-    suggestions = []
-
-    for day, players_dict in dates_availability.items():
-        if len(players_dict) < min_players:
-            continue
-
-        # Build sweep line events: end events (type=0) sort before start events (type=1)
-        # at the same timestamp so we don't count a player leaving and joining at the
-        # exact same moment as an overlap.
-        events = []
-        for user_id, player_data in players_dict.items():
-            events.append((player_data['start'], 1, user_id, player_data['user']))  # start
-            events.append((player_data['end'], 0, user_id, player_data['user']))   # end
-
-        events.sort(key=lambda x: (x[0], x[1]))
-
-        active_players = {}
-        prev_time = None
-        best_window = None
-
-        for time, event_type, user_id, user in events:
-            if prev_time is not None and active_players and prev_time < time:
-                count = len(active_players)
-                duration_mins = (time - prev_time).total_seconds() / 60
-
-                if count >= min_players and duration_mins >= duration_hours * 60:
-                    if (best_window is None
-                            or count > best_window['count']
-                            or (count == best_window['count'] and duration_mins > best_window['duration_mins'])):
-                        best_window = {
-                            'start': prev_time,
-                            'end': time,
-                            'players': dict(active_players),
-                            'count': count,
-                            'duration_mins': duration_mins,
-                        }
-
-            if event_type == 1:  # start
-                active_players[user_id] = user
-            else:               # end
-                active_players.pop(user_id, None)
-
-            prev_time = time
-
-        if best_window:
-            suggestions.append({
-                "date": day.isoformat(),
-                "startDateTime": best_window['start'].isoformat(),
-                "endDateTime": best_window['end'].isoformat(),
-                "playerCount": best_window['count'],
-                "duration_hours": best_window['duration_mins'] / 60,
-                "availablePlayers": [
-                    {
-                        "id": u.id,
-                        "name": u.name,
-                        "email": u.email,
-                        "image": u.image,
-                    }
-                    for u in best_window['players'].values()
-                ],
-            })
-
-    # Sort by player count (desc), duration (desc), then date (asc)
-    suggestions.sort(key=lambda x: (-x["playerCount"], -x["duration_hours"], x["date"]))
+    required = set(required_user_ids)
+    if require_gm:
+        required.update(
+            user_id
+            for (user_id,) in db.query(models.Membership.userId).filter(
+                models.Membership.groupId == group_id, models.Membership.role == "gm"
+            )
+        )
+    optional = None if optional_user_ids is None else frozenset(optional_user_ids)
 
-    # Return top 10 suggestions
-    return suggestions[:10]
+    cache_key = (
+        group_id, strategy, min_players, duration_hours, start_date, end_date, limit, offset,
+        frozenset(required), optional, tz,
+    )
+    cached = overlap_cache.get(cache_key)
+    if cached is not None:
+        if response_format == "columnar":
+            return columnar_response(columnar_suggestions(cached), etag_headers(etag))
+        return cached
+
+    prepared = PreparedAvailability(
+        db, group_id, start_date, end_date, required_user_ids=required, optional_user_ids=optional, tz=tz
+    )
+    try:
+        suggestions = run_strategy(strategy, prepared, min_players, duration_hours, limit, offset)
+    except OverlapPoolBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="overlaps_busy")
+    except OverlapPoolTimeout:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="overlaps_timeout")
+    overlap_state.store_suggestions(cache_key, suggestions, prepared.version)
+    if response_format == "columnar":
+        return columnar_response(columnar_suggestions(suggestions), etag_headers(etag))
+    return suggestions
@@ -0,0 +1,156 @@
+"""Bitmap availability overlap algorithm
+
+This module computes the per-day suggestions of the sweep line from the packed
+weekly ``AvailabilityBitmap`` index instead of loading Availability rows:
+1. Each member's week is split into 96-bit days and reduced to the day's hull
+   (first to last covered slot), like the sweep's earliest start and latest end
+2. XOR-ing every hull with itself shifted by one slot marks the slots where the
+   player set changes, so a day is cut into runs with a constant player set
+3. The players of a run are the hulls with its first bit set; the best run per day
+   is picked like the sweep (player count, then duration, then earliest start)
+
+Only whole 15-minute slots are stored, so suggestions equal ``sweep-per-day`` when
+every start and end lies on a slot boundary. Date filters select the days between
+``start_date`` and ``end_date`` rather than the rows overlapping them.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_bitmap import DAY_MASK, SLOT_MINUTES, SLOTS_PER_DAY, decode, week_of
+from app.routers.availability_ranking import serialize_player, top_k
+
+_SLOT = timedelta(minutes=SLOT_MINUTES)
+
+# (first slot, end slot, userIds)
+Run = Tuple[int, int, List[str]]
+
+
+def _hull(day_mask: int) -> int:
+    """Bits from the lowest to the highest set bit of ``day_mask``."""
+    return (1 << day_mask.bit_length()) - (day_mask & -day_mask)
+
+
+def find_best_run(members: List[Tuple[str, int]], min_players: int, min_slots: int) -> Optional[Run]:
+    """Best run of one day given (userId, hull) pairs ordered by hull start."""
+    if len(members) < min_players:
+        return None
+
+    # Bit i: the player set differs between slots i - 1 and i (bit 96 ends the day)
+    bounds = 0
+    for _, hull in members:
+        bounds |= hull ^ (hull << 1)
+
+    positions = []
+    while bounds:
+        low = bounds & -bounds
+        positions.append(low.bit_length() - 1)
+        bounds ^= low
+
+    best: Optional[Run] = None
+    best_count = 0
+    for first, end in zip(positions, positions[1:]):
+        if end - first < min_slots:
+            continue
+        run = 1 << first
+        players = [user_id for user_id, hull in members if hull & run]
+        count = len(players)
+        if count >= min_players and (
+            best is None
+            or count > best_count
+            or (count == best_count and end - first > best[1] - best[0])
+        ):
+            best, best_count = (first, end, players), count
+    return best
+
+
+def find_availability_overlaps_bitset(
+    db: Session,
+    group_id: str,
+    min_players: int,
+    duration_hours: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Find suggested dates from the group's availability bitmaps.
+
+    Args:
+        db: Database session
+        group_id: Group to compute suggestions for
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        start_date: Only use days on or after this date
+        end_date: Only use days on or before this date
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        List of suggestion dictionaries with date, startDateTime, endDateTime, playerCount,
+        duration_hours and availablePlayers
+    """
+    first_day: Optional[date] = start_date.date() if start_date else None
+    last_day: Optional[date] = end_date.date() if end_date else None
+
+    query = db.query(models.AvailabilityBitmap).filter(models.AvailabilityBitmap.groupId == group_id)
+    if first_day:
+        query = query.filter(models.AvailabilityBitmap.weekStart >= week_of(first_day))
+    if last_day:
+        query = query.filter(models.AvailabilityBitmap.weekStart <= last_day)
+
+    # date -> [(userId, hull)]
+    days: Dict[date, List[Tuple[str, int]]] = defaultdict(list)
+    for bitmap in query.order_by(models.AvailabilityBitmap.weekStart, models.AvailabilityBitmap.userId):
+        mask = decode(bitmap.slots)
+        for weekday in range(7):
+            day_mask = mask >> (weekday * SLOTS_PER_DAY) & DAY_MASK
+            if not day_mask:
+                continue
+            day = bitmap.weekStart + timedelta(days=weekday)
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            days[day].append((bitmap.userId, _hull(day_mask)))
+
+    min_slots = duration_hours * 60 // SLOT_MINUTES
+    candidates = []
+    for day in sorted(days):
+        members = sorted(days[day], key=lambda member: member[1] & -member[1])
+        run = find_best_run(members, min_players, min_slots)
+        if run:
+            candidates.append((day, run))
+
+    # Rank by player count (desc), duration (desc), then date (asc)
+    top = top_k(
+        candidates,
+        key=lambda c: (-len(c[1][2]), -(c[1][1] - c[1][0]), c[0]),
+        limit=max_suggestions,
+        offset=offset,
+    )
+    if not top:
+        return []
+
+    user_ids = {user_id for _, (_, _, players) in top for user_id in players}
+    users = {
+        user.id: user
+        for user in db.query(models.User).filter(models.User.id.in_(user_ids))
+    }
+
+    suggestions = []
+    for day, (first, end, players) in top:
+        midnight = datetime.combine(day, time.min)
+        duration_mins = (end - first) * SLOT_MINUTES
+        suggestions.append({
+            'date': day.isoformat(),
+            'startDateTime': (midnight + first * _SLOT).isoformat(),
+            'endDateTime': (midnight + end * _SLOT).isoformat(),
+            'playerCount': len(players),
+            'duration_hours': duration_mins / 60,
+            'availablePlayers': [serialize_player(users[user_id]) for user_id in players],
+        })
+
+    return suggestions
@@ -3,15 +3,18 @@
 This module finds which DATES (not specific time windows) have enough players available.
 It groups availability by date and checks if minimum player count is met for each day.
 """
-from datetime import datetime, date, timedelta
+from datetime import date
 from typing import List, Dict, Any
-from collections import defaultdict
+
+from app.routers.availability_ranking import serialize_player, top_k
+from app.routers.availability_sweep import bucket_by_day, free_intervals, intersect_intervals
 
 
 def find_availability_by_days(
     all_availability: list,
     min_players: int,
     max_suggestions: int = 10,
+    offset: int = 0,
 ) -> List[Dict[str, Any]]:
     """
     Find suggested dates based on player availability overlaps.
@@ -26,6 +29,7 @@ def find_availability_by_days(
         all_availability: List of Availability objects with user, startDateTime, endDateTime
         min_players: Minimum number of players required
         max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
 
     Returns:
         List of suggestion dictionaries with date, playerCount, availablePlayers
@@ -33,80 +37,71 @@ def find_availability_by_days(
     if not all_availability:
         return []
 
-    # Group availability by date
-    # Key: date object, Value: dict of userId -> (user, earliest_start, latest_end)
-    dates_availability = defaultdict(dict)
-
-    for avail in all_availability:
-        # Get all dates covered by this availability period
-        start_date = avail.startDateTime.date()
-        end_date = avail.endDateTime.date()
-
-        current_date = start_date
-        while current_date <= end_date:
-            user_id = avail.userId
-
-            # Track earliest start and latest end for this user on this date
-            if user_id in dates_availability[current_date]:
-                existing = dates_availability[current_date][user_id]
-                # Update to earliest start
-                if avail.startDateTime < existing['start']:
-                    existing['start'] = avail.startDateTime
-                # Update to latest end
-                if avail.endDateTime > existing['end']:
-                    existing['end'] = avail.endDateTime
-            else:
-                dates_availability[current_date][user_id] = {
-                    'user': avail.user,
-                    'start': avail.startDateTime,
-                    'end': avail.endDateTime,
-                }
-
-            current_date += timedelta(days=1)
+    return rank_days_by_common_window(
+        bucket_by_day(all_availability), min_players, max_suggestions, offset
+    )
+
+
+def rank_days_by_common_window(
+    dates_availability: Dict[date, Dict[str, Dict[str, Any]]],
+    min_players: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Rank days of already bucketed availability by their common window.
+
+    Args:
+        dates_availability: date -> userId -> {'user', 'start', 'end'}, as built by
+            ``availability_sweep.bucket_by_day``
+        min_players: Minimum number of players required
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
 
+    Returns:
+        List of suggestion dictionaries with date, playerCount, availablePlayers
+    """
     # Find dates with enough players
-    suggestions = []
+    candidates = []
 
     for day, players_dict in dates_availability.items():
         player_count = len(players_dict)
 
         if player_count >= min_players:
-            # Get time range for this date (from earliest start to latest end)
-            all_starts = [p['start'] for p in players_dict.values()]
-            all_ends = [p['end'] for p in players_dict.values()]
-
-            # For the suggested window, use the intersection:
-            # Latest start time (when last person becomes available)
-            # Earliest end time (when first person leaves)
-            # This ensures ALL players are available during the suggested window
-            latest_start = max(all_starts)
-            earliest_end = min(all_ends)
+            # For the suggested window, use the intersection: from when the last
+            # person becomes available until the first person leaves. This ensures
+            # ALL players are available during the suggested window; when busy time
+            # splits it, the longest remaining part is used
+            common = None
+            for player_data in players_dict.values():
+                intervals = free_intervals(player_data)
+                common = intervals if common is None else intersect_intervals(common, intervals)
 
             # Make sure there's actually an overlap (latest start < earliest end)
-            if latest_start < earliest_end:
+            if common:
+                latest_start, earliest_end = max(common, key=lambda piece: piece[1] - piece[0])
                 duration_hours = (earliest_end - latest_start).total_seconds() / 3600
+                candidates.append((day, latest_start, earliest_end, duration_hours, players_dict))
 
-                suggestions.append({
-                    'date': day.isoformat(),
-                    'startDateTime': latest_start.isoformat(),
-                    'endDateTime': earliest_end.isoformat(),
-                    'playerCount': player_count,
-                    'duration_hours': duration_hours,
-                    'availablePlayers': [
-                        {
-                            'id': p['user'].id,
-                            'name': p['user'].name,
-                            'email': p['user'].email,
-                            'image': p['user'].image,
-                        }
-                        for p in players_dict.values()
-                    ],
-                })
-
-    # Sort by:
+    # Rank by:
     # 1. Player count (descending) - more players is better
     # 2. Duration (descending) - longer overlap is better
     # 3. Date (ascending) - earlier dates first
-    suggestions.sort(key=lambda x: (-x['playerCount'], -x['duration_hours'], x['date']))
-
-    return suggestions[:max_suggestions]
+    top = top_k(
+        candidates,
+        key=lambda c: (-len(c[4]), -c[3], c[0]),
+        limit=max_suggestions,
+        offset=offset,
+    )
+
+    return [
+        {
+            'date': day.isoformat(),
+            'startDateTime': latest_start.isoformat(),
+            'endDateTime': earliest_end.isoformat(),
+            'playerCount': len(players_dict),
+            'duration_hours': duration_hours,
+            'availablePlayers': [serialize_player(p['user']) for p in players_dict.values()],
+        }
+        for day, latest_start, earliest_end, duration_hours, players_dict in top
+    ]
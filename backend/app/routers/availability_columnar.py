@@ -0,0 +1,112 @@
+"""Columnar responses of availability listings and overlap suggestions
+
+The row format repeats the full user object on every entry and every suggested
+player, so a year of a six-player group carries thousands of copies of six user
+records. With ``format=columnar`` the same data is sent as:
+- ``users``: every user once
+- parallel arrays with one element per entry or suggestion: a user index into
+  ``users`` (a list of them for suggested players), start and end as whole seconds
+  since the Unix epoch (times are UTC), and the other fields
+"""
+from datetime import datetime, timedelta
+from json import dumps
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def epoch(value: datetime) -> int:
+    """Whole seconds since the Unix epoch of a naive UTC time."""
+    return (value - _EPOCH) // _SECOND
+
+
+class UserTable:
+    """Users in order of first appearance, with their index."""
+
+    def __init__(self) -> None:
+        self.users: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+
+    def get(self, user_id: str) -> Optional[int]:
+        return self._index.get(user_id)
+
+    def add(self, user_id: str, user: Dict[str, Any]) -> int:
+        position = self._index[user_id] = len(self.users)
+        self.users.append(user)
+        return position
+
+
+def columnar_entries(rows: Iterable[Sequence], rules: Iterable[Dict[str, Any]] = ()) -> Dict[str, Any]:
+    """
+    ``availability_rows.ListingRow`` rows as columns.
+
+    ``rules`` are serialized recurring rules, listed as they are with ``rules=unexpanded``.
+    """
+    users = UserTable()
+    ids, user_indexes, starts, ends, notes, rule_ids = [], [], [], [], [], []
+    for row in rows:
+        ids.append(row.id)
+        position = users.get(row.userId)
+        if position is None:
+            position = users.add(row.userId, {
+                "id": row.user_id,
+                "email": row.user_email,
+                "name": row.user_name,
+                "image": row.user_image,
+                "isGM": row.user_isGM,
+            })
+        user_indexes.append(position)
+        starts.append(epoch(row.startDateTime))
+        ends.append(epoch(row.endDateTime))
+        notes.append(row.notes)
+        rule_ids.append(row.ruleId)
+    payload = {
+        "users": users.users,
+        "id": ids,
+        "user": user_indexes,
+        "start": starts,
+        "end": ends,
+        "notes": notes,
+        "ruleId": rule_ids,
+    }
+    rules = list(rules)
+    if rules:
+        payload["rules"] = rules
+    return payload
+
+
+def _player_index(users: UserTable, player: Dict[str, Any]) -> int:
+    position = users.get(player["id"])
+    return users.add(player["id"], player) if position is None else position
+
+
+def _windows(windows: Sequence[Dict[str, Any]], users: UserTable) -> Dict[str, List[Any]]:
+    return {
+        "start": [epoch(datetime.fromisoformat(window["startDateTime"])) for window in windows],
+        "end": [epoch(datetime.fromisoformat(window["endDateTime"])) for window in windows],
+        "players": [[_player_index(users, player) for player in window["availablePlayers"]] for window in windows],
+    }
+
+
+def columnar_suggestions(suggestions: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Overlap suggestions as columns; ``playerCount`` and ``duration_hours`` follow from
+    ``players`` and ``start``/``end``.
+
+    ``date`` is null for suggestions without one: ``merged-windows`` windows may
+    span days. The ``alternatives`` of the ``pareto`` strategy become one such
+    table per suggestion.
+    """
+    users = UserTable()
+    payload: Dict[str, Any] = {"users": users.users, "date": [suggestion.get("date") for suggestion in suggestions]}
+    payload.update(_windows(suggestions, users))
+    if any("alternatives" in suggestion for suggestion in suggestions):
+        payload["alternatives"] = [_windows(suggestion.get("alternatives", []), users) for suggestion in suggestions]
+    return payload
+
+
+def columnar_response(payload: Dict[str, Any], headers: Dict[str, str]) -> Response:
+    return Response(content=dumps(payload, separators=(",", ":")), media_type="application/json", headers=headers)
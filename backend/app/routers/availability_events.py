@@ -0,0 +1,178 @@
+"""Scheduled events as busy time of the players
+
+A player who is in a scheduled ``Event`` of any of their groups cannot play
+another session at the same time. Before the sweep:
+1. The events of every group of the involved players are loaded in one query
+   (``Event`` joined with ``Membership``, bounded by the time the entries span);
+   :func:`has_events` tells with one ``EXISTS`` whether there are any, before the
+   entries are loaded
+2. Each player's event intervals are sorted and merged into disjoint busy intervals
+3. Busy intervals are cut out of the player's bucketed day with a linear merge of
+   the two sorted lists; a day split by an event lists its ``free`` pieces
+
+Event writes and membership changes change the busy time of other groups' members,
+so they drop the state of every group sharing a member with the changed group.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import Select, exists, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_sweep import player_entry
+
+# Longest event allowed by ``EventCreateSchema``
+MAX_EVENT_DURATION = timedelta(minutes=720)
+
+Interval = Tuple[datetime, datetime]
+
+
+def load_busy(
+    db: Session,
+    user_ids: Iterable[str],
+    window_start: datetime,
+    window_end: datetime,
+) -> Dict[str, List[Interval]]:
+    """
+    Busy intervals of players from the events of all their groups.
+
+    Args:
+        db: Database session
+        user_ids: Players to load
+        window_start: Only events ending after this time
+        window_end: Only events starting before this time
+
+    Returns:
+        userId -> sorted, disjoint busy intervals; players without events are left out
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+
+    rows = (
+        db.query(models.Membership.userId, models.Event.scheduledAt, models.Event.durationMinutes)
+        .join(models.Event, models.Event.groupId == models.Membership.groupId)
+        .filter(
+            models.Membership.userId.in_(user_ids),
+            models.Event.scheduledAt < window_end,
+            models.Event.scheduledAt > window_start - MAX_EVENT_DURATION,
+        )
+        .order_by(models.Membership.userId, models.Event.scheduledAt)
+    )
+
+    busy: Dict[str, List[Interval]] = defaultdict(list)
+    for user_id, scheduled_at, duration_minutes in rows:
+        end = scheduled_at + timedelta(minutes=duration_minutes)
+        if end <= window_start:
+            continue
+        intervals = busy[user_id]
+        # Rows are ordered by start: merge with the previous interval when they touch
+        if intervals and scheduled_at <= intervals[-1][1]:
+            if end > intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], end)
+        else:
+            intervals.append((scheduled_at, end))
+    return dict(busy)
+
+
+def has_events(
+    db: Session,
+    user_ids: Union[Iterable[str], Select],
+    window_start: datetime,
+    window_end: datetime,
+) -> bool:
+    """
+    Whether :func:`load_busy` may find busy time, with one ``EXISTS`` query.
+
+    ``user_ids`` may be a subquery; events ending at or before ``window_start`` may
+    still count.
+    """
+    if not isinstance(user_ids, Select):
+        user_ids = list(user_ids)
+    return db.query(
+        exists()
+        .where(
+            models.Event.groupId == models.Membership.groupId,
+            models.Membership.userId.in_(user_ids),
+            models.Event.scheduledAt < window_end,
+            models.Event.scheduledAt > window_start - MAX_EVENT_DURATION,
+        )
+    ).scalar()
+
+
+def subtract_busy(
+    dates_availability: Dict[date, Dict[str, Dict[str, Any]]],
+    busy: Dict[str, List[Interval]],
+) -> Dict[date, Dict[str, Dict[str, Any]]]:
+    """
+    Cut busy intervals out of bucketed availability.
+
+    Days are walked in date order with one cursor per player into their busy list,
+    so each list is merged linearly with the player's days.
+
+    Args:
+        dates_availability: Output of ``availability_sweep.bucket_by_day``
+        busy: Output of :func:`load_busy`
+
+    Returns:
+        The same mapping without busy time; players left with no time on a day are
+        dropped from it, and days without players are dropped
+    """
+    if not busy:
+        return dates_availability
+
+    cursors: Dict[str, int] = defaultdict(int)
+    result = {}
+    for day in sorted(dates_availability):
+        players_dict = {}
+        for user_id, player_data in dates_availability[day].items():
+            intervals = busy.get(user_id)
+            if not intervals:
+                players_dict[user_id] = player_data
+                continue
+
+            start, end = player_data['start'], player_data['end']
+            i = cursors[user_id]
+            while i < len(intervals) and intervals[i][1] <= start:
+                i += 1
+            # An interval reaching into the next day is needed again there
+            cursors[user_id] = i
+
+            pieces = []
+            for piece_start, piece_end in player_data.get('free') or [(start, end)]:
+                j = i
+                while j < len(intervals) and intervals[j][0] < piece_end:
+                    busy_start, busy_end = intervals[j]
+                    if busy_start > piece_start:
+                        pieces.append((piece_start, busy_start))
+                    piece_start = max(piece_start, busy_end)
+                    j += 1
+                if piece_start < piece_end:
+                    pieces.append((piece_start, piece_end))
+
+            if pieces:
+                players_dict[user_id] = player_entry(player_data['user'], pieces)
+        if players_dict:
+            result[day] = players_dict
+    return result
+
+
+def groups_sharing_members(db: Session, group_id: str, user_ids: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    Groups whose suggestions depend on the events of ``group_id``.
+
+    That is every group of its members (or of ``user_ids``), including ``group_id`` itself.
+    For membership changes collect them before the write; drop their state after the commit.
+    """
+    if user_ids is None:
+        members = select(models.Membership.userId).where(models.Membership.groupId == group_id)
+    else:
+        members = list(user_ids)
+    group_ids = {
+        shared_group_id
+        for (shared_group_id,) in db.query(models.Membership.groupId).filter(models.Membership.userId.in_(members))
+    }
+    group_ids.add(group_id)
+    return group_ids
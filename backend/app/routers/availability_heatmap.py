@@ -0,0 +1,129 @@
+"""Availability heatmap: free players per time slot
+
+``/availability/heatmap`` cuts a time range into fixed slots and counts the players
+free for each whole slot, instead of ranking only the best windows:
+1. Each player's entries (ordered by start) are merged into disjoint intervals, and
+   the busy time of their scheduled events is cut out with a linear merge
+2. Every interval adds +1 at its first whole slot and -1 after its last one in a
+   difference array; a cumulative sum turns it into per-slot counts
+3. On request, the same is done per player in a (players x slots) matrix whose
+   columns are packed into bitmasks
+
+Counts cost O(entries + slots); the masks O(entries + players x slots), the size
+of their output.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.routers.availability_ranking import serialize_player
+
+Interval = Tuple[datetime, datetime]
+
+# Accepted ``resolution`` values, in minutes
+RESOLUTIONS = {"15m": 15, "30m": 30, "1h": 60}
+# Two months at the finest resolution
+MAX_SLOTS = 62 * 24 * 4
+
+
+def _merge(entries: list) -> Tuple[Dict[str, Any], Dict[str, List[Interval]]]:
+    """Users and disjoint intervals per user of entries ordered by startDateTime."""
+    users: Dict[str, Any] = {}
+    intervals: Dict[str, List[Interval]] = {}
+    for avail in entries:
+        merged = intervals.get(avail.userId)
+        if merged is None:
+            users[avail.userId] = avail.user
+            intervals[avail.userId] = [(avail.startDateTime, avail.endDateTime)]
+        elif avail.startDateTime <= merged[-1][1]:
+            if avail.endDateTime > merged[-1][1]:
+                merged[-1] = (merged[-1][0], avail.endDateTime)
+        else:
+            merged.append((avail.startDateTime, avail.endDateTime))
+    return users, intervals
+
+
+def _subtract(intervals: List[Interval], busy: List[Interval]) -> List[Interval]:
+    """Sorted disjoint ``intervals`` without the sorted disjoint ``busy`` ones."""
+    result = []
+    j = 0
+    for start, end in intervals:
+        while j < len(busy) and busy[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(busy) and busy[k][0] < end:
+            if busy[k][0] > start:
+                result.append((start, busy[k][0]))
+            start = max(start, busy[k][1])
+            k += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def availability_heatmap(
+    entries: list,
+    busy: Dict[str, List[Interval]],
+    start: datetime,
+    end: datetime,
+    resolution_minutes: int,
+    with_masks: bool = False,
+) -> Dict[str, Any]:
+    """
+    Count the players free for each whole slot from ``start`` to ``end``.
+
+    Args:
+        entries: Availability objects and rule occurrences ordered by startDateTime
+        busy: userId -> sorted, disjoint busy intervals, see ``availability_events.load_busy``
+        start: Start of the first slot
+        end: End of the range; a trailing partial slot is left out
+        resolution_minutes: Slot length in minutes
+        with_masks: Also return which players are free in each slot
+
+    Returns:
+        ``counts`` with one number per slot; with ``with_masks`` also ``members``
+        and ``masks``: per slot ``maskBytes`` bytes (base64) whose bit i, least
+        significant first, is set when ``members[i]`` is free
+    """
+    step = timedelta(minutes=resolution_minutes)
+    slot_count = max((end - start) // step, 0)
+
+    users, intervals = _merge(entries)
+    rows, firsts, lasts = [], [], []
+    for row, (user_id, merged) in enumerate(intervals.items()):
+        for interval_start, interval_end in _subtract(merged, busy.get(user_id, [])):
+            # Only slots the interval covers entirely
+            first = max(-((start - interval_start) // step), 0)
+            last = min((interval_end - start) // step, slot_count)
+            if first < last:
+                rows.append(row)
+                firsts.append(first)
+                lasts.append(last)
+
+    rows = np.array(rows, dtype=np.intp)
+    firsts = np.array(firsts, dtype=np.intp)
+    lasts = np.array(lasts, dtype=np.intp)
+    diff = np.zeros(slot_count + 1, dtype=np.int32)
+    np.add.at(diff, firsts, 1)
+    np.add.at(diff, lasts, -1)
+    counts = np.cumsum(diff[:-1])
+
+    result: Dict[str, Any] = {
+        "startDateTime": start.isoformat(),
+        "resolutionMinutes": resolution_minutes,
+        "slotCount": slot_count,
+        "counts": counts.tolist(),
+    }
+    if with_masks:
+        # Disjoint intervals per player keep every cell of the matrix at 0 or 1
+        matrix = np.zeros((len(users), slot_count + 1), dtype=np.int8)
+        np.add.at(matrix, (rows, firsts), 1)
+        np.add.at(matrix, (rows, lasts), -1)
+        free = np.cumsum(matrix[:, :-1], axis=1, dtype=np.int8).astype(bool)
+        packed = np.packbits(free, axis=0, bitorder="little")
+        result["members"] = [serialize_player(user) for user in users.values()]
+        result["maskBytes"] = packed.shape[0]
+        result["masks"] = base64.b64encode(np.ascontiguousarray(packed.T).tobytes()).decode()
+    return result
@@ -9,12 +9,15 @@ that handles edge cases better by:
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+from app.routers.availability_ranking import serialize_player, top_k
+
 
 def find_availability_overlaps(
     all_availability: list,
     min_players: int,
     duration_hours: int,
     max_suggestions: int = 10,
+    offset: int = 0,
 ) -> List[Dict[str, Any]]:
     """
     Find suggested time slots based on player availability overlaps.
@@ -30,6 +33,7 @@ def find_availability_overlaps(
         min_players: Minimum number of players required
         duration_hours: Minimum duration in hours
         max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
 
     Returns:
         List of suggestion dictionaries with startDateTime, endDateTime, playerCount, availablePlayers
@@ -79,7 +83,7 @@ def find_availability_overlaps(
         return []
 
     # Merge consecutive windows to create longer periods
-    merged_suggestions = []
+    merged_windows = []
     i = 0
 
     while i < len(valid_windows):
@@ -116,36 +120,41 @@ def find_availability_overlaps(
                 # Gap between windows, stop merging
                 break
 
-        # Create suggestion from merged windows
+        # Keep merged windows that are long enough; payloads are built for the final page only
         if merged_duration >= duration_minutes:
-            # Get full user objects for common players
-            player_users = [
-                current_window['players'][uid]
-                for uid in common_players
-                if uid in current_window['players']
-            ]
-
-            merged_suggestions.append({
-                'startDateTime': merged_start.isoformat(),
-                'endDateTime': merged_end.isoformat(),
-                'playerCount': len(common_players),
-                'duration_hours': merged_duration / 60,
-                'availablePlayers': [
-                    {
-                        'id': u.id,
-                        'name': u.name,
-                        'email': u.email,
-                        'image': u.image,
-                    }
-                    for u in player_users
-                ],
+            merged_windows.append({
+                'start': merged_start,
+                'end': merged_end,
+                'duration_minutes': merged_duration,
+                'players': current_window['players'],
+                'common_players': common_players,
             })
 
         # Move to next unprocessed window
         i = j if j > i else i + 1
 
-    # Sort suggestions by player count (descending), then by date (ascending)
-    merged_suggestions.sort(key=lambda x: (-x['playerCount'], x['startDateTime']))
-
-    # Return top suggestions
-    return merged_suggestions[:max_suggestions]
+    # Rank by player count (descending), then by date (ascending)
+    top = top_k(
+        merged_windows,
+        key=lambda w: (-len(w['common_players']), w['start']),
+        limit=max_suggestions,
+        offset=offset,
+    )
+
+    suggestions = []
+    for window in top:
+        # Get full user objects for common players
+        player_users = [
+            window['players'][uid]
+            for uid in window['common_players']
+            if uid in window['players']
+        ]
+        suggestions.append({
+            'startDateTime': window['start'].isoformat(),
+            'endDateTime': window['end'].isoformat(),
+            'playerCount': len(window['common_players']),
+            'duration_hours': window['duration_minutes'] / 60,
+            'availablePlayers': [serialize_player(u) for u in player_users],
+        })
+
+    return suggestions
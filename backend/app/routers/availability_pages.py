@@ -0,0 +1,103 @@
+"""Keyset pages and NDJSON streams of a group's availability
+
+Listing a long-running group's availability at once loads years of rows. Entries
+are ordered by (startDateTime, id) instead, which the ``ix_availability_group_start``
+index serves, so a list can be read:
+1. In pages of ``limit`` entries: the position after the last entry of a page is
+   handed out as an opaque cursor and the next page seeks past it, without an
+   ``OFFSET`` scan over the earlier pages
+2. As newline-delimited JSON: rows are fetched in batches of ``STREAM_BATCH`` from
+   a server-side cursor with ``yield_per`` and written out one line each, so memory
+   stays flat however long the history is. With ``limit`` the lines are one page,
+   whose cursor header must be known before the body is sent: the page is read
+   first, like a JSON page
+
+Occurrences of recurring rules have the same key (their id is ``ruleId@date``) and
+are merged into both in order.
+"""
+import base64
+import binascii
+from datetime import datetime
+from heapq import merge
+from typing import Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.routers.availability_rows import encode_listing
+
+STREAM_BATCH = 500
+
+Cursor = Tuple[datetime, str]
+
+
+def sort_key(avail) -> Cursor:
+    return avail.startDateTime, avail.id
+
+
+def encode_cursor(avail) -> str:
+    """Opaque cursor pointing after ``avail``."""
+    raw = f"{avail.startDateTime.isoformat()}|{avail.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """(startDateTime, id) of a cursor; raises ``ValueError`` for a malformed one."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    start, sep, availability_id = raw.partition("|")
+    if not sep or not availability_id:
+        raise ValueError("malformed cursor")
+    return datetime.fromisoformat(start), availability_id
+
+
+def seek(statement: Select, after: Optional[Cursor]) -> Select:
+    """Order ``statement`` by (startDateTime, id) and skip entries up to ``after``."""
+    if after is not None:
+        statement = statement.where(
+            # The plain bound lets the index seek; the row value breaks ties
+            models.Availability.startDateTime >= after[0],
+            tuple_(models.Availability.startDateTime, models.Availability.id) > after,
+        )
+    return statement.order_by(models.Availability.startDateTime, models.Availability.id)
+
+
+def occurrences_after(occurrences: Iterable, after: Optional[Cursor]) -> list:
+    """Occurrences ordered by (startDateTime, id), without those up to ``after``."""
+    ordered = sorted(occurrences, key=sort_key)
+    if after is None:
+        return ordered
+    return [occurrence for occurrence in ordered if sort_key(occurrence) > after]
+
+
+def merged(rows: Iterable, occurrences: list) -> Iterator:
+    """Rows and occurrences, both ordered by (startDateTime, id), as one ordered stream."""
+    if not occurrences:
+        return iter(rows)
+    return merge(rows, occurrences, key=sort_key)
+
+
+def ndjson_lines(rows: Iterable, rules: Iterable = ()) -> Iterator[str]:
+    """One JSON line per ``listing_select`` row or occurrence row, then per rule."""
+    for row in rows:
+        yield encode_listing(row) + "\n"
+    for rule in rules:
+        yield schemas.AvailabilityRuleWithUserSchema.model_validate(rule).model_dump_json() + "\n"
+
+
+def stream_lines(db: Session, statement: Select, occurrences: list, rules: Iterable = ()) -> Iterator[str]:
+    """
+    :func:`ndjson_lines` of ``statement``'s rows merged with ``occurrences``, read
+    from a server-side cursor.
+
+    Runs after the request's session was handed back: the session reconnects for
+    the stream and is closed once the last line is written.
+    """
+    try:
+        rows = db.execute(statement.execution_options(yield_per=STREAM_BATCH))
+        yield from ndjson_lines(merged(rows, occurrences), rules)
+    finally:
+        db.close()
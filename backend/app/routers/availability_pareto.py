@@ -0,0 +1,173 @@
+"""Pareto frontier of player subsets per day
+
+The sweep reports one window per day: the segment with the most players. This
+engine also answers "these 4 can play 5 hours, these 5 only 3":
+1. Each day is cut into segments at every player's (clipped) start and end, and the
+   players active in a segment are one integer bitmask over the day's players
+2. From every segment the run is extended to the right while the intersection of
+   the masks stays non-empty; each intersection is a subset that is together for
+   that whole run, and only its longest (then earliest) run is memoized
+3. Per player count the longest subset is kept, and only counts whose duration
+   beats every larger subset stay on the day's frontier
+
+A day has at most one frontier entry per player count, so the output is bounded by
+the group size. Days are ranked by their largest subset like the other engines.
+"""
+from datetime import date
+from typing import Any, Dict, List
+
+from app.routers.availability_ranking import serialize_player, top_k
+from app.routers.availability_sweep import bucket_by_day, free_intervals
+
+# {'start', 'end', 'players', 'count', 'duration_mins'}, like the sweep's best window
+Window = Dict[str, Any]
+
+
+def pareto_windows(
+    players_dict: Dict[str, Dict[str, Any]],
+    min_players: int,
+    duration_hours: int,
+) -> List[Window]:
+    """
+    Pareto frontier of player count vs. duration for one day.
+
+    Args:
+        players_dict: userId -> {'user', 'start', 'end'} for one date
+        min_players: Minimum number of players of a window
+        duration_hours: Minimum duration of a window in hours
+
+    Returns:
+        Windows ({'start', 'end', 'players', 'count', 'duration_mins'}) by player count
+        descending; each lasts strictly longer than the previous one
+    """
+    if len(players_dict) < min_players:
+        return []
+
+    user_ids = list(players_dict)
+    intervals = [free_intervals(players_dict[user_id]) for user_id in user_ids]
+    times = sorted({t for pieces in intervals for piece in pieces for t in piece})
+    time_index = {t: i for i, t in enumerate(times)}
+
+    # Active players of the segment [times[i], times[i + 1]]
+    active = [0] * (len(times) - 1)
+    for bit, pieces in enumerate(intervals):
+        for start, end in pieces:
+            for i in range(time_index[start], time_index[end]):
+                active[i] |= 1 << bit
+
+    # mask -> (duration, first boundary, last boundary) of its longest, then earliest, run
+    runs: Dict[int, tuple] = {}
+    for first in range(len(active)):
+        mask = active[first]
+        # Everyone here was already active in the previous segment: every run from
+        # here is a longer run from there
+        if first and not mask & ~active[first - 1]:
+            continue
+        last = first
+        while mask:
+            duration = (times[last + 1] - times[first]).total_seconds() / 60
+            known = runs.get(mask)
+            if known is None or duration > known[0]:
+                runs[mask] = (duration, first, last + 1)
+            last += 1
+            if last == len(active):
+                break
+            mask &= active[last]
+
+    # player count -> longest subset of that size
+    by_count: Dict[int, tuple] = {}
+    min_duration = duration_hours * 60
+    for mask, (duration, first, last) in runs.items():
+        count = mask.bit_count()
+        if count < min_players or duration < min_duration:
+            continue
+        known = by_count.get(count)
+        if known is None or duration > known[0] or (duration == known[0] and first < known[1]):
+            by_count[count] = (duration, first, last, mask)
+
+    frontier = []
+    for count in sorted(by_count, reverse=True):
+        duration, first, last, mask = by_count[count]
+        if frontier and duration <= frontier[-1]['duration_mins']:
+            continue
+        frontier.append({
+            'start': times[first],
+            'end': times[last],
+            'players': {
+                user_id: players_dict[user_id]['user']
+                for bit, user_id in enumerate(user_ids)
+                if mask >> bit & 1
+            },
+            'count': count,
+            'duration_mins': duration,
+        })
+    return frontier
+
+
+def _serialize_window(window: Window) -> Dict[str, Any]:
+    return {
+        "startDateTime": window['start'].isoformat(),
+        "endDateTime": window['end'].isoformat(),
+        "playerCount": window['count'],
+        "duration_hours": window['duration_mins'] / 60,
+        "availablePlayers": [serialize_player(u) for u in window['players'].values()],
+    }
+
+
+def rank_pareto_days(
+    dates_availability: Dict[date, Dict[str, Dict[str, Any]]],
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Rank days by their largest subset and attach the rest of each day's frontier.
+
+    Args:
+        dates_availability: Output of ``availability_sweep.bucket_by_day``
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        Suggestions for the largest subset of each day, with ``alternatives``: the
+        smaller subsets of the same day that can play longer
+    """
+    frontiers = (
+        (day, pareto_windows(players_dict, min_players, duration_hours))
+        for day, players_dict in dates_availability.items()
+    )
+
+    # Rank by player count (desc), duration (desc), then date (asc) of the largest subset
+    top = top_k(
+        ((day, frontier) for day, frontier in frontiers if frontier),
+        key=lambda item: (-item[1][0]['count'], -item[1][0]['duration_mins'], item[0]),
+        limit=max_suggestions,
+        offset=offset,
+    )
+    return [
+        {
+            "date": day.isoformat(),
+            **_serialize_window(frontier[0]),
+            "alternatives": [_serialize_window(window) for window in frontier[1:]],
+        }
+        for day, frontier in top
+    ]
+
+
+def find_pareto_overlaps(
+    all_availability: list,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Bucket availability by day and rank each day's Pareto frontier, see :func:`rank_pareto_days`."""
+    if not all_availability:
+        return []
+
+    return rank_pareto_days(
+        bucket_by_day(all_availability), min_players, duration_hours, max_suggestions, offset
+    )
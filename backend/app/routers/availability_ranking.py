@@ -0,0 +1,48 @@
+"""Shared ranking stage for availability overlap algorithms
+
+Every overlap algorithm produces one candidate window per day (or per merged
+window) and only a page of them is returned. Instead of serializing every
+candidate and sorting the full list, algorithms:
+1. Yield lightweight candidates
+2. Select the requested page with a bounded heap (O(n log k) for k = offset + limit)
+3. Build player payloads only for the selected candidates
+"""
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def top_k(
+    candidates: Iterable[T],
+    key: Callable[[T], Any],
+    limit: int,
+    offset: int = 0,
+) -> List[T]:
+    """
+    Select candidates ranked ``offset`` to ``offset + limit`` without sorting everything.
+
+    Ties keep their input order, exactly like ``sorted(candidates, key=key)[offset:offset + limit]``.
+
+    Args:
+        candidates: Iterable of candidates, consumed once
+        key: Ranking key, smaller is better
+        limit: Page size
+        offset: Number of best candidates to skip
+
+    Returns:
+        The selected candidates in rank order
+    """
+    if limit <= 0:
+        return []
+    return heapq.nsmallest(offset + limit, candidates, key=key)[offset:]
+
+
+def serialize_player(user: Any) -> Dict[str, Any]:
+    """Player payload used in every suggestion."""
+    return {
+        'id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'image': user.image,
+    }
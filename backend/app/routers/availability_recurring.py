@@ -0,0 +1,118 @@
+"""Lazy expansion of weekly recurring availability rules
+
+An ``AvailabilityRule`` ("every Tuesday 18:00-23:00") is stored once and only
+turned into concrete intervals for the window a request looks at:
+1. Each weekday of the rule's mask jumps straight to its first date in the window
+   and then steps by 7 days, so no date outside the mask is visited
+2. Dates outside validFrom/validUntil or listed as exceptions are skipped
+3. Days, times and dates are local to the rule's IANA ``timezone``; each occurrence
+   is converted to naive UTC with ``zoneinfo``, so it keeps its wall-clock time
+   across DST changes
+4. The occurrences look like ``Availability`` rows to every overlap engine
+
+Requests without an explicit window expand rules from today over
+``availability_rule_horizon_days``.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from heapq import merge
+from typing import Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.config import get_settings
+
+_ONE_DAY = timedelta(days=1)
+
+
+class Occurrence:
+    """One expanded occurrence of a rule, shaped like an ``Availability`` row."""
+
+    __slots__ = (
+        "id", "ruleId", "userId", "groupId", "user", "startDateTime", "endDateTime",
+        "notes", "createdAt", "updatedAt",
+    )
+
+    def __init__(self, rule, day: date, start: datetime, end: datetime) -> None:
+        self.id = f"{rule.id}@{day.isoformat()}"
+        self.ruleId = rule.id
+        self.userId = rule.userId
+        self.groupId = rule.groupId
+        self.user = rule.user
+        self.startDateTime = start
+        self.endDateTime = end
+        self.notes = rule.notes
+        self.createdAt = rule.createdAt
+        self.updatedAt = rule.updatedAt
+
+
+def rule_window(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> Tuple[datetime, datetime]:
+    """Window to expand rules in: the request's filters, else today plus the horizon."""
+    horizon = timedelta(days=get_settings().availability_rule_horizon_days)
+    if start_date is None:
+        start_date = datetime.combine(date.today(), time.min) if end_date is None else end_date - horizon
+    if end_date is None:
+        end_date = start_date + horizon
+    return start_date, end_date
+
+
+def _to_utc(value: datetime, zone: ZoneInfo) -> datetime:
+    """Naive UTC time of a local ``value``; a time skipped by DST uses the offset before it."""
+    return value.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def expand_rule(rule, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+    """
+    Occurrences of a rule overlapping ``[window_start, window_end]``, ordered by start.
+
+    Like the ``start_date``/``end_date`` filters of concrete rows, an occurrence is
+    kept when it ends at or after the window start and starts at or before its end.
+    The window is naive UTC; occurrence ids carry the rule's local date.
+    """
+    zone = None if rule.timezone == "UTC" else ZoneInfo(rule.timezone)
+    overnight = rule.endTime <= rule.startTime
+    # Local dates differ from UTC dates by less than a day
+    slack = timedelta() if zone is None else _ONE_DAY
+    # An overnight occurrence starting the day before the window still reaches into it
+    first = max(rule.validFrom, window_start.date() - (_ONE_DAY if overnight else timedelta()) - slack)
+    last = window_end.date() + slack
+    if rule.validUntil is not None:
+        last = min(last, rule.validUntil)
+    if first > last:
+        return []
+
+    skipped = {date.fromisoformat(day) if isinstance(day, str) else day for day in rule.exceptions or ()}
+    occurrences = []
+    for weekday in range(7):
+        if not rule.weekdays >> weekday & 1:
+            continue
+        day = first + timedelta(days=(weekday - first.weekday()) % 7)
+        while day <= last:
+            if day not in skipped:
+                start = datetime.combine(day, rule.startTime)
+                end = datetime.combine(day + _ONE_DAY if overnight else day, rule.endTime)
+                if zone is not None:
+                    start, end = _to_utc(start, zone), _to_utc(end, zone)
+                # A DST change can swallow a short occurrence whole
+                if start < end and end >= window_start and start <= window_end:
+                    occurrences.append(Occurrence(rule, day, start, end))
+            day += timedelta(days=7)
+
+    occurrences.sort(key=lambda occurrence: occurrence.startDateTime)
+    return occurrences
+
+
+def expand_rules(rules: Iterable, window_start: datetime, window_end: datetime) -> List[Occurrence]:
+    """Occurrences of several rules in the window, ordered by start."""
+    occurrences = [occurrence for rule in rules for occurrence in expand_rule(rule, window_start, window_end)]
+    occurrences.sort(key=lambda occurrence: occurrence.startDateTime)
+    return occurrences
+
+
+def with_occurrences(rows: list, occurrences: List[Occurrence]) -> list:
+    """Merge concrete rows and occurrences, both ordered by startDateTime."""
+    if not occurrences:
+        return rows
+    return list(merge(rows, occurrences, key=lambda avail: avail.startDateTime))
+
@@ -0,0 +1,260 @@
+"""ORM-free reads of availability rows
+
+Availability listings and the overlap loader only read. Loading them through the
+ORM pays for an identity map entry and instance state per ``Availability``, a
+second query for the users and pydantic's ``from_attributes`` validation of both,
+for data that is serialized and dropped right away. These reads instead:
+1. ``select`` only the needed columns, joined to ``User``, with Core: rows come
+   back as plain tuples
+2. Listings write those tuples straight to JSON text with an encoder compiled once
+   per schema: a ``%``-template of the object with one encoder per column
+3. The overlap loader turns them into ``EntryRow`` tuples sharing one ``UserRow``
+   per member, which every strategy reads like ``Availability`` rows
+
+Occurrences of recurring rules are turned into the same tuples with
+``occurrence_row``. The encoders must follow ``AvailabilitySchema`` and
+``MembershipUserSchema``; the tests compare both outputs.
+"""
+from datetime import datetime
+from json import dumps
+from json.encoder import encode_basestring
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Select, func, null, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_ranges import overlapping
+
+
+class UserRow(NamedTuple):
+    id: str
+    email: str
+    name: Optional[str]
+    image: Optional[str]
+    isGM: bool
+
+
+class EntryRow(NamedTuple):
+    """What the overlap strategies read of an ``Availability`` row."""
+
+    id: str
+    userId: str
+    user: UserRow
+    startDateTime: datetime
+    endDateTime: datetime
+
+
+class ListingRow(NamedTuple):
+    """One listed entry; the columns of ``listing_select`` in order."""
+
+    id: str
+    userId: str
+    groupId: str
+    startDateTime: datetime
+    endDateTime: datetime
+    notes: Optional[str]
+    createdAt: datetime
+    updatedAt: datetime
+    ruleId: Optional[str]
+    user_id: str
+    user_email: str
+    user_name: Optional[str]
+    user_image: Optional[str]
+    user_isGM: bool
+
+
+_AVAILABILITY_COLUMNS = (
+    models.Availability.id,
+    models.Availability.userId,
+    models.Availability.groupId,
+    models.Availability.startDateTime,
+    models.Availability.endDateTime,
+    models.Availability.notes,
+    models.Availability.createdAt,
+    models.Availability.updatedAt,
+    # Only occurrences of rules carry one
+    null().label("ruleId"),
+)
+
+_USER_COLUMNS = (
+    models.User.id.label("user_id"),
+    models.User.email.label("user_email"),
+    models.User.name.label("user_name"),
+    models.User.image.label("user_image"),
+    models.User.isGM.label("user_isGM"),
+)
+
+
+def _filtered(
+    db: Session,
+    statement: Select,
+    group_id: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    user_ids: Optional[Iterable[str]] = None,
+) -> Select:
+    statement = statement.where(models.Availability.groupId == group_id, *overlapping(db, start_date, end_date))
+    if user_ids is not None:
+        statement = statement.where(models.Availability.userId.in_(user_ids))
+    return statement
+
+
+def listing_select(
+    db: Session,
+    group_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """Columns of ``ListingRow`` for a group's entries overlapping the date filters."""
+    statement = select(*_AVAILABILITY_COLUMNS, *_USER_COLUMNS).join(
+        models.User, models.User.id == models.Availability.userId
+    )
+    return _filtered(db, statement, group_id, start_date, end_date)
+
+
+def member_select(group_id: str, user_id: str) -> Select:
+    """Columns of ``AvailabilitySchema`` for one member's entries, ordered by start."""
+    return (
+        select(*_AVAILABILITY_COLUMNS)
+        .where(models.Availability.groupId == group_id, models.Availability.userId == user_id)
+        .order_by(models.Availability.startDateTime)
+    )
+
+
+def load_entries(
+    db: Session,
+    group_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_ids: Optional[Iterable[str]] = None,
+) -> list[EntryRow]:
+    """A group's entries overlapping the date filters, ordered by startDateTime."""
+    statement = select(
+        models.Availability.id,
+        models.Availability.userId,
+        models.Availability.startDateTime,
+        models.Availability.endDateTime,
+        *_USER_COLUMNS[1:],
+    ).join(models.User, models.User.id == models.Availability.userId)
+    statement = _filtered(db, statement, group_id, start_date, end_date, user_ids)
+
+    users: dict[str, UserRow] = {}
+    entries = []
+    for availability_id, user_id, start, end, email, name, image, is_gm in db.execute(
+        statement.order_by(models.Availability.startDateTime)
+    ):
+        user = users.get(user_id)
+        if user is None:
+            user = users[user_id] = UserRow(user_id, email, name, image, is_gm)
+        entries.append(EntryRow(availability_id, user_id, user, start, end))
+    return entries
+
+
+def entry_span(
+    db: Session,
+    group_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_ids: Optional[Iterable[str]] = None,
+) -> Optional[Tuple[datetime, datetime]]:
+    """Earliest start and latest end of the entries ``load_entries`` reads, without reading them."""
+    statement = select(func.min(models.Availability.startDateTime), func.max(models.Availability.endDateTime))
+    first, last = db.execute(_filtered(db, statement, group_id, start_date, end_date, user_ids)).one()
+    return None if first is None else (first, last)
+
+
+def entry_users(
+    db: Session,
+    group_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_ids: Optional[Iterable[str]] = None,
+) -> Select:
+    """Subquery of the players of the entries ``load_entries`` reads."""
+    return _filtered(db, select(models.Availability.userId), group_id, start_date, end_date, user_ids)
+
+
+def occurrence_row(occurrence) -> ListingRow:
+    """A rule occurrence as a listed entry."""
+    user = occurrence.user
+    return ListingRow(
+        occurrence.id, occurrence.userId, occurrence.groupId, occurrence.startDateTime,
+        occurrence.endDateTime, occurrence.notes, occurrence.createdAt, occurrence.updatedAt,
+        occurrence.ruleId, user.id, user.email, user.name, user.image, user.isGM,
+    )
+
+
+def _string(value: Optional[str]) -> str:
+    return "null" if value is None else encode_basestring(value)
+
+
+def _datetime(value: datetime) -> str:
+    return '"' + value.isoformat() + '"'
+
+
+def _bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+Field = Tuple[str, Union[Callable[[object], str], Sequence["Field"]]]
+
+
+def compile_encoder(fields: Sequence[Field]) -> Callable[[Sequence], str]:
+    """
+    Encoder of rows as JSON objects with the keys of ``fields``, in order.
+
+    A field pairs a key with the encoder of one column, or with nested fields for
+    an object; the columns of all encoders follow each other in the row.
+    """
+    encoders: list[Callable[[object], str]] = []
+
+    def template(nested: Sequence[Field]) -> str:
+        members = []
+        for key, field in nested:
+            if callable(field):
+                encoders.append(field)
+                members.append(dumps(key) + ":%s")
+            else:
+                members.append(dumps(key) + ":" + template(field))
+        return "{" + ",".join(members) + "}"
+
+    text = template(fields)
+
+    def encode(row: Sequence) -> str:
+        return text % tuple([encoder(value) for encoder, value in zip(encoders, row)])
+
+    return encode
+
+
+_AVAILABILITY_FIELDS: list[Field] = [
+    ("id", _string),
+    ("userId", _string),
+    ("groupId", _string),
+    ("startDateTime", _datetime),
+    ("endDateTime", _datetime),
+    ("notes", _string),
+    ("createdAt", _datetime),
+    ("updatedAt", _datetime),
+    ("ruleId", _string),
+]
+
+# AvailabilitySchema
+encode_availability = compile_encoder(_AVAILABILITY_FIELDS)
+
+# AvailabilityWithUserSchema
+encode_listing = compile_encoder([
+    *_AVAILABILITY_FIELDS,
+    ("user", [
+        ("id", _string),
+        ("email", _string),
+        ("name", _string),
+        ("image", _string),
+        ("isGM", _bool),
+    ]),
+])
+
+
+def json_array(items: Iterable[str]) -> bytes:
+    """Response body of a list of encoded objects."""
+    return ("[" + ",".join(items) + "]").encode()
@@ -0,0 +1,159 @@
+"""Postgres-side availability overlap algorithm
+
+This module computes the same per-day suggestions as the sweep line in
+``availability_sweep.find_daily_overlaps`` inside the database, so Python only
+receives the final page of windows instead of every Availability row:
+1. Entries are expanded onto every date they cover, clipped to that date and
+   reduced to one interval per (date, player): earliest start, latest end
+2. Interval starts and ends are emitted as +1/-1 events with ``UNION ALL``
+3. A running ``sum()`` window over each day's boundaries gives the player count
+   of every segment, and ``lead()`` its end
+4. The best qualifying segment per day is ranked and returned with the ids of its
+   players aggregated into an array
+
+Only PostgreSQL is supported; other dialects use the Python engines.
+"""
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_ranking import serialize_player
+
+_OVERLAPS_SQL = """
+WITH entries AS (
+    SELECT "userId", "startDateTime" AS s, "endDateTime" AS e
+    FROM "Availability"
+    WHERE "groupId" = :group_id {filters}
+),
+hulls AS (
+    SELECT d::date AS day, "userId", min(greatest(s, d)) AS s, max(least(e, d + interval '1 day')) AS e
+    FROM entries
+    -- An entry ending at midnight does not cover the next day
+    CROSS JOIN LATERAL generate_series(
+        s::date::timestamp,
+        greatest(s, e - interval '1 microsecond')::date::timestamp,
+        interval '1 day'
+    ) AS d
+    GROUP BY d::date, "userId"
+),
+events AS (
+    SELECT day, s AS t, 1 AS delta FROM hulls
+    UNION ALL
+    SELECT day, e AS t, -1 AS delta FROM hulls
+),
+boundaries AS (
+    SELECT day, t, sum(delta) AS delta
+    FROM events
+    GROUP BY day, t
+),
+segments AS (
+    SELECT
+        day,
+        t AS seg_start,
+        lead(t) OVER (PARTITION BY day ORDER BY t) AS seg_end,
+        sum(delta) OVER (PARTITION BY day ORDER BY t ROWS UNBOUNDED PRECEDING) AS player_count
+    FROM boundaries
+),
+best AS (
+    SELECT DISTINCT ON (day) day, seg_start, seg_end, player_count
+    FROM segments
+    WHERE seg_end IS NOT NULL
+      AND player_count >= :min_players
+      AND seg_end - seg_start >= make_interval(hours => :duration_hours)
+    ORDER BY day, player_count DESC, seg_end - seg_start DESC, seg_start
+),
+page AS (
+    SELECT *
+    FROM best
+    ORDER BY player_count DESC, seg_end - seg_start DESC, day
+    LIMIT :limit OFFSET :offset
+)
+SELECT
+    page.day,
+    page.seg_start,
+    page.seg_end,
+    page.player_count,
+    array_agg(hulls."userId" ORDER BY hulls.s, hulls."userId") AS player_ids
+FROM page
+JOIN hulls ON hulls.day = page.day AND hulls.s <= page.seg_start AND hulls.e >= page.seg_end
+GROUP BY page.day, page.seg_start, page.seg_end, page.player_count
+ORDER BY page.player_count DESC, page.seg_end - page.seg_start DESC, page.day
+"""
+
+
+def supports_sql_engine(db: Session) -> bool:
+    """Whether the session's database can run the SQL engine."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def find_availability_overlaps_sql(
+    db: Session,
+    group_id: str,
+    min_players: int,
+    duration_hours: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Find suggested dates based on player availability overlaps, computed in Postgres.
+
+    Args:
+        db: Database session bound to PostgreSQL
+        group_id: Group to compute suggestions for
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        start_date: Only use entries ending at or after this time
+        end_date: Only use entries starting at or before this time
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        List of suggestion dictionaries with date, startDateTime, endDateTime, playerCount,
+        duration_hours and availablePlayers
+    """
+    filters = ""
+    params: Dict[str, Any] = {
+        "group_id": group_id,
+        "min_players": min_players,
+        "duration_hours": duration_hours,
+        "limit": max_suggestions,
+        "offset": offset,
+    }
+    if start_date and end_date and start_date > end_date:
+        # An inverted range selects the entries covering all of it, see availability_ranges
+        filters = " AND during @> tsrange(CAST(:end_date AS timestamp), CAST(:start_date AS timestamp), '[]')"
+    elif start_date or end_date:
+        # Served by the GiST index on during, see availability_ranges
+        filters = " AND during && tsrange(CAST(:start_date AS timestamp), CAST(:end_date AS timestamp), '[]')"
+    if filters:
+        params["start_date"] = start_date
+        params["end_date"] = end_date
+
+    rows = db.execute(text(_OVERLAPS_SQL.format(filters=filters)), params).all()
+    if not rows:
+        return []
+
+    user_ids = {user_id for row in rows for user_id in row.player_ids}
+    users = {
+        user.id: user
+        for user in db.query(models.User).filter(models.User.id.in_(user_ids))
+    }
+
+    suggestions = []
+    for row in rows:
+        duration_mins = (row.seg_end - row.seg_start).total_seconds() / 60
+        suggestions.append({
+            'date': row.day.isoformat(),
+            'startDateTime': row.seg_start.isoformat(),
+            'endDateTime': row.seg_end.isoformat(),
+            'playerCount': int(row.player_count),
+            'duration_hours': duration_mins / 60,
+            'availablePlayers': [serialize_player(users[user_id]) for user_id in row.player_ids],
+        })
+
+    return suggestions
@@ -0,0 +1,324 @@
+"""Registry of availability overlap strategies
+
+``/availability/overlaps`` can be served by several algorithms. Each one is
+registered here under a name and called with the same arguments:
+1. A :class:`PreparedAvailability` holding the group's rows and the occurrences
+   of its recurring rules, loaded at most once and bucketed by day at most once,
+   whichever strategies read them
+2. ``min_players``, ``duration_hours``, ``max_suggestions`` and ``offset``
+
+Scheduled events of every group of the players are busy time: they are cut out of
+``dates_availability`` before any sweep, see ``availability_events``. Strategies
+decide whether to fall back with ``may_be_busy``, which checks for events without
+loading the entries.
+
+Attendee constraints live on the prepared availability: rows of players outside
+``optional_user_ids`` are never loaded, and days and segments without every
+required player are pruned from ``dates_availability`` before any sweep. The
+strategies reading ``dates_availability`` run on the pruned days; the others fall
+back to ``sweep-per-day`` for constrained requests and for players with events.
+
+With a ``tz`` the days are bucketed at the timezone's local midnights, see
+``availability_timezones``. Only the strategies reading ``dates_availability`` know
+local days; the others, the held day state and the process pool fall back likewise.
+
+Registered strategies:
+- ``sweep-per-day``: reference sweep line per day (default). Unfiltered requests
+  are served from the group's incrementally maintained day state; groups above
+  the process pool threshold are swept by ``overlap_pool`` instead
+- ``merged-windows``: merges each player's intervals and intersects them across players
+- ``by-days``: window where all players of a day overlap, ignoring ``duration_hours``
+- ``pareto``: per day, the largest subset of players plus the smaller subsets that
+  can play longer (``alternatives``)
+- ``vectorized``: NumPy slot matrix engine, same results as ``sweep-per-day``; reads
+  the rows as epoch offsets computed by the database unless they are loaded or the
+  group has recurring rules
+- ``sql``: computed inside PostgreSQL, same results as ``sweep-per-day``; other
+  databases and groups with recurring rules fall back to ``sweep-per-day``
+- ``bitset``: computed from the packed weekly ``AvailabilityBitmap`` index at
+  15-minute resolution; groups with recurring rules fall back to ``sweep-per-day``
+"""
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from app import models, overlap_state
+from app.overlap_pool import overlap_pool
+from app.routers.availability_bitset import find_availability_overlaps_bitset
+from app.routers.availability_events import has_events, load_busy, subtract_busy
+from app.routers.availability_by_days import rank_days_by_common_window
+from app.routers.availability_improved import find_availability_overlaps
+from app.routers.availability_pareto import rank_pareto_days
+from app.routers.availability_recurring import expand_rules, rule_window, with_occurrences
+from app.routers.availability_rows import entry_span, entry_users, load_entries
+from app.routers.availability_sql import find_availability_overlaps_sql, supports_sql_engine
+from app.routers.availability_sweep import bucket_by_day, constrain_days, rank_daily_windows
+from app.routers.availability_timezones import local_days
+from app.routers.availability_vectorized import (
+    find_availability_overlaps_vectorized,
+    find_availability_overlaps_vectorized_db,
+    supports_epochs,
+)
+
+Strategy = Callable[["PreparedAvailability", int, int, int, int], List[Dict[str, Any]]]
+
+STRATEGIES: Dict[str, Strategy] = {}
+DEFAULT_STRATEGY = "sweep-per-day"
+
+
+def register_strategy(name: str) -> Callable[[Strategy], Strategy]:
+    """Register an overlap strategy under ``name``."""
+    def decorator(func: Strategy) -> Strategy:
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+class PreparedAvailability:
+    """A group's availability for one request, loaded and bucketed lazily and only once."""
+
+    def __init__(
+        self,
+        db: Optional[Session],
+        group_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        entries: Optional[list] = None,
+        required_user_ids: Iterable[str] = (),
+        optional_user_ids: Optional[Iterable[str]] = None,
+        tz: Optional[str] = None,
+        busy: Optional[Dict[str, list]] = None,
+    ) -> None:
+        self.db = db
+        self.group_id = group_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.required_user_ids = frozenset(required_user_ids)
+        # IANA timezone whose local days bucket the entries; None buckets by UTC date
+        self.tz = tz
+        # Players who may count towards a window; None means every member
+        self.allowed_user_ids = (
+            None if optional_user_ids is None else self.required_user_ids | frozenset(optional_user_ids)
+        )
+        # Capture the write version before any row is read
+        self.version = overlap_state.group_version(group_id)
+        if entries is not None and self.allowed_user_ids is not None:
+            entries = [avail for avail in entries if avail.userId in self.allowed_user_ids]
+        self._entries = entries
+        self._rules: Optional[list] = None if entries is None else []
+        # Given busy time, e.g. loaded once for several groups, is not loaded again
+        self._busy: Optional[Dict[str, list]] = busy if busy is not None or db is not None else {}
+        self._may_be_busy: Optional[bool] = None
+        self._dates_availability: Optional[Dict[date, Dict[str, Dict[str, Any]]]] = None
+
+    @property
+    def unfiltered(self) -> bool:
+        return self.start_date is None and self.end_date is None and not self.constrained and self.tz is None
+
+    @property
+    def constrained(self) -> bool:
+        return bool(self.required_user_ids) or self.allowed_user_ids is not None
+
+    @property
+    def rules(self) -> list:
+        """The group's recurring availability rules."""
+        if self._rules is None:
+            query = (
+                self.db.query(models.AvailabilityRule)
+                .options(selectinload(models.AvailabilityRule.user))
+                .filter(models.AvailabilityRule.groupId == self.group_id)
+            )
+            if self.allowed_user_ids is not None:
+                query = query.filter(models.AvailabilityRule.userId.in_(self.allowed_user_ids))
+            self._rules = query.order_by(models.AvailabilityRule.createdAt).all()
+        return self._rules
+
+    @property
+    def entries(self) -> list:
+        """Rows and rule occurrences overlapping the date filters, ordered by startDateTime."""
+        if self._entries is None:
+            rows = load_entries(self.db, self.group_id, self.start_date, self.end_date, self.allowed_user_ids)
+            occurrences = expand_rules(self.rules, *rule_window(self.start_date, self.end_date))
+            self._entries = with_occurrences(rows, occurrences)
+        return self._entries
+
+    @property
+    def busy(self) -> Dict[str, list]:
+        """Busy intervals of the entries' players from the events of all their groups."""
+        if self._busy is None:
+            entries = self.entries
+            self._busy = {}
+            if entries:
+                self._busy = load_busy(
+                    self.db,
+                    {avail.userId for avail in entries},
+                    entries[0].startDateTime,
+                    max(avail.endDateTime for avail in entries),
+                )
+        return self._busy
+
+    @property
+    def may_be_busy(self) -> bool:
+        """
+        Whether ``busy`` may be non-empty.
+
+        Until the entries are loaded this is one ``EXISTS`` query for events over
+        the rows' span, so strategies reading neither entries nor busy time (``sql``,
+        ``bitset``) can decide to run without loading them. Rule occurrences are
+        not in that span: with rules the busy time is loaded.
+        """
+        if self._busy is not None or self._entries is not None or self.rules:
+            return bool(self.busy)
+        if self._may_be_busy is None:
+            filters = (self.db, self.group_id, self.start_date, self.end_date, self.allowed_user_ids)
+            span = entry_span(*filters)
+            self._may_be_busy = span is not None and has_events(self.db, entry_users(*filters), *span)
+        return self._may_be_busy
+
+    @property
+    def pruned(self) -> bool:
+        """Whether ``dates_availability`` may differ from bucketing the entries by UTC date."""
+        return self.constrained or self.tz is not None or self.may_be_busy
+
+    @property
+    def dates_availability(self) -> Dict[date, Dict[str, Dict[str, Any]]]:
+        """
+        Entries bucketed by date and user, see ``availability_sweep.bucket_by_day``,
+        without busy time and pruned to the time all required players share.
+        """
+        if self._dates_availability is None:
+            entries = self.entries
+            if self.tz is None or not entries:
+                bucketed = bucket_by_day(entries)
+            else:
+                days = local_days(self.tz, entries[0].startDateTime, max(avail.endDateTime for avail in entries))
+                bucketed = bucket_by_day(entries, days)
+            self._dates_availability = constrain_days(
+                subtract_busy(bucketed, self.busy), self.required_user_ids
+            )
+        return self._dates_availability
+
+
+def run_strategy(
+    name: str,
+    prepared: PreparedAvailability,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """Run a registered strategy; raises ``KeyError`` for unknown names."""
+    return STRATEGIES[name](prepared, min_players, duration_hours, max_suggestions, offset)
+
+
+@register_strategy("sweep-per-day")
+def sweep_per_day(prepared, min_players, duration_hours, max_suggestions, offset):
+    incremental = prepared.unfiltered and prepared.db is not None
+    state = overlap_state.get_state(prepared.group_id) if incremental else None
+    if state is not None:
+        return state.suggestions(min_players, duration_hours, max_suggestions, offset)
+    if not prepared.pruned and overlap_pool.should_offload(prepared.entries):
+        return overlap_pool.find_daily_overlaps(
+            prepared.entries, min_players, duration_hours, max_suggestions, offset
+        )
+    if incremental and not prepared.may_be_busy:
+        state = overlap_state.GroupDayState(prepared.entries)
+        overlap_state.store_state(prepared.group_id, state, prepared.version)
+        return state.suggestions(min_players, duration_hours, max_suggestions, offset)
+    return rank_daily_windows(
+        prepared.dates_availability, min_players, duration_hours, max_suggestions, offset
+    )
+
+
+@register_strategy("merged-windows")
+def merged_windows(prepared, min_players, duration_hours, max_suggestions, offset):
+    if prepared.pruned:
+        return sweep_per_day(prepared, min_players, duration_hours, max_suggestions, offset)
+    return find_availability_overlaps(
+        prepared.entries, min_players, duration_hours, max_suggestions, offset
+    )
+
+
+@register_strategy("by-days")
+def by_days(prepared, min_players, duration_hours, max_suggestions, offset):
+    return rank_days_by_common_window(
+        prepared.dates_availability, min_players, max_suggestions, offset
+    )
+
+
+@register_strategy("pareto")
+def pareto(prepared, min_players, duration_hours, max_suggestions, offset):
+    return rank_pareto_days(
+        prepared.dates_availability, min_players, duration_hours, max_suggestions, offset
+    )
+
+
+@register_strategy("vectorized")
+def vectorized(prepared, min_players, duration_hours, max_suggestions, offset):
+    if prepared.pruned:
+        return sweep_per_day(prepared, min_players, duration_hours, max_suggestions, offset)
+    if prepared.db is not None and prepared._entries is None and supports_epochs(prepared.db) and not prepared.rules:
+        return find_availability_overlaps_vectorized_db(
+            prepared.db,
+            prepared.group_id,
+            min_players,
+            duration_hours,
+            prepared.start_date,
+            prepared.end_date,
+            max_suggestions,
+            offset,
+        )
+    return find_availability_overlaps_vectorized(
+        prepared.entries, min_players, duration_hours, max_suggestions, offset
+    )
+
+
+@register_strategy("sql")
+def sql(prepared, min_players, duration_hours, max_suggestions, offset):
+    # The query needs Postgres (generate_series, DISTINCT ON, arrays), reads concrete
+    # rows only and knows no attendee constraints, events or local days; use the
+    # Python sweep otherwise
+    if (
+        prepared.db is None
+        or not supports_sql_engine(prepared.db)
+        or prepared.constrained
+        or prepared.tz is not None
+        or prepared.rules
+        or prepared.may_be_busy
+    ):
+        return sweep_per_day(prepared, min_players, duration_hours, max_suggestions, offset)
+    return find_availability_overlaps_sql(
+        prepared.db,
+        prepared.group_id,
+        min_players,
+        duration_hours,
+        prepared.start_date,
+        prepared.end_date,
+        max_suggestions,
+        offset,
+    )
+
+
+@register_strategy("bitset")
+def bitset(prepared, min_players, duration_hours, max_suggestions, offset):
+    # The bitmaps index concrete rows by UTC week only and know no attendee
+    # constraints or events
+    if (
+        prepared.db is None
+        or prepared.constrained
+        or prepared.tz is not None
+        or prepared.rules
+        or prepared.may_be_busy
+    ):
+        return sweep_per_day(prepared, min_players, duration_hours, max_suggestions, offset)
+    return find_availability_overlaps_bitset(
+        prepared.db,
+        prepared.group_id,
+        min_players,
+        duration_hours,
+        prepared.start_date,
+        prepared.end_date,
+        max_suggestions,
+        offset,
+    )
@@ -0,0 +1,98 @@
+"""Cross-group session suggestions
+
+``/users/me/suggestions`` ranks the best session slots of every group of a user
+from a single load of their availability:
+1. The rows of all groups are split per group, keeping their startDateTime order
+2. The default overlap strategy runs on each group's in-memory rows, with the
+   busy time of the players' events loaded once for all groups
+3. The per-group pages are merged into one ranking (player count, duration, date)
+4. Slots where the user would play in two groups at overlapping times are flagged
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.routers.availability_ranking import top_k
+from app.routers.availability_strategies import DEFAULT_STRATEGY, PreparedAvailability, run_strategy
+
+
+def find_cross_group_suggestions(
+    all_availability: list,
+    group_names: Dict[str, str],
+    user_id: str,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+    tz: Optional[str] = None,
+    busy: Optional[Dict[str, list]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank session slots of several groups together.
+
+    Args:
+        all_availability: Availability objects of every group, ordered by startDateTime
+        group_names: groupId -> name, in the order ties between groups are ranked
+        user_id: User whose overlapping sessions are flagged
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+        tz: Timezone whose local days group the slots; None uses UTC dates
+        busy: Busy intervals of the players, see ``availability_events.load_busy``
+
+    Returns:
+        Overlap suggestions with groupId, groupName and conflicts: the other groups'
+        candidate slots that include the user at an overlapping time
+    """
+    by_group: Dict[str, list] = {group_id: [] for group_id in group_names}
+    for avail in all_availability:
+        by_group.setdefault(avail.groupId, []).append(avail)
+
+    # The merged page can only contain each group's own top offset + max_suggestions slots
+    candidates = []
+    for group_id, entries in by_group.items():
+        if not entries:
+            continue
+        prepared = PreparedAvailability(None, group_id, entries=entries, tz=tz, busy=busy)
+        for suggestion in run_strategy(
+            DEFAULT_STRATEGY, prepared, min_players, duration_hours, offset + max_suggestions
+        ):
+            candidates.append({
+                **suggestion,
+                'groupId': group_id,
+                'groupName': group_names.get(group_id),
+            })
+
+    top = top_k(
+        candidates,
+        key=lambda s: (-s['playerCount'], -s['duration_hours'], s['date']),
+        limit=max_suggestions,
+        offset=offset,
+    )
+
+    # Slots the user plays in, with parsed bounds for the collision check
+    playing = [
+        (s, datetime.fromisoformat(s['startDateTime']), datetime.fromisoformat(s['endDateTime']))
+        for s in candidates
+        if any(player['id'] == user_id for player in s['availablePlayers'])
+    ]
+
+    suggestions = []
+    for suggestion in top:
+        conflicts = []
+        if any(player['id'] == user_id for player in suggestion['availablePlayers']):
+            start = datetime.fromisoformat(suggestion['startDateTime'])
+            end = datetime.fromisoformat(suggestion['endDateTime'])
+            conflicts = [
+                {
+                    'groupId': other['groupId'],
+                    'groupName': other['groupName'],
+                    'startDateTime': other['startDateTime'],
+                    'endDateTime': other['endDateTime'],
+                }
+                for other, other_start, other_end in playing
+                if other['groupId'] != suggestion['groupId'] and other_start < end and start < other_end
+            ]
+        suggestions.append({**suggestion, 'conflicts': conflicts})
+
+    return suggestions
@@ -0,0 +1,300 @@
+"""Day-bucketed sweep line overlap algorithm
+
+This is the reference implementation behind ``/availability/overlaps``:
+1. Availability is clipped to the calendar days it covers and grouped by DATE,
+   keeping each player's earliest start and latest end within the day; a player
+   entry may also list its ``free`` intervals when busy time was cut out of it
+2. A sweep line over every day finds the segment where the most players overlap
+3. Days are ranked by player count, duration, then date
+
+The steps are exposed separately so that incremental callers can rebucket or
+re-sweep single days; alternative engines must return exactly the same suggestions.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+
+from app.routers.availability_ranking import serialize_player, top_k
+from app.routers.availability_timezones import LocalDays
+
+
+_ONE_DAY = timedelta(days=1)
+
+
+def day_span(start: datetime, end: datetime) -> Tuple[date, date]:
+    """First and last date an interval covers; an end at midnight does not cover that day."""
+    last = end.date()
+    if end.time() == time.min and last > start.date():
+        last -= _ONE_DAY
+    return start.date(), last
+
+
+def clip_to_days(start: datetime, end: datetime) -> Iterator[Tuple[date, datetime, datetime]]:
+    """
+    Split an interval into (date, start, end) segments, one per calendar day.
+
+    The first and last segments are the partial days; every day in between is a
+    full midnight-to-midnight segment, so no date is walked or compared.
+    """
+    first, last = day_span(start, end)
+    if first == last:
+        yield first, start, end
+        return
+
+    midnight = datetime.combine(first, time.min, tzinfo=start.tzinfo) + _ONE_DAY
+    yield first, start, midnight
+    for offset in range(1, (last - first).days):
+        yield first + timedelta(days=offset), midnight, midnight + _ONE_DAY
+        midnight += _ONE_DAY
+    yield last, midnight, end
+
+
+def bucket_by_day(
+    all_availability: list,
+    local_days: Optional[LocalDays] = None,
+) -> Dict[date, Dict[str, Dict[str, Any]]]:
+    """
+    Group availability by every date it covers, clipped to that date.
+
+    Args:
+        all_availability: List of Availability objects ordered by startDateTime
+        local_days: Boundaries covering the entries, to split them at local
+            midnights instead of UTC midnights
+
+    Returns:
+        Mapping of date -> userId -> {'user', 'start', 'end'} with the player's
+        earliest start and latest end within that date
+    """
+    dates_availability = defaultdict(dict)
+    clip = clip_to_days if local_days is None else local_days.clip
+
+    for avail in all_availability:
+        user_id = avail.userId
+        for day, start, end in clip(avail.startDateTime, avail.endDateTime):
+            existing = dates_availability[day].get(user_id)
+            if existing is None:
+                dates_availability[day][user_id] = {'user': avail.user, 'start': start, 'end': end}
+            else:
+                # Track earliest start and latest end for this user on this date
+                if start < existing['start']:
+                    existing['start'] = start
+                if end > existing['end']:
+                    existing['end'] = end
+
+    return dates_availability
+
+
+def free_intervals(player_data: Dict[str, Any]) -> List[Tuple[datetime, datetime]]:
+    """A player's intervals of one day: the ``free`` pieces, else start to end."""
+    return player_data.get('free') or [(player_data['start'], player_data['end'])]
+
+
+def intersect_intervals(
+    a: List[Tuple[datetime, datetime]],
+    b: List[Tuple[datetime, datetime]],
+) -> List[Tuple[datetime, datetime]]:
+    """Intersection of two sorted lists of disjoint intervals, by a linear merge."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def player_entry(user: Any, intervals: List[Tuple[datetime, datetime]]) -> Dict[str, Any]:
+    """Bucketed player data for non-empty sorted intervals, listing them when there are several."""
+    player_data = {'user': user, 'start': intervals[0][0], 'end': intervals[-1][1]}
+    if len(intervals) > 1:
+        player_data['free'] = intervals
+    return player_data
+
+
+def constrain_days(
+    dates_availability: Dict[date, Dict[str, Dict[str, Any]]],
+    required_user_ids: frozenset,
+) -> Dict[date, Dict[str, Dict[str, Any]]]:
+    """
+    Prune bucketed availability to the time every required player shares.
+
+    Days missing a required player, or where the required players do not overlap,
+    are dropped. On the remaining days every player is clipped to the intervals all
+    required players share, so the sweep only sees segments they attend and picks
+    the same window as sweeping everything and discarding the others.
+
+    Args:
+        dates_availability: Output of :func:`bucket_by_day`
+        required_user_ids: Players every window must include
+
+    Returns:
+        The constrained mapping of date -> userId -> {'user', 'start', 'end'}
+    """
+    if not required_user_ids:
+        return dates_availability
+
+    constrained = {}
+    for day, players_dict in dates_availability.items():
+        if not required_user_ids <= players_dict.keys():
+            continue
+        shared = None
+        for user_id in required_user_ids:
+            intervals = free_intervals(players_dict[user_id])
+            shared = intervals if shared is None else intersect_intervals(shared, intervals)
+        if not shared:
+            continue
+        constrained[day] = {}
+        for user_id, player_data in players_dict.items():
+            clipped = intersect_intervals(free_intervals(player_data), shared)
+            if clipped:
+                constrained[day][user_id] = player_entry(player_data['user'], clipped)
+    return constrained
+
+
+def find_best_window(
+    players_dict: Dict[str, Dict[str, Any]],
+    min_players: int,
+    duration_hours: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Find the best time segment of one day with a sweep line.
+
+    Instead of requiring ALL players on a date to overlap simultaneously,
+    we find the best time segment where the maximum number of players overlap.
+
+    Args:
+        players_dict: userId -> {'user', 'start', 'end'} for one date
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+
+    Returns:
+        The best window ({'start', 'end', 'players', 'count', 'duration_mins'}) or None
+    """
+    if len(players_dict) < min_players:
+        return None
+
+    # Build sweep line events: end events (type=0) sort before start events (type=1)
+    # at the same timestamp so we don't count a player leaving and joining at the
+    # exact same moment as an overlap.
+    events = []
+    for user_id, player_data in players_dict.items():
+        for start, end in free_intervals(player_data):
+            events.append((start, 1, user_id, player_data['user']))  # start
+            events.append((end, 0, user_id, player_data['user']))    # end
+
+    events.sort(key=lambda x: (x[0], x[1]))
+
+    active_players = {}
+    prev_time = None
+    best_window = None
+
+    for time, event_type, user_id, user in events:
+        if prev_time is not None and active_players and prev_time < time:
+            count = len(active_players)
+            duration_mins = (time - prev_time).total_seconds() / 60
+
+            if count >= min_players and duration_mins >= duration_hours * 60:
+                if (best_window is None
+                        or count > best_window['count']
+                        or (count == best_window['count'] and duration_mins > best_window['duration_mins'])):
+                    best_window = {
+                        'start': prev_time,
+                        'end': time,
+                        'players': dict(active_players),
+                        'count': count,
+                        'duration_mins': duration_mins,
+                    }
+
+        if event_type == 1:  # start
+            active_players[user_id] = user
+        else:               # end
+            active_players.pop(user_id, None)
+
+        prev_time = time
+
+    return best_window
+
+
+def suggestion_sort_key(day: date, window: Dict[str, Any]) -> tuple:
+    """Rank by player count (desc), duration (desc), then date (asc)."""
+    return (-window['count'], -window['duration_mins'], day)
+
+
+def serialize_suggestion(day: date, window: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the API payload for a day's best window."""
+    return {
+        "date": day.isoformat(),
+        "startDateTime": window['start'].isoformat(),
+        "endDateTime": window['end'].isoformat(),
+        "playerCount": window['count'],
+        "duration_hours": window['duration_mins'] / 60,
+        "availablePlayers": [serialize_player(u) for u in window['players'].values()],
+    }
+
+
+def find_daily_overlaps(
+    all_availability: list,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Find the best overlap window for every day using a sweep line.
+
+    Args:
+        all_availability: List of Availability objects ordered by startDateTime
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        List of suggestion dictionaries ranked by player count, duration, then date
+    """
+    if not all_availability:
+        return []
+
+    return rank_daily_windows(
+        bucket_by_day(all_availability), min_players, duration_hours, max_suggestions, offset
+    )
+
+
+def rank_daily_windows(
+    dates_availability: Dict[date, Dict[str, Dict[str, Any]]],
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Sweep every day of already bucketed availability and rank the best windows.
+
+    Args:
+        dates_availability: Output of :func:`bucket_by_day`
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        List of suggestion dictionaries ranked by player count, duration, then date
+    """
+    best_windows = (
+        (day, find_best_window(players_dict, min_players, duration_hours))
+        for day, players_dict in dates_availability.items()
+    )
+
+    # Rank by player count (desc), duration (desc), then date (asc)
+    top = top_k(
+        ((day, window) for day, window in best_windows if window),
+        key=lambda item: suggestion_sort_key(*item),
+        limit=max_suggestions,
+        offset=offset,
+    )
+    return [serialize_suggestion(day, window) for day, window in top]
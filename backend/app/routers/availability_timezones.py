@@ -0,0 +1,72 @@
+"""Local calendar days of a timezone
+
+Stored times are naive UTC, so ``bucket_by_day`` splits days at UTC midnight. For
+requests with a ``tz`` the day clipping uses a table of local-day boundaries instead:
+1. Every local midnight of the horizon is converted to naive UTC once with
+   ``zoneinfo``; DST transitions only move the boundaries (23 and 25 hour days,
+   a midnight skipped by a transition starts the day when the clock resumes)
+2. Tables are cached per timezone and horizon, rounded out to whole calendar years
+3. Clipping an interval is a binary search for its first day plus a walk over the
+   following boundaries, without any timezone arithmetic per entry
+
+Suggestions keep their naive UTC times; only their ``date`` is the local day.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+_ONE_DAY = timedelta(days=1)
+
+
+def is_valid_timezone(name: str) -> bool:
+    """Whether ``name`` is an IANA timezone known to ``zoneinfo``."""
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+class LocalDays:
+    """Naive UTC start of every local day from ``first_year`` through ``last_year``."""
+
+    def __init__(self, name: str, first_year: int, last_year: int) -> None:
+        zone = ZoneInfo(name)
+        first = date(first_year, 1, 1)
+        # One more boundary closes the last day
+        count = (date(last_year + 1, 1, 1) - first).days + 1
+        self.dates = [first + timedelta(days=offset) for offset in range(count)]
+        self.boundaries = [
+            datetime.combine(day, time.min, tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+            for day in self.dates
+        ]
+
+    def clip(self, start: datetime, end: datetime) -> Iterator[Tuple[date, datetime, datetime]]:
+        """
+        Split an interval into (local date, start, end) segments, like
+        ``availability_sweep.clip_to_days``; an end at local midnight does not
+        cover the next day.
+        """
+        i = bisect_right(self.boundaries, start) - 1
+        while end > self.boundaries[i + 1]:
+            yield self.dates[i], start, self.boundaries[i + 1]
+            start = self.boundaries[i + 1]
+            i += 1
+        yield self.dates[i], start, end
+
+
+@lru_cache(maxsize=64)
+def _local_days(name: str, first_year: int, last_year: int) -> LocalDays:
+    return LocalDays(name, first_year, last_year)
+
+
+def local_days(name: str, start: datetime, end: datetime) -> LocalDays:
+    """
+    Cached boundary table of timezone ``name`` covering ``start`` to ``end``.
+
+    Local dates differ from UTC dates by less than a day, so the table reaches a
+    day beyond both ends of the horizon.
+    """
+    return _local_days(name, (start - _ONE_DAY).year, (end + _ONE_DAY).year)
@@ -0,0 +1,289 @@
+"""Vectorized availability overlap algorithm
+
+This module computes the same per-day suggestions as the sweep line in
+``availability_sweep.find_daily_overlaps`` but rasterizes availability into a
+slot matrix (members x time slots) and does the heavy lifting with NumPy:
+1. Each member's availability is clipped to calendar days and reduced to one interval
+   per day (earliest start, latest end)
+2. Each day is cut into slots at every distinct start/end, so a slot has a constant player set
+3. Per-slot player counts and per-day best windows are computed with array operations
+   instead of a Python sweep
+
+The array work is cheap next to turning every row's datetimes into integer offsets
+in Python, which for in-memory rows costs about as much as the sweep itself: on
+those the engine only pays off for groups with long entries.
+``find_availability_overlaps_vectorized_db`` instead reads the offsets straight
+into arrays (PostgreSQL and SQLite, see ``load_epochs``), without a datetime object
+per row; the ``vectorized`` strategy reads that way whenever it reads rows itself.
+"""
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import BigInteger, String, cast, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_ranking import serialize_player
+from app.routers import availability_rows
+from app.routers.availability_sweep import find_daily_overlaps
+
+_MICROSECOND = timedelta(microseconds=1)
+_DAY = 86_400_000_000
+EPOCH = datetime(1970, 1, 1)
+
+
+def supports_epochs(db: Session) -> bool:
+    """Whether :func:`load_epochs` can read the session's database."""
+    return db.get_bind().dialect.name in ("postgresql", "sqlite")
+
+
+def load_epochs(
+    db: Session,
+    group_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    A group's rows overlapping the date filters, ordered by startDateTime, as the
+    user id of every row and its start and end in microseconds since the Unix epoch.
+
+    PostgreSQL computes the offsets; SQLite stores datetimes as ISO text, which is
+    read as is and parsed by NumPy. Either way no datetime object is created.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        columns = [
+            cast(func.extract("epoch", column) * 1_000_000, BigInteger)
+            for column in (models.Availability.startDateTime, models.Availability.endDateTime)
+        ]
+        dtype = np.int64
+    else:
+        columns = [type_coerce(models.Availability.startDateTime, String), type_coerce(models.Availability.endDateTime, String)]
+        dtype = "datetime64[us]"
+    statement = availability_rows.entry_users(db, group_id, start_date, end_date).add_columns(*columns)
+    # Through the connection: the rows are plain tuples without ORM loading
+    rows = db.connection().execute(statement.order_by(models.Availability.startDateTime)).all()
+    if not rows:
+        return [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    user_ids, starts, ends = zip(*rows)
+    return (
+        list(user_ids),
+        np.array(starts, dtype=dtype).astype(np.int64),
+        np.array(ends, dtype=dtype).astype(np.int64),
+    )
+
+
+def find_availability_overlaps_vectorized(
+    all_availability: list,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Find suggested dates based on player availability overlaps.
+
+    This algorithm returns exactly what the sweep line returns:
+    - Groups availability by DATE, keeping each player's earliest start and latest end
+      within the day
+    - Builds a boolean matrix of members x slots for all days side by side
+    - Counts available players per slot with a column sum
+    - Picks the best slot per day (player count, then duration, then earliest start)
+
+    Args:
+        all_availability: List of Availability objects ordered by startDateTime
+        min_players: Minimum number of players required
+        duration_hours: Minimum duration in hours
+        max_suggestions: Maximum number of suggestions to return
+        offset: Number of best suggestions to skip
+
+    Returns:
+        List of suggestion dictionaries with date, startDateTime, endDateTime, playerCount,
+        duration_hours and availablePlayers
+    """
+    if not all_availability:
+        return []
+
+    # NumPy works on naive offsets; timezone-aware input keeps using the sweep line
+    if all_availability[0].startDateTime.tzinfo is not None:
+        return find_daily_overlaps(all_availability, min_players, duration_hours, max_suggestions, offset)
+
+    # Index users in order of first appearance
+    user_index: dict[str, int] = {}
+    users = []
+    entry_users = []
+    for avail in all_availability:
+        idx = user_index.get(avail.userId)
+        if idx is None:
+            idx = user_index[avail.userId] = len(users)
+            users.append(avail.user)
+        entry_users.append(idx)
+
+    # Microsecond offsets from midnight of the earliest day
+    origin = datetime.combine(all_availability[0].startDateTime.date(), datetime.min.time())
+    starts = np.array([(a.startDateTime - origin) // _MICROSECOND for a in all_availability], dtype=np.int64)
+    ends = np.array([(a.endDateTime - origin) // _MICROSECOND for a in all_availability], dtype=np.int64)
+    return _rank_days(
+        users, np.array(entry_users, dtype=np.int64), starts, ends, origin,
+        min_players, duration_hours, max_suggestions, offset,
+    )
+
+
+def find_availability_overlaps_vectorized_db(
+    db: Session,
+    group_id: str,
+    min_players: int,
+    duration_hours: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    max_suggestions: int = 10,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    :func:`find_availability_overlaps_vectorized` of a group's rows overlapping the
+    date filters, read with :func:`load_epochs`.
+
+    The caller checks ``supports_epochs``; recurring rules are not expanded.
+    """
+    user_ids, starts, ends = load_epochs(db, group_id, start_date, end_date)
+    if not user_ids:
+        return []
+
+    # Users in order of first appearance
+    index: Dict[str, int] = {}
+    entry_users = [index.setdefault(user_id, len(index)) for user_id in user_ids]
+    by_id = {
+        row.id: availability_rows.UserRow(*row)
+        for row in db.execute(
+            select(models.User.id, models.User.email, models.User.name, models.User.image, models.User.isGM)
+            .where(models.User.id.in_(list(index)))
+        )
+    }
+    return _rank_days(
+        [by_id[user_id] for user_id in index],
+        np.array(entry_users, dtype=np.int64),
+        starts,
+        ends,
+        EPOCH,
+        min_players, duration_hours, max_suggestions, offset,
+    )
+
+
+def _rank_days(
+    users: Sequence[Any],
+    entry_users: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    origin: datetime,
+    min_players: int,
+    duration_hours: int,
+    max_suggestions: int,
+    offset: int,
+) -> List[Dict[str, Any]]:
+    """
+    The ranked suggestions of entries given as arrays in startDateTime order.
+
+    ``entry_users`` indexes ``users``; ``starts`` and ``ends`` are microseconds
+    since ``origin``, a midnight.
+    """
+    first_day = int(starts.min() // _DAY)
+    if first_day:
+        origin += timedelta(days=first_day)
+        starts -= first_day * _DAY
+        ends -= first_day * _DAY
+    origin_date = origin.date()
+    start_days = starts // _DAY
+    # An entry ending at midnight does not cover the next day
+    end_days = np.maximum((ends - 1) // _DAY, start_days)
+
+    # Expand every entry onto each calendar day it covers, clipped to that day
+    span = end_days - start_days + 1
+    entry_idx = np.repeat(np.arange(len(starts)), span)
+    first_pos = np.repeat(np.cumsum(span) - span, span)
+    days = start_days[entry_idx] + (np.arange(len(entry_idx)) - first_pos)
+    clipped_starts = np.maximum(starts[entry_idx], days * _DAY)
+    clipped_ends = np.minimum(ends[entry_idx], (days + 1) * _DAY)
+
+    # Reduce to one (day, user) interval: earliest start, latest end, first entry seen
+    user_count = len(users)
+    keys = days * user_count + entry_users[entry_idx]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    entry_idx = entry_idx[order]
+    group_starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    pair_day = keys[group_starts] // user_count
+    pair_user = keys[group_starts] % user_count
+    pair_start = np.minimum.reduceat(clipped_starts[order], group_starts)
+    pair_end = np.maximum.reduceat(clipped_ends[order], group_starts)
+    pair_first = np.minimum.reduceat(entry_idx, group_starts)
+
+    # Days with fewer players than required can never produce a suggestion
+    players_per_day = np.bincount(pair_day)
+    keep = players_per_day[pair_day] >= min_players
+    if not keep.any():
+        return []
+    pair_day, pair_user = pair_day[keep], pair_user[keep]
+    pair_start, pair_end, pair_first = pair_start[keep], pair_end[keep], pair_first[keep]
+
+    # Slot grid: every distinct boundary of a day splits it, so each slot has a constant player set
+    pair_day_pos = np.cumsum(np.r_[False, pair_day[1:] != pair_day[:-1]])
+    point_day = np.concatenate((pair_day_pos, pair_day_pos))
+    point_value = np.concatenate((pair_start, pair_end))
+    order = np.lexsort((point_value, point_day))
+    point_day, point_value = point_day[order], point_value[order]
+    is_new = np.r_[True, (point_day[1:] != point_day[:-1]) | (point_value[1:] != point_value[:-1])]
+    boundary_ids = np.empty(len(order), dtype=np.int64)
+    boundary_ids[order] = np.cumsum(is_new) - 1
+    boundary_day = point_day[is_new]
+    boundary_value = point_value[is_new]
+
+    # A slot runs from a boundary to the next boundary of the same day
+    slot_count = len(boundary_value) - int(boundary_day[-1]) - 1
+    col_start = boundary_ids[:len(pair_day)] - pair_day_pos
+    col_end = boundary_ids[len(pair_day):] - pair_day_pos
+    has_slot = np.r_[boundary_day[1:] == boundary_day[:-1], False]
+    slot_day_pos = boundary_day[has_slot]
+    slot_start = boundary_value[has_slot]
+    slot_length = boundary_value[1:][has_slot[:-1]] - slot_start
+    day_ids = pair_day[np.r_[True, pair_day[1:] != pair_day[:-1]]]
+
+    # Rasterize: members x slots matrix through a per-row difference array
+    delta = np.zeros((user_count, slot_count + 1), dtype=np.int8)
+    np.add.at(delta, (pair_user, col_start), 1)
+    np.add.at(delta, (pair_user, col_end), -1)
+    matrix = np.cumsum(delta, axis=1, dtype=np.int8)[:, :slot_count].astype(bool)
+    counts = matrix.sum(axis=0)
+
+    qualifies = (counts >= min_players) & (slot_length >= duration_hours * 3_600_000_000)
+    if not qualifies.any():
+        return []
+    slots = np.flatnonzero(qualifies)
+
+    # Best slot per day: most players, then longest, then earliest
+    best = slots[np.lexsort((slot_start[slots], -slot_length[slots], -counts[slots], slot_day_pos[slots]))]
+    _, first_in_day = np.unique(slot_day_pos[best], return_index=True)
+    best = best[first_in_day]
+
+    # Rank days: most players, then longest, then earliest date
+    ranked = best[np.lexsort((slot_day_pos[best], -slot_length[best], -counts[best]))]
+
+    suggestions = []
+    for slot in ranked[offset:offset + max_suggestions]:
+        window_start = origin + timedelta(microseconds=int(slot_start[slot]))
+        window_end = window_start + timedelta(microseconds=int(slot_length[slot]))
+        duration_mins = (window_end - window_start).total_seconds() / 60
+
+        # Players in the order the sweep line activates them
+        present = np.flatnonzero((pair_day_pos == slot_day_pos[slot]) & matrix[pair_user, slot])
+        present = present[np.lexsort((pair_first[present], pair_start[present]))]
+
+        suggestions.append({
+            'date': (origin_date + timedelta(days=int(day_ids[slot_day_pos[slot]]))).isoformat(),
+            'startDateTime': window_start.isoformat(),
+            'endDateTime': window_end.isoformat(),
+            'playerCount': int(counts[slot]),
+            'duration_hours': duration_mins / 60,
+            'availablePlayers': [serialize_player(users[pair_user[p]]) for p in present],
+        })
+
+    return suggestions
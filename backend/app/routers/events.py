@@ -2,30 +2,70 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.auth import get_current_user
+from app.busy_index import get_busy_indexes, group_member_ids, invalidate_users
 from app.database import get_db
+from app.etags import group_etag, not_modified
+from app.overlap_state import drop_state
 from app.permissions import verify_group_membership, verify_group_owner
+from app.routers.availability_events import groups_sharing_members
 
 router = APIRouter(prefix="/groups", tags=["events"])
 
 
-@router.post("/{group_id}/events", response_model=schemas.EventSchema, status_code=status.HTTP_201_CREATED)
+def _member_conflicts(
+    db: Session,
+    group_id: str,
+    scheduled_at: datetime,
+    duration_minutes: int,
+) -> list[dict[str, Any]]:
+    """Other groups' events the group's members are booked in during the given time."""
+    end = scheduled_at + timedelta(minutes=duration_minutes)
+    conflicts = []
+    for user_id, index in get_busy_indexes(db, group_member_ids(db, group_id)).items():
+        for busy in index.overlapping(scheduled_at, end):
+            # The group's own events, the one being moved included, are not another booking
+            if busy.groupId == group_id:
+                continue
+            conflicts.append({
+                "userId": user_id,
+                "eventId": busy.eventId,
+                "groupId": busy.groupId,
+                "groupName": busy.groupName,
+                "title": busy.title,
+                "startDateTime": busy.start,
+                "endDateTime": busy.end,
+            })
+    return conflicts
+
+
+def _event_changed(db: Session, group_id: str) -> None:
+    """Events are busy time of the members in all their groups; forget what depends on it."""
+    invalidate_users(group_member_ids(db, group_id))
+    for affected_group_id in groups_sharing_members(db, group_id):
+        drop_state(affected_group_id)
+
+
+@router.post(
+    "/{group_id}/events", response_model=schemas.EventWithConflictsSchema, status_code=status.HTTP_201_CREATED
+)
 def create_event(
     group_id: str,
     payload: schemas.EventCreateSchema,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> models.Event:
+) -> dict[str, Any]:
     """Create a new event (scheduled game session).
 
-    Only the group owner can schedule events.
+    Only the group owner can schedule events. ``conflicts`` warns about members
+    already booked in another group's event at that time.
     """
     # Verify user is the group owner
     verify_group_owner(db, current_user, group_id)
@@ -39,29 +79,40 @@ def create_event(
         notes=payload.notes,
         createdBy=current_user.id,
     )
+    conflicts = _member_conflicts(db, group_id, payload.scheduledAt, payload.durationMinutes)
     db.add(event)
     db.commit()
     db.refresh(event)
+    _event_changed(db, group_id)
 
-    return event
+    return {**schemas.EventSchema.model_validate(event).model_dump(), "conflicts": conflicts}
 
 
 @router.get("/{group_id}/events", response_model=list[schemas.EventSchema])
 def list_events(
     group_id: str,
+    request: Request,
+    response: Response,
     upcoming_only: bool = Query(default=False, description="Show only upcoming events"),
-    start_date: Optional[datetime] = Query(default=None, description="Filter by start date (inclusive)"),
-    end_date: Optional[datetime] = Query(default=None, description="Filter by end date (inclusive)"),
+    start_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by start date (inclusive)"),
+    end_date: Optional[schemas.UtcDateTime] = Query(default=None, description="Filter by end date (inclusive)"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[models.Event]:
+) -> Any:
     """List events for a group, optionally filtered.
 
-    Any member of the group can view events.
+    Any member of the group can view events. Answers ``If-None-Match`` with 304
+    while the group's events are unchanged; ``upcoming_only`` changes with the
+    clock and is never answered with 304.
     """
     # Verify user is a member of the group
     verify_group_membership(db, current_user, group_id)
 
+    if not upcoming_only:
+        unchanged = not_modified(request, response, group_etag(request, group_id))
+        if unchanged is not None:
+            return unchanged
+
     # Build query
     query = db.query(models.Event).filter(models.Event.groupId == group_id)
 
@@ -106,17 +157,18 @@ def get_event(
     return event
 
 
-@router.put("/{group_id}/events/{event_id}", response_model=schemas.EventSchema)
+@router.put("/{group_id}/events/{event_id}", response_model=schemas.EventWithConflictsSchema)
 def update_event(
     group_id: str,
     event_id: str,
     payload: schemas.EventUpdateSchema,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> models.Event:
+) -> dict[str, Any]:
     """Update an event.
 
-    Only the group owner can update events.
+    Only the group owner can update events. ``conflicts`` warns about members
+    already booked in another group's event at the new time.
     """
     # Verify user is the group owner
     verify_group_owner(db, current_user, group_id)
@@ -141,10 +193,12 @@ def update_event(
     if payload.notes is not None:
         event.notes = payload.notes
 
+    conflicts = _member_conflicts(db, group_id, event.scheduledAt, event.durationMinutes)
     db.commit()
     db.refresh(event)
+    _event_changed(db, group_id)
 
-    return event
+    return {**schemas.EventSchema.model_validate(event).model_dump(), "conflicts": conflicts}
 
 
 @router.delete("/{group_id}/events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -173,3 +227,4 @@ def delete_event(
 
     db.delete(event)
     db.commit()
+    _event_changed(db, group_id)
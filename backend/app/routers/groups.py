@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import secrets
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 
 from app import models, schemas
 from app.auth import get_current_user
 from app.database import get_db
+from app.busy_index import group_member_ids, invalidate_users
+from app.etags import group_etag, not_modified, touch_group
+from app.overlap_state import drop_state
+from app.permissions import verify_group_membership
+from app.routers.availability_events import groups_sharing_members
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
@@ -49,9 +55,20 @@ def create_group(
 @router.get("/{group_id}", response_model=schemas.GroupDetailSchema)
 def get_group(
     group_id: str,
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> models.Group:
+) -> Any:
+    """Group with its members, invites and events.
+
+    Answers ``If-None-Match`` with 304 before loading them while the group is unchanged.
+    """
+    verify_group_membership(db, current_user, group_id)
+    unchanged = not_modified(request, response, group_etag(request, group_id))
+    if unchanged is not None:
+        return unchanged
+
     group = (
         db.query(models.Group)
         .options(
@@ -64,9 +81,6 @@ def get_group(
     )
     if group is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
-    is_member = any(m.userId == current_user.id for m in group.memberships)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
     return group
 
 
@@ -81,8 +95,14 @@ def delete_group(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
     if group.ownerId != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+    # The group's events no longer keep its members busy in their other groups
+    affected = groups_sharing_members(db, group_id)
+    members = group_member_ids(db, group_id)
     db.delete(group)
     db.commit()
+    invalidate_users(members)
+    for affected_group_id in affected:
+        drop_state(affected_group_id)
 
 
 @router.get("/{group_id}/invites", response_model=list[schemas.InviteSchema])
@@ -130,6 +150,7 @@ def create_invite(
     )
     db.add(invite)
     db.commit()
+    touch_group(group_id)
     db.refresh(invite)
     return invite
 
@@ -158,6 +179,7 @@ def cancel_invite(
 
     db.delete(invite)
     db.commit()
+    touch_group(group_id)
 
 
 @router.delete("/{group_id}/members/me", status_code=status.HTTP_204_NO_CONTENT)
@@ -184,8 +206,12 @@ def leave_group(
     if membership is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_a_member")
 
+    affected = groups_sharing_members(db, group_id, [current_user.id])
     db.delete(membership)
     db.commit()
+    invalidate_users([current_user.id])
+    for affected_group_id in affected:
+        drop_state(affected_group_id)
 
 
 @router.delete("/{group_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -224,5 +250,9 @@ def remove_member(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="member_not_found")
 
     # Delete membership (cascades will clean up availability)
+    affected = groups_sharing_members(db, group_id, [user_id])
     db.delete(membership)
     db.commit()
+    invalidate_users([user_id])
+    for affected_group_id in affected:
+        drop_state(affected_group_id)
@@ -8,6 +8,9 @@ from sqlalchemy.orm import Session
 from app import models, schemas
 from app.auth import get_current_user
 from app.database import get_db
+from app.busy_index import invalidate_users
+from app.overlap_state import drop_state
+from app.routers.availability_events import groups_sharing_members
 
 router = APIRouter(prefix="/join", tags=["invites"])
 
@@ -67,5 +70,10 @@ def accept_invite(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="no_uses")
         invite.usesLeft -= 1
 
+    # The group's events now keep the new member busy in their other groups
+    affected = groups_sharing_members(db, group_id, [current_user.id])
     db.commit()
+    invalidate_users([current_user.id])
+    for affected_group_id in affected:
+        drop_state(affected_group_id)
     return schemas.JoinResponseSchema(ok=True, groupId=group_id)
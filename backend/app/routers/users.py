@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
@@ -8,7 +9,14 @@ from sqlalchemy.orm import Session, selectinload
 
 from app import models, schemas
 from app.auth import get_current_user, get_password_hash, verify_password
+from app.busy_index import get_busy_index
 from app.database import get_db
+from app.overlap_pool import OverlapPoolBusy, OverlapPoolTimeout
+from app.overlap_state import drop_state
+from app.routers.availability_events import load_busy
+from app.routers.availability_recurring import expand_rules, rule_window, with_occurrences
+from app.routers.availability_suggestions import find_cross_group_suggestions
+from app.routers.availability_timezones import is_valid_timezone
 
 UPLOAD_DIR = Path(__file__).resolve().parents[2] / "uploads" / "avatars"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -49,6 +57,12 @@ def get_user(
     return user
 
 
+def _drop_member_groups(db: Session, user_id: str) -> None:
+    """Names and avatars are part of group payloads; refresh every group of the user."""
+    for (group_id,) in db.query(models.Membership.groupId).filter(models.Membership.userId == user_id):
+        drop_state(group_id)
+
+
 @router.put("/me", response_model=schemas.UserSchema)
 def update_profile(
     payload: schemas.ProfileUpdateSchema,
@@ -62,6 +76,7 @@ def update_profile(
         current_user.image = payload.image
 
     db.commit()
+    _drop_member_groups(db, current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -116,5 +131,105 @@ def upload_avatar(
 
     current_user.image = f"/uploads/avatars/{filename}"
     db.commit()
+    _drop_member_groups(db, current_user.id)
     db.refresh(current_user)
     return current_user
+
+
+@router.get("/me/busy", response_model=list[schemas.BusyIntervalSchema])
+def get_my_busy(
+    start_date: schemas.UtcDateTime | None = Query(default=None, description="Only events ending after this time"),
+    end_date: schemas.UtcDateTime | None = Query(default=None, description="Only events starting before this time"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Scheduled events of all the current user's groups, ordered by start."""
+    intervals = get_busy_index(db, current_user.id).overlapping(start_date, end_date)
+    return [
+        {
+            "eventId": interval.eventId,
+            "groupId": interval.groupId,
+            "groupName": interval.groupName,
+            "title": interval.title,
+            "startDateTime": interval.start,
+            "endDateTime": interval.end,
+        }
+        for interval in intervals
+    ]
+
+
+@router.get("/me/suggestions")
+def get_my_suggestions(
+    min_players: int = Query(default=2, ge=1, description="Minimum number of players required"),
+    duration_hours: int = Query(default=3, ge=1, le=12, description="Minimum duration in hours"),
+    start_date: schemas.UtcDateTime | None = Query(default=None, description="Filter by start date (inclusive)"),
+    end_date: schemas.UtcDateTime | None = Query(default=None, description="Filter by end date (inclusive)"),
+    limit: int = Query(default=10, ge=1, le=100, description="Maximum number of suggestions to return"),
+    offset: int = Query(default=0, ge=0, description="Number of best suggestions to skip"),
+    tz: str | None = Query(default=None, description="IANA timezone whose local days group the suggestions"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Best session slots across all of the current user's groups.
+
+    Availability of every group the user belongs to is loaded in one query, with
+    the occurrences of their recurring rules, and ranked together; the players'
+    scheduled events are left out as in ``/overlaps``. ``conflicts`` lists other groups' candidate slots the user
+    would also play in at an overlapping time.
+    """
+    if tz is not None and not is_valid_timezone(tz):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unknown_timezone")
+
+    groups = (
+        db.query(models.Group.id, models.Group.name)
+        .join(models.Membership, models.Membership.groupId == models.Group.id)
+        .filter(models.Membership.userId == current_user.id)
+        .order_by(models.Group.name, models.Group.id)
+        .all()
+    )
+
+    query = (
+        db.query(models.Availability)
+        .options(selectinload(models.Availability.user))
+        .join(models.Membership, models.Membership.groupId == models.Availability.groupId)
+        .filter(models.Membership.userId == current_user.id)
+    )
+    if start_date:
+        query = query.filter(models.Availability.endDateTime >= start_date)
+    if end_date:
+        query = query.filter(models.Availability.startDateTime <= end_date)
+
+    rules = (
+        db.query(models.AvailabilityRule)
+        .options(selectinload(models.AvailabilityRule.user))
+        .join(models.Membership, models.Membership.groupId == models.AvailabilityRule.groupId)
+        .filter(models.Membership.userId == current_user.id)
+        .all()
+    )
+    occurrences = expand_rules(rules, *rule_window(start_date, end_date))
+    entries = with_occurrences(query.order_by(models.Availability.startDateTime).all(), occurrences)
+    busy = {}
+    if entries:
+        busy = load_busy(
+            db,
+            {avail.userId for avail in entries},
+            entries[0].startDateTime,
+            max(avail.endDateTime for avail in entries),
+        )
+
+    try:
+        return find_cross_group_suggestions(
+            entries,
+            {group_id: name for group_id, name in groups},
+            current_user.id,
+            min_players,
+            duration_hours,
+            limit,
+            offset,
+            tz,
+            busy,
+        )
+    except OverlapPoolBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="overlaps_busy")
+    except OverlapPoolTimeout:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="overlaps_timeout")
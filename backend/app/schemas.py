@@ -1,9 +1,20 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time, timezone
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import AfterValidator, BaseModel, Field, EmailStr
+
+
+def naive_utc(value: datetime) -> datetime:
+    """``value`` as the naive UTC time stored in the database; naive input is UTC already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# Clients send "...Z" or offset times (``toISOString()``); rows hold naive UTC
+UtcDateTime = Annotated[datetime, AfterValidator(naive_utc)]
 
 
 class InviteSchema(BaseModel):
@@ -35,6 +46,24 @@ class EventSchema(BaseModel):
     }
 
 
+class BusyIntervalSchema(BaseModel):
+    eventId: str
+    groupId: str
+    groupName: str
+    title: str
+    startDateTime: datetime
+    endDateTime: datetime
+
+
+class EventConflictSchema(BusyIntervalSchema):
+    userId: str
+
+
+class EventWithConflictsSchema(EventSchema):
+    # Other events the group's members are already booked in at the same time
+    conflicts: list[EventConflictSchema] = []
+
+
 class MembershipUserSchema(BaseModel):
     id: str
     email: str
@@ -153,14 +182,33 @@ class AuthResponseSchema(TokenSchema):
 
 # Availability schemas
 class AvailabilityCreateSchema(BaseModel):
-    startDateTime: datetime
-    endDateTime: datetime
+    startDateTime: UtcDateTime
+    endDateTime: UtcDateTime
     notes: Optional[str] = None
 
 
+class AvailabilityBulkSchema(BaseModel):
+    items: list[AvailabilityCreateSchema] = Field(max_length=500)
+    # Replace the caller's entries starting in [replaceStart, replaceEnd)
+    replaceStart: Optional[UtcDateTime] = None
+    replaceEnd: Optional[UtcDateTime] = None
+
+
+class AvailabilityBulkItemSchema(BaseModel):
+    index: int
+    # created, updated, invalid, overlap or out_of_range
+    status: str
+    id: Optional[str] = None
+
+
+class AvailabilityBulkResultSchema(BaseModel):
+    items: list[AvailabilityBulkItemSchema]
+    deleted: int
+
+
 class AvailabilityUpdateSchema(BaseModel):
-    startDateTime: Optional[datetime] = None
-    endDateTime: Optional[datetime] = None
+    startDateTime: Optional[UtcDateTime] = None
+    endDateTime: Optional[UtcDateTime] = None
     notes: Optional[str] = None
 
 
@@ -173,6 +221,8 @@ class AvailabilitySchema(BaseModel):
     notes: Optional[str]
     createdAt: datetime
     updatedAt: datetime
+    # Set on occurrences expanded from a recurring rule
+    ruleId: Optional[str] = None
 
     model_config = {
         "from_attributes": True,
@@ -183,6 +233,56 @@ class AvailabilityWithUserSchema(AvailabilitySchema):
     user: MembershipUserSchema
 
 
+# Recurring availability rule schemas
+class AvailabilityRuleCreateSchema(BaseModel):
+    # Bit 0 is Monday, bit 6 is Sunday
+    weekdays: int = Field(ge=1, le=127)
+    startTime: time
+    # At or before startTime: occurrences end the next day
+    endTime: time
+    # IANA timezone of the times and dates, e.g. "Europe/Berlin"
+    timezone: str = "UTC"
+    validFrom: date
+    validUntil: Optional[date] = None
+    exceptions: list[date] = Field(default_factory=list)
+    notes: Optional[str] = None
+
+
+class AvailabilityRuleUpdateSchema(BaseModel):
+    weekdays: Optional[int] = Field(default=None, ge=1, le=127)
+    startTime: Optional[time] = None
+    endTime: Optional[time] = None
+    timezone: Optional[str] = None
+    validFrom: Optional[date] = None
+    validUntil: Optional[date] = None
+    exceptions: Optional[list[date]] = None
+    notes: Optional[str] = None
+
+
+class AvailabilityRuleSchema(BaseModel):
+    id: str
+    userId: str
+    groupId: str
+    weekdays: int
+    startTime: time
+    endTime: time
+    timezone: str
+    validFrom: date
+    validUntil: Optional[date]
+    exceptions: list[date]
+    notes: Optional[str]
+    createdAt: datetime
+    updatedAt: datetime
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+
+class AvailabilityRuleWithUserSchema(AvailabilityRuleSchema):
+    user: MembershipUserSchema
+
+
 # Event CRUD schemas
 class EventCreateSchema(BaseModel):
     scheduledAt: datetime
@@ -0,0 +1,73 @@
+"""Seeded synthetic availability for overlap benchmarks.
+
+The generated entries are lightweight stand-ins for ``Availability`` rows (with a
+``user`` stand-in for ``User``) exposing only the attributes the overlap
+algorithms read, so engines can be timed in-process without a database.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+BASE = datetime(2025, 1, 1)
+SLOT = timedelta(minutes=15)
+
+
+@dataclass(frozen=True)
+class GroupShape:
+    """Size and texture of a synthetic group.
+
+    ``per_day`` blocks are generated per member and day; each block is split into
+    ``fragments`` pieces separated by short gaps, the way players paint a calendar
+    one cell at a time. ``long_entries`` adds multi-week entries per member.
+    """
+
+    members: int
+    days: int
+    per_day: int
+    long_entries: int = 0
+    fragments: int = 1
+
+    @property
+    def label(self) -> str:
+        return f"m{self.members}-d{self.days}-p{self.per_day}-l{self.long_entries}-f{self.fragments}"
+
+
+def make_users(members: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(id=f"user-{i}", name=f"Player {i}", email=f"player{i}@example.com", image=None)
+        for i in range(members)
+    ]
+
+
+def make_group(shape: GroupShape, seed: int = 0) -> list[SimpleNamespace]:
+    """Generate 15-minute aligned availability ordered by startDateTime."""
+    rng = random.Random(seed)
+    entries = []
+
+    def add(user: SimpleNamespace, start: datetime, end: datetime) -> None:
+        entries.append(SimpleNamespace(
+            id=f"avail-{len(entries)}",
+            userId=user.id,
+            user=user,
+            startDateTime=start,
+            endDateTime=end,
+        ))
+
+    for user in make_users(shape.members):
+        for day in range(shape.days):
+            for _ in range(shape.per_day):
+                start = BASE + timedelta(days=day) + SLOT * rng.randrange(0, 88)
+                for _ in range(shape.fragments):
+                    end = start + SLOT * rng.randrange(1, max(2, 24 // shape.fragments))
+                    add(user, start, end)
+                    start = end + SLOT * rng.randrange(0, 3)
+        for _ in range(shape.long_entries):
+            start = BASE + timedelta(days=rng.randrange(0, shape.days), hours=rng.randrange(0, 24))
+            add(user, start, start + timedelta(days=rng.randrange(7, 31)))
+
+    entries.sort(key=lambda a: a.startDateTime)
+    return entries
@@ -0,0 +1,207 @@
+"""Benchmark the availability read paths per row: ORM and pydantic versus Core.
+
+Run from the backend directory:
+
+    python -m benchmarks.listing                       # SQLite in memory
+    python -m benchmarks.listing --database-url postgresql+psycopg://...
+    python -m benchmarks.listing --output benchmarks/results/listing.json
+
+Synthetic groups from ``generators`` are written to a fresh database; the tables
+are created and dropped by the benchmark, so point ``--database-url`` at a scratch
+database. For every shape it reports the best per-row time of ``--repeat`` runs of:
+- ``list``: the body of ``GET /groups/{id}/availability``, from querying to JSON bytes
+- ``load``: the entries the overlap strategies read
+
+Each path is timed as it was before the Core reads (``orm``: ``Availability``
+instances with ``selectinload``ed users, validated and dumped through pydantic)
+and as it is now (``core``: ``availability_rows``); ``list`` also as
+``format=columnar`` (``columnar``), whose body size is reported next to the row
+format's. Every run uses a new session, so the ORM runs start with an empty
+identity map.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models, schemas
+from app.database import Base
+from app.routers.availability_columnar import columnar_entries, columnar_response
+from app.routers.availability_rows import encode_listing, json_array, listing_select, load_entries
+from benchmarks.generators import GroupShape, make_group
+
+SHAPES = [
+    GroupShape(members=6, days=90, per_day=2),
+    GroupShape(members=12, days=365, per_day=3),
+    GroupShape(members=20, days=730, per_day=4),
+]
+
+GROUP_ID = "benchmark"
+
+_listing = TypeAdapter(list[schemas.AvailabilityWithUserSchema])
+
+
+def seed(db: Session, shape: GroupShape, seed: int) -> int:
+    """Write a synthetic group; returns the number of rows."""
+    entries = make_group(shape, seed)
+    users = {avail.user.id: avail.user for avail in entries}
+    db.add_all(
+        models.User(id=user.id, email=user.email, name=user.name, image=user.image) for user in users.values()
+    )
+    db.flush()
+    db.add(models.Group(id=GROUP_ID, ownerId=next(iter(users)), name="Benchmark"))
+    db.flush()
+
+    now = datetime.utcnow()
+    seen = set()
+    rows = []
+    for avail in entries:
+        # Keep the unique (userId, groupId, startDateTime) index happy
+        if (avail.userId, avail.startDateTime) in seen:
+            continue
+        seen.add((avail.userId, avail.startDateTime))
+        rows.append({
+            "id": avail.id, "userId": avail.userId, "groupId": GROUP_ID,
+            "startDateTime": avail.startDateTime, "endDateTime": avail.endDateTime,
+            "notes": None, "createdAt": now, "updatedAt": now,
+        })
+    db.execute(models.Availability.__table__.insert(), rows)
+    db.commit()
+    return len(rows)
+
+
+def list_orm(db: Session) -> Any:
+    rows = (
+        db.query(models.Availability)
+        .options(selectinload(models.Availability.user))
+        .filter(models.Availability.groupId == GROUP_ID)
+        .order_by(models.Availability.startDateTime)
+        .all()
+    )
+    return _listing.dump_json([schemas.AvailabilityWithUserSchema.model_validate(avail) for avail in rows])
+
+
+def _listing_rows(db: Session) -> Any:
+    statement = listing_select(db, GROUP_ID).order_by(models.Availability.startDateTime, models.Availability.id)
+    return db.execute(statement)
+
+
+def list_core(db: Session) -> Any:
+    return json_array(encode_listing(row) for row in _listing_rows(db))
+
+
+def list_columnar(db: Session) -> Any:
+    return columnar_response(columnar_entries(_listing_rows(db)), {}).body
+
+
+def load_orm(db: Session) -> Any:
+    return (
+        db.query(models.Availability)
+        .options(selectinload(models.Availability.user))
+        .filter(models.Availability.groupId == GROUP_ID)
+        .order_by(models.Availability.startDateTime)
+        .all()
+    )
+
+
+def load_core(db: Session) -> Any:
+    return load_entries(db, GROUP_ID)
+
+
+PATHS: dict[str, dict[str, Callable[[Session], Any]]] = {
+    "list": {"orm": list_orm, "core": list_core, "columnar": list_columnar},
+    "load": {"orm": load_orm, "core": load_core},
+}
+
+
+def measure(sessions: sessionmaker, path: Callable[[Session], Any], rows: int, repeat: int) -> float:
+    """Best microseconds per row of ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        with sessions() as db:
+            started = time.perf_counter()
+            path(db)
+            timings.append(time.perf_counter() - started)
+    return round(min(timings) / rows * 1e6, 2)
+
+
+def run(database_url: str, shapes: list[GroupShape], repeat: int, seed_value: int) -> dict[str, Any]:
+    options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, **options)
+    sessions = sessionmaker(bind=engine, expire_on_commit=False)
+    results: dict[str, Any] = {}
+    try:
+        for shape in shapes:
+            Base.metadata.create_all(engine)
+            try:
+                with sessions() as db:
+                    rows = seed(db, shape, seed_value)
+                    sizes = {"rows": len(list_core(db)), "columnar": len(list_columnar(db))}
+                results[shape.label] = {
+                    "rows": rows,
+                    "kib": {name: round(size / 1024, 1) for name, size in sizes.items()},
+                    **{
+                        name: {variant: measure(sessions, path, rows, repeat) for variant, path in variants.items()}
+                        for name, variants in PATHS.items()
+                    },
+                }
+            finally:
+                Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+    return results
+
+
+def report(results: dict[str, Any]) -> None:
+    print(f"{'shape':<22} {'rows':>7} {'path':<5} {'variant':<9} {'us/row':>8} {'speedup':>8}")
+    for label, row in results.items():
+        for name, variants in PATHS.items():
+            numbers = row[name]
+            for variant in variants:
+                print(f"{label:<22} {row['rows']:>7} {name:<5} {variant:<9} {numbers[variant]:>8.2f} "
+                      f"{numbers['orm'] / numbers[variant]:>7.1f}x")
+        print(f"{label:<22} {row['rows']:>7} body  rows {row['kib']['rows']:>9.1f} KiB, "
+              f"columnar {row['kib']['columnar']:.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://", help="Scratch database to seed")
+    parser.add_argument("--shape", action="append", help="Shape label to run (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    shapes = [shape for shape in SHAPES if not args.shape or shape.label in args.shape]
+    results = run(args.database_url, shapes, args.repeat, args.seed)
+    report(results)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "database": args.database_url.split(":", 1)[0],
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "results": results,
+        }, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
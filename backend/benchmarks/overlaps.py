@@ -0,0 +1,138 @@
+"""Benchmark every in-process overlap strategy on synthetic groups.
+
+Run from the backend directory:
+
+    python -m benchmarks.overlaps                       # compare with the committed baseline
+    python -m benchmarks.overlaps --output results.json # also save the numbers
+    python -m benchmarks.overlaps --strategy vectorized --shape m6-d90-p2-l0-f1
+
+For every strategy and shape it reports the best wall time of ``--repeat`` runs,
+the peak traced memory of one run and the memory blocks still allocated after it
+(the result and anything the strategy leaks), both measured with ``tracemalloc``.
+Every run starts from a fresh :class:`PreparedAvailability`, so the shared
+day bucketing is included in the time of the strategies that use it.
+
+``results/baseline.json`` holds the numbers of the current tree; regenerate it with
+``--output benchmarks/results/baseline.json`` when an intended change moves them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+# Importing the app reads its settings; the strategies never touch the database
+# and are measured in process
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OVERLAP_POOL_WORKERS", "0")
+
+from app.routers.availability_strategies import STRATEGIES, PreparedAvailability, run_strategy
+from benchmarks.generators import GroupShape, make_group
+
+BASELINE = Path(__file__).parent / "results" / "baseline.json"
+
+SHAPES = [
+    GroupShape(members=6, days=90, per_day=2),
+    GroupShape(members=12, days=180, per_day=3),
+    GroupShape(members=20, days=365, per_day=4),
+    GroupShape(members=12, days=180, per_day=1, long_entries=6),
+    GroupShape(members=20, days=365, per_day=2, long_entries=12),
+    GroupShape(members=12, days=180, per_day=2, fragments=6),
+    GroupShape(members=40, days=60, per_day=2),
+]
+
+# The SQL and bitset strategies read the database and are not measured in-process
+IN_PROCESS = [name for name in STRATEGIES if name not in ("sql", "bitset")]
+
+MIN_PLAYERS = 2
+DURATION_HOURS = 3
+
+
+def run_once(strategy: str, entries: list) -> list[dict[str, Any]]:
+    prepared = PreparedAvailability(None, "benchmark", entries=entries)
+    return run_strategy(strategy, prepared, MIN_PLAYERS, DURATION_HOURS)
+
+
+def measure(strategy: str, entries: list, repeat: int) -> dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_once(strategy, entries)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        result = run_once(strategy, entries)
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ms": round(min(timings) * 1000, 2),
+        "peak_kib": round(peak / 1024, 1),
+        "blocks": blocks,
+        "suggestions": len(result),
+    }
+
+
+def run(strategies: list[str], shapes: list[GroupShape], repeat: int, seed: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for shape in shapes:
+        entries = make_group(shape, seed)
+        results[shape.label] = {
+            "entries": len(entries),
+            **{strategy: measure(strategy, entries, repeat) for strategy in strategies},
+        }
+    return results
+
+
+def report(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f"{'shape':<22} {'entries':>7} {'strategy':<15} {'ms':>9} {'base ms':>9} {'ratio':>6} "
+          f"{'peak KiB':>9} {'blocks':>7}")
+    for label, row in results.items():
+        for strategy, numbers in row.items():
+            if strategy == "entries":
+                continue
+            base = baseline.get(label, {}).get(strategy)
+            base_ms = f"{base['ms']:.1f}" if base else "-"
+            ratio = f"{numbers['ms'] / base['ms']:.2f}" if base and base["ms"] else "-"
+            print(f"{label:<22} {row['entries']:>7} {strategy:<15} {numbers['ms']:>9.1f} {base_ms:>9} "
+                  f"{ratio:>6} {numbers['peak_kib']:>9.1f} {numbers['blocks']:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", action="append", choices=IN_PROCESS, help="Strategy to run (repeatable)")
+    parser.add_argument("--shape", action="append", help="Shape label to run (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Results to compare with")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    shapes = [shape for shape in SHAPES if not args.shape or shape.label in args.shape]
+    results = run(args.strategy or IN_PROCESS, shapes, args.repeat, args.seed)
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+    report(results, baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "results": results,
+        }, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare the sweep line and the vectorized overlap engine on large synthetic groups.
+
+Run from the backend directory:
+
+    python -m benchmarks.vectorized_engine
+    python -m benchmarks.vectorized_engine --database-url postgresql+psycopg://...
+
+``memory`` times both engines on in-memory rows. Turning every row's datetimes into
+integer offsets is then most of the vectorized engine's time, so it only wins on
+groups with long entries. ``database`` times what the strategies do with a seeded
+database (SQLite in memory by default; point ``--database-url`` at a scratch
+database): the sweep loads the rows with ``load_entries``, the vectorized engine
+reads them as epoch offsets computed by the database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.routers.availability_rows import load_entries
+from app.routers.availability_sweep import find_daily_overlaps
+from app.routers.availability_vectorized import (
+    find_availability_overlaps_vectorized,
+    find_availability_overlaps_vectorized_db,
+)
+from benchmarks.generators import GroupShape, make_group
+from benchmarks.listing import GROUP_ID, seed
+
+SIZES = [
+    GroupShape(members=6, days=90, per_day=2),
+    GroupShape(members=12, days=180, per_day=3),
+    GroupShape(members=20, days=365, per_day=4),
+    GroupShape(members=12, days=180, per_day=1, long_entries=6),
+    GroupShape(members=20, days=365, per_day=2, long_entries=12),
+]
+
+
+def best_of(fn, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def sweep_from_database(db) -> list:
+    return find_daily_overlaps(load_entries(db, GROUP_ID), 2, 3)
+
+
+def vectorized_from_database(db) -> list:
+    return find_availability_overlaps_vectorized_db(db, GROUP_ID, 2, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://", help="Scratch database to seed")
+    args = parser.parse_args()
+
+    options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}} if args.database_url.startswith("sqlite") else {}
+    engine = create_engine(args.database_url, **options)
+    sessions = sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"{'source':<8} {'members':>7} {'days':>5} {'long':>5} {'entries':>8} {'sweep ms':>9} {'vector ms':>10} {'speedup':>8}")
+    for shape in SIZES:
+        entries = make_group(shape)
+        assert find_daily_overlaps(entries, 2, 3) == find_availability_overlaps_vectorized(entries, 2, 3)
+        timings = {"memory": (
+            best_of(find_daily_overlaps, entries, 2, 3), best_of(find_availability_overlaps_vectorized, entries, 2, 3)
+        )}
+
+        Base.metadata.create_all(engine)
+        try:
+            with sessions() as db:
+                rows = seed(db, shape, 0)
+                timings["database"] = (best_of(sweep_from_database, db), best_of(vectorized_from_database, db))
+        finally:
+            Base.metadata.drop_all(engine)
+
+        for source, (sweep, vector) in timings.items():
+            count = len(entries) if source == "memory" else rows
+            print(
+                f"{source:<8} {shape.members:>7} {shape.days:>5} {shape.long_entries:>5} {count:>8} "
+                f"{sweep * 1000:>9.1f} {vector * 1000:>10.1f} {sweep / vector:>7.1f}x"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Add AvailabilityRule table for weekly recurring availability"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610170001"
+down_revision = "202602240001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "AvailabilityRule",
+        sa.Column("id", sa.String(), primary_key=True, nullable=False),
+        sa.Column("userId", sa.String(), sa.ForeignKey("User.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("groupId", sa.String(), sa.ForeignKey("Group.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("weekdays", sa.Integer(), nullable=False),
+        sa.Column("startTime", sa.Time(), nullable=False),
+        sa.Column("endTime", sa.Time(), nullable=False),
+        sa.Column("validFrom", sa.Date(), nullable=False),
+        sa.Column("validUntil", sa.Date(), nullable=True),
+        sa.Column("exceptions", sa.JSON(), nullable=False, server_default=sa.text("'[]'")),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("createdAt", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        sa.CheckConstraint('"weekdays" BETWEEN 1 AND 127', name="check_availability_rule_weekdays"),
+    )
+    op.create_index("ix_availability_rule_group", "AvailabilityRule", ["groupId"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_availability_rule_group", table_name="AvailabilityRule")
+    op.drop_table("AvailabilityRule")
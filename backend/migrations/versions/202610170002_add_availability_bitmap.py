@@ -0,0 +1,60 @@
+"""Add AvailabilityBitmap table, a packed weekly index of Availability"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610170002"
+down_revision = "202610170001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "AvailabilityBitmap",
+        sa.Column("groupId", sa.String(), sa.ForeignKey("Group.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("userId", sa.String(), sa.ForeignKey("User.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("weekStart", sa.Date(), primary_key=True),
+        sa.Column("slots", sa.LargeBinary(), nullable=False),
+        sa.CheckConstraint('octet_length("slots") = 84', name="check_availability_bitmap_length"),
+    )
+
+    # Backfill from the existing rows, like app.availability_bitmap.rebuild_bitmaps:
+    # slots are numbered in 15 minute steps from Monday 1970-01-05, an interval
+    # covers the whole slots from its start rounded up to its end rounded down,
+    # and bit n of a week is bit n % 8 of byte n / 8
+    op.execute(
+        """
+        WITH covered AS (
+            SELECT DISTINCT a."groupId", a."userId", s.slot
+            FROM "Availability" a
+            CROSS JOIN LATERAL generate_series(
+                ceil(extract(epoch FROM a."startDateTime" - timestamp '1970-01-05') / 900)::bigint,
+                floor(extract(epoch FROM a."endDateTime" - timestamp '1970-01-05') / 900)::bigint - 1
+            ) AS s(slot)
+        ), weekly AS (
+            SELECT "groupId", "userId", div(slot - bit, 672) AS week, bit
+            FROM covered, LATERAL (SELECT (slot % 672 + 672) % 672 AS bit) AS b
+        ), bytes AS (
+            SELECT "groupId", "userId", week, bit / 8 AS byte, sum(1 << (bit % 8)::int) AS value
+            FROM weekly
+            GROUP BY "groupId", "userId", week, bit / 8
+        )
+        INSERT INTO "AvailabilityBitmap" ("groupId", "userId", "weekStart", "slots")
+        SELECT w."groupId", w."userId", date '1970-01-05' + (w.week * 7)::int,
+               decode(string_agg(lpad(to_hex(coalesce(b.value, 0)), 2, '0'), '' ORDER BY n.byte), 'hex')
+        FROM (SELECT DISTINCT "groupId", "userId", week FROM bytes) w
+        CROSS JOIN generate_series(0, 83) AS n(byte)
+        LEFT JOIN bytes b
+            ON b."groupId" = w."groupId" AND b."userId" = w."userId" AND b.week = w.week AND b.byte = n.byte
+        GROUP BY w."groupId", w."userId", w.week
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("AvailabilityBitmap")
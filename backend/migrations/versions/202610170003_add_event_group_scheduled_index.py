@@ -0,0 +1,20 @@
+"""Index Event by group and start for loading the busy time of players"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "202610170003"
+down_revision = "202610170002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_event_group_scheduled", "Event", ["groupId", "scheduledAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_group_scheduled", table_name="Event")
@@ -0,0 +1,36 @@
+"""Add a GiST-indexed tsrange of every Availability interval on PostgreSQL"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "202610170004"
+down_revision = "202610170003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # The same DDL as app.models.add_availability_range, which creates it for new databases
+    op.execute(
+        'ALTER TABLE "Availability" ADD COLUMN during tsrange '
+        """GENERATED ALWAYS AS (tsrange("startDateTime", "endDateTime", '[]')) STORED"""
+    )
+    columns = "during"
+    if op.get_bind().exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'").first():
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        columns = '"groupId", during'
+    op.execute(f'CREATE INDEX ix_availability_group_during ON "Availability" USING gist ({columns})')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute('ALTER TABLE "Availability" DROP CONSTRAINT IF EXISTS ex_availability_user_group_overlap')
+    op.execute("DROP INDEX IF EXISTS ix_availability_group_during")
+    op.execute('ALTER TABLE "Availability" DROP COLUMN during')
@@ -0,0 +1,24 @@
+"""Add the IANA timezone of AvailabilityRule; existing rules keep UTC"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610170005"
+down_revision = "202610170004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "AvailabilityRule",
+        sa.Column("timezone", sa.String(), nullable=False, server_default=sa.text("'UTC'")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("AvailabilityRule", "timezone")
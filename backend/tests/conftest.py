@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from datetime import datetime
 from typing import Any
 
 import pytest
@@ -11,8 +12,14 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import models
+from app.auth import create_access_token
+from app.busy_index import busy_indexes
+from app.config import get_settings
 from app.database import Base, get_db
 from app.main import app
+from app.overlap_cache import overlap_cache
+from app.overlap_state import day_states
 
 
 # Use in-memory SQLite for tests
@@ -47,6 +54,15 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_overlap_cache() -> Generator[None, None, None]:
+    """Start every test with empty overlap suggestion caches."""
+    overlap_cache.clear()
+    day_states.clear()
+    busy_indexes.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def client(db: Session) -> Generator[TestClient, None, None]:
     """Create a test client with database override."""
@@ -93,3 +109,50 @@ def auth_headers(registered_user: dict[str, Any]) -> dict[str, str]:
     """Authorization headers for authenticated requests."""
     return {"Authorization": f"Bearer {registered_user['accessToken']}"}
 
+
+
+@pytest.fixture
+def make_user(db: Session) -> Callable[..., tuple[models.User, dict[str, str]]]:
+    """Factory creating verified users; returns the user and its auth headers."""
+    settings = get_settings()
+
+    def _make_user(email: str, name: str | None = None) -> tuple[models.User, dict[str, str]]:
+        user = models.User(email=email, name=name, emailVerified=datetime.utcnow())
+        db.add(user)
+        db.commit()
+        token = create_access_token(user=user, settings=settings)
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return _make_user
+
+
+@pytest.fixture
+def make_group(db: Session) -> Callable[..., models.Group]:
+    """Factory creating a group owned by ``owner`` with the given extra members."""
+
+    def _make_group(owner: models.User, members: list[models.User] = (), name: str = "Party") -> models.Group:
+        group = models.Group(ownerId=owner.id, name=name)
+        db.add(group)
+        db.add(models.Membership(userId=owner.id, group=group, role="gm"))
+        for member in members:
+            db.add(models.Membership(userId=member.id, group=group, role="player"))
+        db.commit()
+        return group
+
+    return _make_group
+
+
+@pytest.fixture
+def party(make_user, make_group) -> dict:
+    """A GM with two players and everyone's auth headers."""
+    gm, gm_headers = make_user("gm@example.com", "GM")
+    alice, alice_headers = make_user("alice@example.com", "Alice")
+    bob, bob_headers = make_user("bob@example.com", "Bob")
+    group = make_group(gm, [alice, bob])
+    return {
+        "group": group,
+        "gm": gm,
+        "alice": alice,
+        "bob": bob,
+        "headers": {"gm": gm_headers, "alice": alice_headers, "bob": bob_headers},
+    }
@@ -0,0 +1,636 @@
+"""Tests for availability endpoints and overlap engines."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.overlap_cache import overlap_cache
+from app.overlap_pool import OverlapPool
+from app.overlap_state import GroupDayState
+from app.routers import availability_strategies
+from app.routers.availability_by_days import find_availability_by_days
+from app.routers.availability_improved import find_availability_overlaps
+from app.routers.availability_pareto import find_pareto_overlaps, pareto_windows
+from app.routers.availability_strategies import (
+    DEFAULT_STRATEGY,
+    STRATEGIES,
+    PreparedAvailability,
+    run_strategy,
+)
+from app.routers.availability_sweep import (
+    bucket_by_day,
+    clip_to_days,
+    constrain_days,
+    find_daily_overlaps,
+    rank_daily_windows,
+)
+from app.routers.availability_vectorized import find_availability_overlaps_vectorized
+
+
+def random_availability(seed: int, granularity_minutes: int = 15) -> list[SimpleNamespace]:
+    """Random availability for a small group, including multi-day entries."""
+    rng = random.Random(seed)
+    users = [
+        SimpleNamespace(id=f"user-{i}", name=f"Player {i}", email=f"player{i}@example.com", image=None)
+        for i in range(rng.randint(2, 8))
+    ]
+    base = datetime(2025, 3, 1)
+    entries = []
+    starts = set()
+    for _ in range(rng.randint(1, 120)):
+        user = rng.choice(users)
+        start = base + timedelta(minutes=granularity_minutes * rng.randrange(0, 30 * 24 * 60 // granularity_minutes))
+        if rng.random() < 0.1:
+            length = granularity_minutes * rng.randrange(1, 3 * 24 * 60 // granularity_minutes)
+        else:
+            length = granularity_minutes * rng.randrange(1, 600 // granularity_minutes + 1)
+        # A member's rows in a group have distinct starts (unique index)
+        if (user.id, start) in starts:
+            continue
+        starts.add((user.id, start))
+        entries.append(
+            SimpleNamespace(
+                userId=user.id,
+                user=user,
+                startDateTime=start,
+                endDateTime=start + timedelta(minutes=length),
+            )
+        )
+    entries.sort(key=lambda a: a.startDateTime)
+    for i, entry in enumerate(entries):
+        entry.id = f"avail-{i}"
+    return entries
+
+
+def add_availability(db: Session, group: models.Group, user: models.User, start: datetime, end: datetime) -> None:
+    db.add(models.Availability(userId=user.id, groupId=group.id, startDateTime=start, endDateTime=end))
+    db.commit()
+
+
+class TestOverlaps:
+    """Tests for GET /groups/{id}/availability/overlaps."""
+
+    def test_overlaps_best_window(self, client: TestClient, db: Session, party: dict):
+        """Test the best window is the one where most players overlap."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        add_availability(db, group, party["alice"], day.replace(hour=16), day.replace(hour=22))
+        add_availability(db, group, party["bob"], day.replace(hour=18), day.replace(hour=23))
+
+        response = client.get(
+            f"/api/groups/{group.id}/availability/overlaps",
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["date"] == "2025-05-10"
+        assert data[0]["startDateTime"] == "2025-05-10T18:00:00"
+        assert data[0]["endDateTime"] == "2025-05-10T22:00:00"
+        assert data[0]["playerCount"] == 3
+        assert {p["name"] for p in data[0]["availablePlayers"]} == {"GM", "Alice", "Bob"}
+
+    def test_overlaps_vectorized_strategy(self, client: TestClient, db: Session, party: dict):
+        """Test the vectorized strategy returns the same suggestions as the sweep."""
+        group = party["group"]
+        for day in range(5):
+            base = datetime(2025, 5, 10) + timedelta(days=day)
+            add_availability(db, group, party["gm"], base.replace(hour=10), base.replace(hour=20))
+            add_availability(db, group, party["alice"], base.replace(hour=12 + day), base.replace(hour=22))
+            add_availability(db, group, party["bob"], base.replace(hour=9), base.replace(hour=17))
+
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        sweep = client.get(url, headers=party["headers"]["gm"])
+        vectorized = client.get(url, params={"strategy": "vectorized"}, headers=party["headers"]["gm"])
+
+        assert sweep.status_code == 200
+        assert vectorized.status_code == 200
+        assert vectorized.json() == sweep.json()
+        assert len(sweep.json()) == 5
+
+    def test_overlaps_sql_strategy_falls_back(self, client: TestClient, db: Session, party: dict):
+        """Test the SQL strategy falls back to the sweep on SQLite."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        add_availability(db, group, party["alice"], day.replace(hour=16), day.replace(hour=22))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+
+        sql = client.get(url, params={"strategy": "sql"}, headers=party["headers"]["gm"])
+
+        assert sql.status_code == 200
+        assert sql.json()[0]["startDateTime"] == "2025-05-10T16:00:00"
+        assert sql.json()[0]["playerCount"] == 2
+
+    def test_overlaps_pagination(self, client: TestClient, db: Session, party: dict):
+        """Test limit/offset pages through the full ranking."""
+        group = party["group"]
+        for day in range(12):
+            base = datetime(2025, 5, 1) + timedelta(days=day)
+            add_availability(db, group, party["gm"], base.replace(hour=10), base.replace(hour=22))
+            add_availability(db, group, party["alice"], base.replace(hour=10 + day % 6), base.replace(hour=22))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        headers = party["headers"]["gm"]
+
+        full = client.get(url, params={"limit": 20}, headers=headers).json()
+        first = client.get(url, params={"limit": 5}, headers=headers).json()
+        second = client.get(url, params={"limit": 5, "offset": 5}, headers=headers).json()
+        rest = client.get(url, params={"limit": 5, "offset": 10}, headers=headers).json()
+
+        assert len(full) == 12
+        assert first + second + rest == full
+        assert client.get(url, headers=headers).json() == full[:10]
+
+    def test_overlaps_alternative_strategies(self, client: TestClient, db: Session, party: dict):
+        """Test the merged-windows and by-days strategies are served by the endpoint."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        add_availability(db, group, party["alice"], day.replace(hour=16), day.replace(hour=22))
+        add_availability(db, group, party["bob"], day.replace(hour=18), day.replace(hour=21))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        headers = party["headers"]["gm"]
+
+        merged = client.get(url, params={"strategy": "merged-windows", "min_players": 3}, headers=headers)
+        by_days = client.get(url, params={"strategy": "by-days", "min_players": 3}, headers=headers)
+
+        assert merged.status_code == 200
+        assert merged.json()[0]["startDateTime"] == "2025-05-10T18:00:00"
+        assert merged.json()[0]["endDateTime"] == "2025-05-10T21:00:00"
+        assert by_days.status_code == 200
+        assert by_days.json()[0]["date"] == "2025-05-10"
+        assert by_days.json()[0]["playerCount"] == 3
+
+    def test_overlaps_busy_pool(
+        self, client: TestClient, db: Session, party: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test a full process pool answers 503 instead of queueing."""
+        monkeypatch.setattr(
+            availability_strategies,
+            "overlap_pool",
+            OverlapPool(workers=2, min_entries=1, max_queue=0, timeout_seconds=1),
+        )
+        day = datetime(2025, 5, 10)
+        add_availability(db, party["group"], party["gm"], day.replace(hour=12), day.replace(hour=23))
+
+        response = client.get(
+            f"/api/groups/{party['group'].id}/availability/overlaps",
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == "overlaps_busy"
+
+    def test_overlaps_unknown_strategy(self, client: TestClient, party: dict):
+        """Test an unknown strategy is rejected."""
+        response = client.get(
+            f"/api/groups/{party['group'].id}/availability/overlaps",
+            params={"strategy": "quantum"},
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "unknown_strategy"
+
+
+class TestMySuggestions:
+    """Tests for the cross-group suggestions of the current user."""
+
+    def test_merged_ranking_flags_conflicts(self, client: TestClient, db: Session, make_user, make_group):
+        """Test slots of all the user's groups are ranked together and collisions flagged."""
+        gm, gm_headers = make_user("gm@example.com", "GM")
+        alice, _ = make_user("alice@example.com", "Alice")
+        bob, _ = make_user("bob@example.com", "Bob")
+        carol, _ = make_user("carol@example.com", "Carol")
+        alpha = make_group(gm, [alice], name="Alpha")
+        beta = make_group(gm, [bob], name="Beta")
+        other = make_group(carol, [alice], name="Other")
+        day = datetime(2025, 5, 10)
+        add_availability(db, alpha, gm, day.replace(hour=18), day.replace(hour=23))
+        add_availability(db, alpha, alice, day.replace(hour=18), day.replace(hour=22))
+        add_availability(db, beta, gm, day.replace(hour=18), day.replace(hour=23))
+        add_availability(db, beta, bob, day.replace(hour=19), day.replace(hour=22))
+        add_availability(db, other, carol, day.replace(hour=8), day.replace(hour=20))
+        add_availability(db, other, alice, day.replace(hour=8), day.replace(hour=20))
+
+        response = client.get("/api/users/me/suggestions", headers=gm_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [(s["groupName"], s["startDateTime"], s["endDateTime"]) for s in data] == [
+            ("Alpha", "2025-05-10T18:00:00", "2025-05-10T22:00:00"),
+            ("Beta", "2025-05-10T19:00:00", "2025-05-10T22:00:00"),
+        ]
+        assert [c["groupId"] for c in data[0]["conflicts"]] == [beta.id]
+        assert [c["groupId"] for c in data[1]["conflicts"]] == [alpha.id]
+
+    def test_events_are_busy_time(self, client: TestClient, db: Session, party: dict):
+        """Test the players' events are left out as in /overlaps."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        for name in ("gm", "alice", "bob"):
+            add_availability(db, group, party[name], day.replace(hour=12), day.replace(hour=23))
+        response = client.post(
+            f"/api/groups/{group.id}/events",
+            json={"scheduledAt": day.replace(hour=12).isoformat(), "durationMinutes": 600, "title": "Session"},
+            headers=party["headers"]["gm"],
+        )
+        assert response.status_code == 201
+
+        params = {"duration_hours": 1}
+        data = client.get("/api/users/me/suggestions", params=params, headers=party["headers"]["gm"]).json()
+        overlaps = client.get(
+            f"/api/groups/{group.id}/availability/overlaps", params=params, headers=party["headers"]["gm"]
+        ).json()
+
+        assert [(s["startDateTime"], s["endDateTime"]) for s in data] == [
+            (s["startDateTime"], s["endDateTime"]) for s in overlaps
+        ] == [("2025-05-10T22:00:00", "2025-05-10T23:00:00")]
+
+    def test_no_groups(self, client: TestClient, make_user):
+        """Test a user without groups gets no suggestions."""
+        _, headers = make_user("loner@example.com")
+
+        response = client.get("/api/users/me/suggestions", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestVectorizedEngine:
+    """Equivalence of the vectorized engine with the sweep line."""
+
+    @pytest.mark.parametrize("seed", range(40))
+    @pytest.mark.parametrize("granularity_minutes", [1, 15])
+    def test_matches_sweep(self, seed: int, granularity_minutes: int):
+        """Test random groups produce identical suggestions."""
+        entries = random_availability(seed, granularity_minutes)
+
+        for min_players in (1, 2, 3):
+            for duration_hours in (1, 3):
+                expected = find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+                actual = find_availability_overlaps_vectorized(
+                    entries, min_players, duration_hours, max_suggestions=50
+                )
+                assert actual == expected
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_offset_matches_sweep(self, seed: int):
+        """Test pages of the vectorized ranking match the sweep."""
+        entries = random_availability(seed)
+
+        assert find_availability_overlaps_vectorized(entries, 1, 1, 4, 3) == find_daily_overlaps(entries, 1, 1, 4, 3)
+
+    def test_empty(self):
+        """Test no availability gives no suggestions."""
+        assert find_availability_overlaps_vectorized([], 2, 3) == []
+
+
+class TestParetoEngine:
+    """Pareto frontier of player subsets per day."""
+
+    def test_alternatives(self):
+        """Test a smaller subset that plays longer is offered next to the largest one."""
+        users = [SimpleNamespace(id=f"user-{i}", name=f"P{i}", email=f"p{i}@example.com", image=None) for i in range(3)]
+        entries = [
+            SimpleNamespace(id=f"a{i}", userId=user.id, user=user,
+                            startDateTime=datetime(2025, 5, 10, start), endDateTime=datetime(2025, 5, 10, end))
+            for i, (user, (start, end)) in enumerate(zip(users, ((17, 23), (17, 22), (19, 21))))
+        ]
+
+        [suggestion] = find_pareto_overlaps(entries, 2, 1)
+
+        assert (suggestion["startDateTime"], suggestion["endDateTime"], suggestion["playerCount"]) == (
+            "2025-05-10T19:00:00", "2025-05-10T21:00:00", 3
+        )
+        assert [(a["startDateTime"], a["endDateTime"], a["playerCount"]) for a in suggestion["alternatives"]] == [
+            ("2025-05-10T17:00:00", "2025-05-10T22:00:00", 2),
+        ]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_frontier_matches_brute_force(self, seed: int):
+        """Test every day's frontier against the best intersection of every subset."""
+        for day, players in bucket_by_day(random_availability(seed)).items():
+            best_by_count = {}
+            for size in range(1, len(players) + 1):
+                for subset in itertools.combinations(players.values(), size):
+                    start = max(p["start"] for p in subset)
+                    end = min(p["end"] for p in subset)
+                    if start < end:
+                        duration = (end - start).total_seconds() / 60
+                        best_by_count[size] = max(best_by_count.get(size, 0), duration)
+            expected = []
+            for count in sorted(best_by_count, reverse=True):
+                if not expected or best_by_count[count] > expected[-1][1]:
+                    expected.append((count, best_by_count[count]))
+
+            frontier = pareto_windows(players, 1, 0)
+
+            assert [(w["count"], w["duration_mins"]) for w in frontier] == expected
+            for window in frontier:
+                assert all(
+                    players[user_id]["start"] <= window["start"] and players[user_id]["end"] >= window["end"]
+                    for user_id in window["players"]
+                )
+
+
+class TestDayClipping:
+    """Multi-day availability is clipped to each calendar day it covers."""
+
+    def test_clip_multi_day(self):
+        """Test an interval splits into first, full middle and last days."""
+        segments = list(clip_to_days(datetime(2025, 5, 5, 20), datetime(2025, 5, 8, 2)))
+
+        assert segments == [
+            (date(2025, 5, 5), datetime(2025, 5, 5, 20), datetime(2025, 5, 6)),
+            (date(2025, 5, 6), datetime(2025, 5, 6), datetime(2025, 5, 7)),
+            (date(2025, 5, 7), datetime(2025, 5, 7), datetime(2025, 5, 8)),
+            (date(2025, 5, 8), datetime(2025, 5, 8), datetime(2025, 5, 8, 2)),
+        ]
+
+    def test_end_at_midnight(self):
+        """Test an interval ending at midnight does not cover the next day."""
+        segments = list(clip_to_days(datetime(2025, 5, 5, 20), datetime(2025, 5, 6)))
+
+        assert segments == [(date(2025, 5, 5), datetime(2025, 5, 5, 20), datetime(2025, 5, 6))]
+
+    @pytest.mark.parametrize("engine", [find_daily_overlaps, find_availability_overlaps_vectorized])
+    def test_vacation_windows_stay_within_day(self, engine):
+        """Test a month-long entry yields one window per day, bounded by the day."""
+        gm, alice = (
+            SimpleNamespace(id=f"user-{i}", name=name, email=f"{name}@example.com", image=None)
+            for i, name in enumerate(("GM", "Alice"))
+        )
+        entries = [
+            SimpleNamespace(id="a", userId=gm.id, user=gm,
+                            startDateTime=datetime(2025, 7, 1, 12), endDateTime=datetime(2025, 7, 31, 12)),
+            SimpleNamespace(id="b", userId=alice.id, user=alice,
+                            startDateTime=datetime(2025, 7, 10, 18), endDateTime=datetime(2025, 7, 12, 1)),
+        ]
+
+        data = engine(entries, 2, 1)
+
+        assert [(s["date"], s["startDateTime"], s["endDateTime"]) for s in data] == [
+            ("2025-07-11", "2025-07-11T00:00:00", "2025-07-12T00:00:00"),
+            ("2025-07-10", "2025-07-10T18:00:00", "2025-07-11T00:00:00"),
+            ("2025-07-12", "2025-07-12T00:00:00", "2025-07-12T01:00:00"),
+        ]
+
+
+class TestStrategyRegistry:
+    """Registered strategies share one prepared load of the group's availability."""
+
+    def test_registered_names(self):
+        """Test every documented strategy is registered."""
+        assert {"sweep-per-day", "merged-windows", "by-days", "vectorized", "sql"} <= set(STRATEGIES)
+        assert DEFAULT_STRATEGY in STRATEGIES
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_strategies_match_their_algorithms(self, seed: int):
+        """Test strategies run on prepared data return what their algorithm returns."""
+        entries = random_availability(seed)
+        prepared = PreparedAvailability(None, "group", entries=entries)
+
+        assert run_strategy("sweep-per-day", prepared, 2, 1, 50) == find_daily_overlaps(entries, 2, 1, 50)
+        assert run_strategy("merged-windows", prepared, 2, 1, 50) == find_availability_overlaps(entries, 2, 1, 50)
+        assert run_strategy("by-days", prepared, 2, 1, 50) == find_availability_by_days(entries, 2, 50)
+        assert run_strategy("sql", prepared, 2, 1, 50) == find_daily_overlaps(entries, 2, 1, 50)
+
+    def test_preprocessing_runs_once(self, monkeypatch: pytest.MonkeyPatch):
+        """Test rows are bucketed once however many strategies read them."""
+        calls = []
+        original = availability_strategies.bucket_by_day
+
+        def counting(all_availability):
+            calls.append(len(all_availability))
+            return original(all_availability)
+
+        monkeypatch.setattr(availability_strategies, "bucket_by_day", counting)
+        prepared = PreparedAvailability(None, "group", entries=random_availability(3))
+
+        for name in ("sweep-per-day", "by-days", "sweep-per-day"):
+            run_strategy(name, prepared, 2, 1)
+
+        assert len(calls) == 1
+
+
+class TestAttendeeConstraints:
+    """Required and optional players of an overlap search."""
+
+    @staticmethod
+    def best_segments_with(entries: list, required: frozenset, min_players: int, duration_hours: int) -> dict:
+        """Reference: sweep every segment of every day and keep those attended by all required players."""
+        best = {}
+        for day, players in bucket_by_day(entries).items():
+            times = sorted({t for p in players.values() for t in (p["start"], p["end"])})
+            for start, end in zip(times, times[1:]):
+                active = {u for u, p in players.items() if p["start"] <= start and p["end"] >= end}
+                duration = (end - start).total_seconds() / 60
+                if not required <= active or len(active) < min_players or duration < duration_hours * 60:
+                    continue
+                if day not in best or (len(active), duration) > best[day][2:]:
+                    best[day] = (start.isoformat(), end.isoformat(), len(active), duration)
+        return best
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_pruning_matches_filtering_afterwards(self, seed: int):
+        """Test pruned days give the best windows attended by every required player."""
+        entries = random_availability(seed)
+        required = frozenset({entries[0].userId})
+
+        for min_players, duration_hours in ((1, 1), (2, 1), (3, 3)):
+            suggestions = rank_daily_windows(
+                constrain_days(bucket_by_day(entries), required), min_players, duration_hours, max_suggestions=500
+            )
+            expected = self.best_segments_with(entries, required, min_players, duration_hours)
+
+            assert {
+                date.fromisoformat(s["date"]): (s["startDateTime"], s["endDateTime"], s["playerCount"])
+                for s in suggestions
+            } == {day: window[:3] for day, window in expected.items()}
+
+    def test_require_gm(self, client: TestClient, db: Session, party: dict):
+        """Test a longer window without the GM no longer outranks one with them."""
+        group = party["group"]
+        add_availability(db, group, party["alice"], datetime(2025, 5, 10, 10), datetime(2025, 5, 10, 22))
+        add_availability(db, group, party["bob"], datetime(2025, 5, 10, 10), datetime(2025, 5, 10, 22))
+        add_availability(db, group, party["alice"], datetime(2025, 5, 11, 18), datetime(2025, 5, 11, 23))
+        add_availability(db, group, party["gm"], datetime(2025, 5, 11, 19), datetime(2025, 5, 11, 22))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+
+        unconstrained = client.get(url, headers=party["headers"]["gm"]).json()
+        constrained = client.get(url, params={"require_gm": True}, headers=party["headers"]["gm"]).json()
+
+        assert [s["date"] for s in unconstrained] == ["2025-05-10", "2025-05-11"]
+        assert [(s["startDateTime"], s["endDateTime"], s["playerCount"]) for s in constrained] == [
+            ("2025-05-11T19:00:00", "2025-05-11T22:00:00", 2),
+        ]
+
+    def test_optional_players_limit_who_counts(self, client: TestClient, db: Session, party: dict):
+        """Test players outside required and optional ids are ignored."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        for user in (party["gm"], party["alice"], party["bob"]):
+            add_availability(db, group, user, day.replace(hour=18), day.replace(hour=22))
+
+        data = client.get(
+            f"/api/groups/{group.id}/availability/overlaps",
+            params={
+                "required_user_ids": [party["gm"].id],
+                "optional_user_ids": [party["alice"].id],
+                "strategy": "vectorized",
+            },
+            headers=party["headers"]["gm"],
+        ).json()
+
+        assert [(s["playerCount"], {p["id"] for p in s["availablePlayers"]}) for s in data] == [
+            (2, {party["gm"].id, party["alice"].id}),
+        ]
+
+
+class TestOverlapCaching:
+    """Overlap suggestions are cached and invalidated by writes."""
+
+    def test_repeated_read_hits_cache(self, client: TestClient, db: Session, party: dict):
+        """Test the second identical read is served from the cache."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        add_availability(db, group, party["alice"], day.replace(hour=16), day.replace(hour=22))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+
+        first = client.get(url, headers=party["headers"]["gm"])
+        second = client.get(url, headers=party["headers"]["alice"])
+
+        assert second.json() == first.json()
+        assert overlap_cache.stats()["hits"] == 1
+        assert overlap_cache.stats()["misses"] == 1
+
+    def test_create_invalidates(self, client: TestClient, db: Session, party: dict):
+        """Test creating availability is reflected in the next read."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        add_availability(db, group, party["alice"], day.replace(hour=16), day.replace(hour=22))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        assert client.get(url, headers=party["headers"]["gm"]).json()[0]["playerCount"] == 2
+
+        response = client.post(
+            f"/api/groups/{group.id}/availability",
+            json={"startDateTime": "2025-05-10T18:00:00", "endDateTime": "2025-05-10T23:00:00"},
+            headers=party["headers"]["bob"],
+        )
+        assert response.status_code == 201
+
+        assert client.get(url, headers=party["headers"]["gm"]).json()[0]["playerCount"] == 3
+
+    def test_delete_invalidates(self, client: TestClient, db: Session, party: dict):
+        """Test deleting availability is reflected in the next read."""
+        group = party["group"]
+        day = datetime(2025, 5, 10)
+        add_availability(db, group, party["gm"], day.replace(hour=12), day.replace(hour=23))
+        created = client.post(
+            f"/api/groups/{group.id}/availability",
+            json={"startDateTime": "2025-05-10T16:00:00", "endDateTime": "2025-05-10T22:00:00"},
+            headers=party["headers"]["alice"],
+        ).json()
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        assert len(client.get(url, headers=party["headers"]["gm"]).json()) == 1
+
+        response = client.delete(
+            f"/api/groups/{group.id}/availability/{created['id']}",
+            headers=party["headers"]["alice"],
+        )
+        assert response.status_code == 204
+
+        assert client.get(url, headers=party["headers"]["gm"]).json() == []
+
+    def test_update_invalidates(self, client: TestClient, db: Session, party: dict):
+        """Test moving an entry to another day moves the suggestion."""
+        group = party["group"]
+        add_availability(db, group, party["gm"], datetime(2025, 5, 10, 12), datetime(2025, 5, 10, 23))
+        add_availability(db, group, party["gm"], datetime(2025, 5, 11, 12), datetime(2025, 5, 11, 23))
+        created = client.post(
+            f"/api/groups/{group.id}/availability",
+            json={"startDateTime": "2025-05-10T16:00:00", "endDateTime": "2025-05-10T22:00:00"},
+            headers=party["headers"]["alice"],
+        ).json()
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        assert [s["date"] for s in client.get(url, headers=party["headers"]["gm"]).json()] == ["2025-05-10"]
+
+        response = client.put(
+            f"/api/groups/{group.id}/availability/{created['id']}",
+            json={"startDateTime": "2025-05-11T15:00:00", "endDateTime": "2025-05-11T22:00:00"},
+            headers=party["headers"]["alice"],
+        )
+        assert response.status_code == 200
+
+        data = client.get(url, headers=party["headers"]["gm"]).json()
+        assert [s["date"] for s in data] == ["2025-05-11"]
+        assert data[0]["startDateTime"] == "2025-05-11T15:00:00"
+
+
+def normalized(suggestions: list[dict]) -> list[dict]:
+    """Suggestions with players sorted; ties in start time have no defined order."""
+    return [
+        {**s, "availablePlayers": sorted(s["availablePlayers"], key=lambda p: p["id"])}
+        for s in suggestions
+    ]
+
+
+class TestGroupDayState:
+    """The incremental day state matches a full recomputation after every write."""
+
+    @pytest.mark.parametrize("seed", range(15))
+    def test_random_writes_match_full_sweep(self, seed: int):
+        """Test random creates, moves and deletes against a fresh sweep."""
+        rng = random.Random(seed)
+        entries = random_availability(seed)
+        state = GroupDayState(entries)
+        state.suggestions(2, 2, max_suggestions=50)
+        live = {entry.id: entry for entry in entries}
+
+        for step in range(30):
+            action = rng.choice(["create", "move", "delete"]) if live else "create"
+            if action == "create":
+                template = rng.choice(entries)
+                start = template.startDateTime + timedelta(hours=rng.randint(-30, 30))
+                entry = SimpleNamespace(
+                    id=f"new-{step}",
+                    userId=template.userId,
+                    user=template.user,
+                    startDateTime=start,
+                    endDateTime=start + timedelta(minutes=15 * rng.randint(1, 40)),
+                )
+                live[entry.id] = entry
+                state.apply(None, (entry.id, entry.userId, entry.user, entry.startDateTime, entry.endDateTime))
+            else:
+                entry = live.pop(rng.choice(sorted(live)))
+                removed = (entry.id, entry.userId, entry.user, entry.startDateTime, entry.endDateTime)
+                added = None
+                if action == "move":
+                    shift = timedelta(hours=rng.randint(-48, 48))
+                    entry = SimpleNamespace(**{
+                        **vars(entry),
+                        "startDateTime": entry.startDateTime + shift,
+                        "endDateTime": entry.endDateTime + shift,
+                    })
+                    live[entry.id] = entry
+                    added = (entry.id, entry.userId, entry.user, entry.startDateTime, entry.endDateTime)
+                state.apply(removed, added)
+
+            current = sorted(live.values(), key=lambda a: a.startDateTime)
+            for min_players, duration_hours in ((2, 2), (1, 3)):
+                expected = find_daily_overlaps(current, min_players, duration_hours, max_suggestions=50)
+                actual = state.suggestions(min_players, duration_hours, max_suggestions=50)
+                assert normalized(actual) == normalized(expected)
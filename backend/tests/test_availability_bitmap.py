@@ -0,0 +1,131 @@
+"""Tests for the packed weekly availability bitmaps."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_bitmap import decode, interval_masks, rebuild_bitmaps
+from app.routers.availability_bitset import find_availability_overlaps_bitset
+from app.routers.availability_sweep import find_daily_overlaps
+from tests.test_availability import random_availability
+
+MONDAY = date(2025, 5, 5)
+
+
+def slots(day: int, start: tuple[int, int], end: tuple[int, int]) -> int:
+    """Mask of the slots of weekday ``day`` from ``start`` to ``end`` (hour, minute)."""
+    first = day * 96 + start[0] * 4 + start[1] // 15
+    last = day * 96 + end[0] * 4 + end[1] // 15
+    return (1 << last) - (1 << first)
+
+
+def by_player_ids(suggestions: list[dict]) -> list[dict]:
+    return [
+        {**s, "availablePlayers": sorted(p["id"] for p in s["availablePlayers"])}
+        for s in suggestions
+    ]
+
+
+class TestIntervalMasks:
+    """Tests for interval_masks."""
+
+    def test_whole_slots_only(self):
+        """Test partially covered slots at either end are left out."""
+        masks = list(interval_masks(datetime(2025, 5, 6, 18, 10), datetime(2025, 5, 6, 20, 40)))
+
+        assert masks == [(MONDAY, slots(1, (18, 15), (20, 30)))]
+
+    def test_crosses_weeks(self):
+        """Test an interval over Sunday midnight is split between both weeks."""
+        masks = list(interval_masks(datetime(2025, 5, 11, 22), datetime(2025, 5, 12, 1)))
+
+        assert masks == [
+            (MONDAY, slots(6, (22, 0), (24, 0))),
+            (date(2025, 5, 12), slots(0, (0, 0), (1, 0))),
+        ]
+
+
+class TestBitmapMaintenance:
+    """Tests for bitmaps kept in sync by the availability endpoints."""
+
+    def bitmaps(self, db: Session) -> dict[tuple[str, date], int]:
+        db.expire_all()
+        return {(b.userId, b.weekStart): decode(b.slots) for b in db.query(models.AvailabilityBitmap)}
+
+    def test_create_update_delete(self, client: TestClient, db: Session, party: dict):
+        """Test every write recomputes the weeks of its old and new intervals."""
+        group, alice = party["group"], party["alice"]
+        url = f"/api/groups/{group.id}/availability"
+        headers = party["headers"]["alice"]
+
+        availability_id = client.post(
+            url, json={"startDateTime": "2025-05-06T18:00:00", "endDateTime": "2025-05-06T22:00:00"}, headers=headers
+        ).json()["id"]
+        client.post(url, json={"startDateTime": "2025-05-07T18:00:00", "endDateTime": "2025-05-07T19:00:00"}, headers=headers)
+        assert self.bitmaps(db) == {(alice.id, MONDAY): slots(1, (18, 0), (22, 0)) | slots(2, (18, 0), (19, 0))}
+
+        client.put(
+            f"{url}/{availability_id}",
+            json={"startDateTime": "2025-05-13T18:00:00", "endDateTime": "2025-05-13T20:00:00"},
+            headers=headers,
+        )
+        assert self.bitmaps(db) == {
+            (alice.id, MONDAY): slots(2, (18, 0), (19, 0)),
+            (alice.id, date(2025, 5, 12)): slots(1, (18, 0), (20, 0)),
+        }
+
+        client.delete(f"{url}/{availability_id}", headers=headers)
+        assert self.bitmaps(db) == {(alice.id, MONDAY): slots(2, (18, 0), (19, 0))}
+
+    def test_strategy_endpoint(self, client: TestClient, party: dict):
+        """Test the bitset strategy answers from bitmaps written by the API."""
+        group = party["group"]
+        url = f"/api/groups/{group.id}/availability"
+        for name, start, end in (("gm", 12, 23), ("alice", 16, 22), ("bob", 18, 23)):
+            client.post(
+                url,
+                json={"startDateTime": f"2025-05-10T{start}:00:00", "endDateTime": f"2025-05-10T{end}:00:00"},
+                headers=party["headers"][name],
+            )
+
+        data = client.get(
+            f"{url}/overlaps", params={"strategy": "bitset"}, headers=party["headers"]["gm"]
+        ).json()
+
+        assert [(s["startDateTime"], s["endDateTime"], s["playerCount"]) for s in data] == [
+            ("2025-05-10T18:00:00", "2025-05-10T22:00:00", 3),
+        ]
+
+
+class TestBitsetEngine:
+    """Equivalence of the bitset engine with the sweep line on slot-aligned data."""
+
+    @pytest.mark.parametrize("seed", range(15))
+    def test_matches_sweep(self, db: Session, seed: int):
+        """Test random groups on 15-minute boundaries produce the same suggestions."""
+        entries = random_availability(seed, 15)
+        users = {entry.user.id: entry.user for entry in entries}
+        for user in users.values():
+            db.add(models.User(id=user.id, email=user.email, name=user.name))
+        db.add(models.Group(id="group-1", ownerId=next(iter(users)), name="Party"))
+        db.flush()
+        for entry in entries:
+            db.add(models.Availability(
+                id=entry.id, userId=entry.userId, groupId="group-1",
+                startDateTime=entry.startDateTime, endDateTime=entry.endDateTime,
+            ))
+        db.commit()
+        rebuild_bitmaps(db, "group-1")
+
+        for min_players in (1, 2, 3):
+            for duration_hours in (1, 3):
+                expected = find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+                actual = find_availability_overlaps_bitset(
+                    db, "group-1", min_players, duration_hours, max_suggestions=50
+                )
+                assert by_player_ids(actual) == by_player_ids(expected)
@@ -0,0 +1,188 @@
+"""Tests for bulk availability writes."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.availability_bulk import upsert_items
+from tests.test_availability import add_availability
+from tests.test_availability_sql import POSTGRES_URL, pg_db  # noqa: F401
+
+
+def at(hour: int, day: int = 10) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def item(start: datetime, end: datetime, notes: str | None = None) -> dict:
+    return {"startDateTime": start.isoformat(), "endDateTime": end.isoformat(), "notes": notes}
+
+
+def intervals(db: Session, user: models.User) -> list[tuple[datetime, datetime, str | None]]:
+    db.expire_all()
+    return [
+        (row.startDateTime, row.endDateTime, row.notes)
+        for row in db.query(models.Availability)
+        .filter(models.Availability.userId == user.id)
+        .order_by(models.Availability.startDateTime)
+    ]
+
+
+class TestBulkUpsert:
+    """Tests for PUT /groups/{id}/availability/bulk."""
+
+    def test_statuses(self, client: TestClient, db: Session, party: dict):
+        """Test every item gets a status and an existing start is updated."""
+        group, alice = party["group"], party["alice"]
+        add_availability(db, group, alice, at(18), at(19))
+
+        response = client.put(
+            f"/api/groups/{group.id}/availability/bulk",
+            json={"items": [
+                item(at(18), at(21), "updated"),
+                item(at(12, 11), at(14, 11)),
+                item(at(13, 11), at(15, 11)),
+                item(at(20, 12), at(19, 12)),
+                item(at(18, 12), at(22, 12)),
+            ]},
+            headers=party["headers"]["alice"],
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [i["status"] for i in data["items"]] == ["updated", "overlap", "overlap", "invalid", "created"]
+        assert data["deleted"] == 0
+        assert intervals(db, alice) == [(at(18), at(21), "updated"), (at(18, 12), at(22, 12), None)]
+        assert {i["id"] for i in data["items"] if i["id"]} == {
+            row.id for row in db.query(models.Availability).filter_by(userId=alice.id)
+        }
+
+    def test_replace_range(self, client: TestClient, db: Session, party: dict):
+        """Test entries starting in the range are replaced and the suggestions follow."""
+        group, alice = party["group"], party["alice"]
+        for name in ("gm", "bob"):
+            add_availability(db, group, party[name], at(12), at(23))
+        add_availability(db, group, alice, at(9), at(11))
+        add_availability(db, group, alice, at(12), at(13))
+        add_availability(db, group, alice, at(18, 11), at(20, 11))
+        url = f"/api/groups/{group.id}/availability"
+        assert client.get(f"{url}/overlaps", params={"min_players": 3}, headers=party["headers"]["gm"]).json() == []
+
+        data = client.put(
+            f"{url}/bulk",
+            json={
+                "items": [item(at(15), at(20)), item(at(9, 11), at(10, 11))],
+                "replaceStart": at(10).isoformat(),
+                "replaceEnd": at(0, 11).isoformat(),
+            },
+            headers=party["headers"]["alice"],
+        ).json()
+
+        assert [i["status"] for i in data["items"]] == ["created", "out_of_range"]
+        assert data["deleted"] == 1
+        assert intervals(db, alice) == [(at(9), at(11), None), (at(15), at(20), None), (at(18, 11), at(20, 11), None)]
+        overlaps = client.get(f"{url}/overlaps", params={"min_players": 3}, headers=party["headers"]["gm"]).json()
+        assert [(s["endDateTime"], s["playerCount"]) for s in overlaps] == [("2025-05-10T20:00:00", 3)]
+
+    def test_overlapping_entries(self, client: TestClient, db: Session, party: dict):
+        """Test items overlapping entries outside the replace range are rejected, touching ones not."""
+        group, alice = party["group"], party["alice"]
+        add_availability(db, group, alice, at(20, 9), at(2))
+        add_availability(db, group, alice, at(18, 11), at(20, 11))
+
+        data = client.put(
+            f"/api/groups/{group.id}/availability/bulk",
+            json={
+                "items": [item(at(0), at(1)), item(at(2), at(4)), item(at(22), at(18, 11)), item(at(19, 11), at(22, 11))],
+                "replaceStart": at(0).isoformat(),
+                "replaceEnd": at(0, 11).isoformat(),
+            },
+            headers=party["headers"]["alice"],
+        ).json()
+
+        assert [i["status"] for i in data["items"]] == ["overlap", "created", "created", "out_of_range"]
+        assert intervals(db, alice) == [
+            (at(20, 9), at(2), None), (at(2), at(4), None), (at(22), at(18, 11), None), (at(18, 11), at(20, 11), None),
+        ]
+
+    def test_shortened_entry_bitmaps(self, client: TestClient, party: dict):
+        """Test the weeks an updated entry no longer covers are refreshed."""
+        group = party["group"]
+        url = f"/api/groups/{group.id}/availability"
+        client.post(url, json=item(at(18), at(20, 25)), headers=party["headers"]["alice"])
+        client.post(url, json=item(at(18), at(20, 25)), headers=party["headers"]["gm"])
+
+        client.put(f"{url}/bulk", json={"items": [item(at(18), at(20))]}, headers=party["headers"]["alice"])
+
+        data = client.get(
+            f"{url}/overlaps", params={"strategy": "bitset", "min_players": 2, "duration_hours": 1}, headers=party["headers"]["gm"]
+        ).json()
+        assert [(s["startDateTime"], s["endDateTime"]) for s in data] == [("2025-05-10T18:00:00", "2025-05-10T20:00:00")]
+
+    def test_utc_timestamps(self, client: TestClient, db: Session, party: dict):
+        """Test "Z" times update and create rows like the naive UTC times they stand for."""
+        group, alice = party["group"], party["alice"]
+        add_availability(db, group, alice, at(18), at(19))
+
+        data = client.put(
+            f"/api/groups/{group.id}/availability/bulk",
+            json={
+                "items": [
+                    {"startDateTime": "2025-05-10T18:00:00Z", "endDateTime": "2025-05-10T21:00:00Z"},
+                    {"startDateTime": "2025-05-11T20:00:00+02:00", "endDateTime": "2025-05-11T22:00:00+02:00"},
+                ],
+                "replaceStart": "2025-05-10T00:00:00Z",
+                "replaceEnd": "2025-05-12T00:00:00Z",
+            },
+            headers=party["headers"]["alice"],
+        ).json()
+
+        assert [i["status"] for i in data["items"]] == ["created", "created"]
+        assert data["deleted"] == 1
+        assert intervals(db, alice) == [(at(18), at(21), None), (at(18, 11), at(20, 11), None)]
+
+        data = client.put(
+            f"/api/groups/{group.id}/availability/bulk",
+            json={"items": [{"startDateTime": "2025-05-10T18:00:00.000Z", "endDateTime": "2025-05-10T22:00:00.000Z"}]},
+            headers=party["headers"]["alice"],
+        ).json()
+
+        assert [i["status"] for i in data["items"]] == ["updated"]
+        assert intervals(db, alice)[0] == (at(18), at(22), None)
+
+    def test_bad_replace_range(self, client: TestClient, party: dict):
+        """Test a replace range needs both ends in order."""
+        response = client.put(
+            f"/api/groups/{party['group'].id}/availability/bulk",
+            json={"items": [], "replaceStart": at(10).isoformat()},
+            headers=party["headers"]["alice"],
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not set")
+def test_upsert_on_postgres(pg_db: Session):  # noqa: F811
+    """Test the multi-row upsert on PostgreSQL."""
+    pg_db.add_all([
+        models.User(id="user-1", email="user-1@example.com"),
+        models.Group(id="group-1", ownerId="user-1", name="Party"),
+    ])
+    pg_db.flush()
+    pg_db.add(models.Availability(userId="user-1", groupId="group-1", startDateTime=at(18), endDateTime=at(19)))
+    pg_db.flush()
+
+    ids, existing = upsert_items(pg_db, "group-1", "user-1", [
+        schemas.AvailabilityCreateSchema(startDateTime=at(18), endDateTime=at(22)),
+        schemas.AvailabilityCreateSchema(startDateTime=at(18, 11), endDateTime=at(20, 11)),
+    ])
+
+    assert existing == {at(18): at(19)}
+    assert set(ids) == {at(18), at(18, 11)}
+    assert pg_db.query(models.Availability.endDateTime).order_by(models.Availability.startDateTime).all() == [
+        (at(22),), (at(20, 11),),
+    ]
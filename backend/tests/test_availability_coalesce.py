@@ -0,0 +1,124 @@
+"""Tests for coalescing overlapping or touching availability."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_bitmap import decode
+from app.availability_coalesce import coalesce_availability
+from tests.test_availability import add_availability
+
+
+def at(hour: int) -> datetime:
+    return datetime(2025, 5, 10, hour)
+
+
+def rows(db: Session, user: models.User) -> list[tuple[int, int, str | None]]:
+    db.expire_all()
+    return [
+        (row.startDateTime.hour, row.endDateTime.hour, row.notes)
+        for row in db.query(models.Availability)
+        .filter(models.Availability.userId == user.id)
+        .order_by(models.Availability.startDateTime)
+    ]
+
+
+class TestCoalesceOnWrite:
+    """Tests for merging in create_availability and update_availability."""
+
+    def post(self, client: TestClient, party: dict, start: int, end: int, notes: str | None = None, **params):
+        return client.post(
+            f"/api/groups/{party['group'].id}/availability",
+            params=params,
+            json={"startDateTime": at(start).isoformat(), "endDateTime": at(end).isoformat(), "notes": notes},
+            headers=party["headers"]["alice"],
+        )
+
+    def test_create_merges_overlapping_and_touching(self, client: TestClient, db: Session, party: dict):
+        """Test three chained intervals end up as one row with their notes."""
+        self.post(client, party, 18, 20, "dinner after")
+        self.post(client, party, 22, 23)
+        response = self.post(client, party, 19, 22, "late")
+
+        assert response.status_code == 201
+        assert (response.json()["startDateTime"], response.json()["endDateTime"]) == (
+            "2025-05-10T18:00:00", "2025-05-10T23:00:00",
+        )
+        assert rows(db, party["alice"]) == [(18, 23, "late\ndinner after")]
+
+    def test_utc_payload(self, client: TestClient, db: Session, party: dict):
+        """Test "Z" and offset times, as browsers send them, are stored as naive UTC and merged."""
+        self.post(client, party, 18, 20)
+        response = client.post(
+            f"/api/groups/{party['group'].id}/availability",
+            json={"startDateTime": "2025-05-10T20:00:00.000Z", "endDateTime": "2025-05-10T23:00:00+01:00"},
+            headers=party["headers"]["alice"],
+        )
+
+        assert response.status_code == 201
+        assert rows(db, party["alice"]) == [(18, 22, None)]
+
+    def test_merge_opt_out(self, client: TestClient, db: Session, party: dict):
+        """Test merge=false keeps separate rows."""
+        self.post(client, party, 18, 20)
+        self.post(client, party, 20, 22, merge="false")
+
+        assert rows(db, party["alice"]) == [(18, 20, None), (20, 22, None)]
+
+    def test_update_takes_start_of_absorbed_row(self, client: TestClient, db: Session, party: dict):
+        """Test an update may move onto the start of a row it absorbs."""
+        self.post(client, party, 18, 19)
+        later = self.post(client, party, 21, 23).json()
+
+        response = client.put(
+            f"/api/groups/{party['group'].id}/availability/{later['id']}",
+            json={"startDateTime": at(18).isoformat()},
+            headers=party["headers"]["alice"],
+        )
+
+        assert response.status_code == 200
+        assert rows(db, party["alice"]) == [(18, 23, None)]
+
+    def test_overlaps_and_bitmaps_follow_merges(self, client: TestClient, db: Session, party: dict):
+        """Test held suggestions and bitmaps see absorbed rows disappear."""
+        group = party["group"]
+        add_availability(db, group, party["bob"], at(17), at(23))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        self.post(client, party, 18, 20)
+        assert client.get(url, headers=party["headers"]["gm"]).json() == []
+
+        self.post(client, party, 20, 22)
+
+        assert [(s["startDateTime"], s["endDateTime"]) for s in client.get(url, headers=party["headers"]["gm"]).json()] == [
+            ("2025-05-10T18:00:00", "2025-05-10T22:00:00"),
+        ]
+        db.expire_all()
+        bitmaps = db.query(models.AvailabilityBitmap).filter_by(userId=party["alice"].id).all()
+        assert [bin(decode(b.slots)).count("1") for b in bitmaps] == [16]
+
+
+class TestCoalesceCommand:
+    """Tests for coalesce_availability."""
+
+    def test_merges_existing_rows(self, db: Session, party: dict, make_group):
+        """Test runs of rows per member and group are merged into their earliest row."""
+        group = party["group"]
+        other = make_group(party["alice"], [], name="Other")
+        for start, end, notes in ((18, 20, "a"), (19, 21, "b"), (21, 22, None), (23, 24, None)):
+            db.add(models.Availability(
+                userId=party["alice"].id, groupId=group.id,
+                startDateTime=at(start), endDateTime=at(end) if end < 24 else datetime(2025, 5, 11), notes=notes,
+            ))
+        add_availability(db, other, party["alice"], at(20), at(23))
+        add_availability(db, group, party["bob"], at(20), at(23))
+        db.commit()
+
+        deleted = coalesce_availability(db)
+        db.commit()
+
+        assert deleted == {group.id: 2}
+        assert rows(db, party["alice"]) == [(18, 22, "a\nb"), (20, 23, None), (23, 0, None)]
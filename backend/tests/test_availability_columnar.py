@@ -0,0 +1,110 @@
+"""Tests for the columnar availability and overlap responses."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.routers.availability_columnar import epoch
+from app.routers.availability_strategies import STRATEGIES
+from tests.test_availability import add_availability
+
+
+def at(hour: int, day: int = 10) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def iso(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def seed(db: Session, party: dict) -> None:
+    group = party["group"]
+    for day in (10, 11, 12):
+        add_availability(db, group, party["gm"], at(12, day), at(23, day))
+        add_availability(db, group, party["alice"], at(17, day), at(22, day))
+        add_availability(db, group, party["bob"], at(19, day), at(23, day))
+
+
+def test_epoch():
+    """Test naive times are read as UTC."""
+    assert epoch(at(18)) == int(datetime(2025, 5, 10, 18, tzinfo=timezone.utc).timestamp())
+
+
+class TestColumnar:
+    """Tests for format=columnar."""
+
+    def test_list_matches_rows(self, client: TestClient, db: Session, party: dict):
+        """Test the columns rebuild the row format, with each user listed once."""
+        seed(db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = party["headers"]["gm"]
+        rows = client.get(url, headers=headers).json()
+
+        response = client.get(url, params={"format": "columnar", "limit": 100}, headers=headers)
+        data = response.json()
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert len(data["users"]) == 3
+        assert [
+            {
+                "id": data["id"][i], "user": data["users"][data["user"][i]],
+                "startDateTime": iso(data["start"][i]), "endDateTime": iso(data["end"][i]),
+                "notes": data["notes"][i], "ruleId": data["ruleId"][i],
+            }
+            for i in range(len(data["id"]))
+        ] == [
+            {key: row[key] for key in ("id", "user", "startDateTime", "endDateTime", "notes", "ruleId")}
+            for row in rows
+        ]
+        assert len(response.content) < len(client.get(url, headers=headers).content) / 2
+
+    def test_overlaps_match_rows(self, client: TestClient, db: Session, party: dict):
+        """Test suggestions and pareto alternatives rebuild the row format, cached or not."""
+        seed(db, party)
+        url = f"/api/groups/{party['group'].id}/availability/overlaps"
+        headers = party["headers"]["gm"]
+
+        for strategy in ("sweep-per-day", "pareto"):
+            params = {"strategy": strategy, "min_players": 2, "duration_hours": 1}
+            rows = client.get(url, params=params, headers=headers).json()
+            data = client.get(url, params={**params, "format": "columnar"}, headers=headers).json()
+
+            def rebuilt(columns: dict) -> list[tuple]:
+                return [
+                    (iso(start), iso(end), [data["users"][i]["id"] for i in players])
+                    for start, end, players in zip(columns["start"], columns["end"], columns["players"])
+                ]
+
+            def expected(windows: list[dict]) -> list[tuple]:
+                return [
+                    (w["startDateTime"], w["endDateTime"], [p["id"] for p in w["availablePlayers"]]) for w in windows
+                ]
+
+            assert data["date"] == [s["date"] for s in rows]
+            assert rebuilt(data) == expected(rows)
+            if strategy == "pareto":
+                assert [rebuilt(a) for a in data["alternatives"]] == [expected(s["alternatives"]) for s in rows]
+            else:
+                assert "alternatives" not in data
+
+    @pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+    def test_every_strategy(self, client: TestClient, db: Session, party: dict, strategy: str):
+        """Test every strategy's suggestions convert, computed and cached."""
+        seed(db, party)
+        url = f"/api/groups/{party['group'].id}/availability/overlaps"
+        params = {"strategy": strategy, "min_players": 2, "duration_hours": 1}
+        headers = party["headers"]["gm"]
+        rows = client.get(url, params=params, headers=headers).json()
+
+        for _ in range(2):
+            response = client.get(url, params={**params, "format": "columnar"}, headers=headers)
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["date"] == [s.get("date") for s in rows]
+            assert [iso(start) for start in data["start"]] == [s["startDateTime"] for s in rows]
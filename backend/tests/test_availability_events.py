@@ -0,0 +1,162 @@
+"""Tests for scheduled events as busy time in overlap search."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.routers.availability_events import subtract_busy
+from app.routers.availability_strategies import STRATEGIES, PreparedAvailability, run_strategy
+from app.routers.availability_sweep import find_best_window
+from tests.test_availability import add_availability
+
+MAY_10 = date(2025, 5, 10)
+
+
+def at(hour: int, day: int = 10) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def player(name: str, start: datetime, end: datetime) -> dict:
+    user = SimpleNamespace(id=name, name=name, email=f"{name}@example.com", image=None)
+    return {"user": user, "start": start, "end": end}
+
+
+class TestSubtractBusy:
+    """Tests for subtract_busy."""
+
+    def test_event_splits_day(self):
+        """Test an event inside a player's day leaves the pieces around it."""
+        days = {MAY_10: {"alice": player("alice", at(12), at(23))}}
+
+        result = subtract_busy(days, {"alice": [(at(18), at(21))]})
+
+        assert result[MAY_10]["alice"]["free"] == [(at(12), at(18)), (at(21), at(23))]
+
+    def test_event_across_midnight_and_full_cover(self):
+        """Test an event reaching into the next day is subtracted on both days."""
+        days = {
+            MAY_10: {"alice": player("alice", at(20), at(0, 11)), "bob": player("bob", at(20), at(23))},
+            date(2025, 5, 11): {"alice": player("alice", at(0, 11), at(4, 11))},
+        }
+
+        result = subtract_busy(days, {"alice": [(at(19), at(2, 11))]})
+
+        assert list(result[MAY_10]) == ["bob"]
+        assert result[date(2025, 5, 11)]["alice"]["start"] == at(2, 11)
+        assert "free" not in result[date(2025, 5, 11)]["alice"]
+
+    def test_sweep_skips_busy_piece(self):
+        """Test the sweep does not count a player during their event."""
+        days = {
+            MAY_10: {
+                "alice": player("alice", at(12), at(23)),
+                "bob": player("bob", at(12), at(23)),
+            }
+        }
+
+        window = find_best_window(subtract_busy(days, {"alice": [(at(14), at(20))]})[MAY_10], 2, 1)
+
+        assert (window["start"], window["end"]) == (at(20), at(23))
+
+
+class TestEventsInOverlaps:
+    """Tests for /overlaps with scheduled events."""
+
+    def schedule(self, client: TestClient, group_id: str, headers: dict, start: datetime, minutes: int):
+        response = client.post(
+            f"/api/groups/{group_id}/events",
+            json={"scheduledAt": start.isoformat(), "durationMinutes": minutes, "title": "Session"},
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+    @pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+    def test_no_suggestion_collides_with_events(
+        self, client: TestClient, db: Session, party: dict, make_group, strategy: str
+    ):
+        """Test events of the group and of a member's other group are left out of every strategy."""
+        group = party["group"]
+        for name in ("gm", "alice", "bob"):
+            add_availability(db, group, party[name], at(12), at(23))
+        other = make_group(party["bob"], [], name="Other")
+        self.schedule(client, group.id, party["headers"]["gm"], at(12), 180)
+        self.schedule(client, other.id, party["headers"]["bob"], at(20), 180)
+
+        data = client.get(
+            f"/api/groups/{group.id}/availability/overlaps",
+            params={"strategy": strategy, "duration_hours": 1},
+            headers=party["headers"]["gm"],
+        ).json()
+
+        assert data
+        for suggestion in data:
+            start = datetime.fromisoformat(suggestion["startDateTime"])
+            end = datetime.fromisoformat(suggestion["endDateTime"])
+            assert start >= at(15)
+            if any(p["id"] == party["bob"].id for p in suggestion["availablePlayers"]):
+                assert end <= at(20)
+
+    def test_event_write_invalidates_other_groups(self, client: TestClient, db: Session, party: dict, make_group):
+        """Test scheduling in one group refreshes the cached suggestions of a member's other group."""
+        group = party["group"]
+        for name in ("gm", "alice", "bob"):
+            add_availability(db, group, party[name], at(18), at(22))
+        other = make_group(party["bob"], [], name="Other")
+        url = f"/api/groups/{group.id}/availability/overlaps"
+
+        before = client.get(url, headers=party["headers"]["gm"]).json()
+        self.schedule(client, other.id, party["headers"]["bob"], at(18), 240)
+        after = client.get(url, headers=party["headers"]["gm"]).json()
+
+        assert [s["playerCount"] for s in before] == [3]
+        assert [s["playerCount"] for s in after] == [2]
+
+    def test_bitset_without_loading_entries(self, client: TestClient, db: Session, party: dict, make_group):
+        """Test events outside the entries' span do not make the bitset strategy load the entries."""
+        group = party["group"]
+        for name in ("gm", "alice"):
+            client.post(
+                f"/api/groups/{group.id}/availability",
+                json={"startDateTime": at(18).isoformat(), "endDateTime": at(22).isoformat()},
+                headers=party["headers"][name],
+            )
+        other = make_group(party["alice"], [], name="Other")
+        self.schedule(client, other.id, party["headers"]["alice"], at(18, 20), 180)
+
+        prepared = PreparedAvailability(db, group.id)
+        data = run_strategy("bitset", prepared, 2, 1)
+
+        assert [(s["startDateTime"], s["endDateTime"]) for s in data] == [(at(18).isoformat(), at(22).isoformat())]
+        assert prepared._entries is None
+
+        self.schedule(client, other.id, party["headers"]["alice"], at(17), 120)
+        prepared = PreparedAvailability(db, group.id)
+        data = run_strategy("bitset", prepared, 2, 1)
+
+        assert [(s["startDateTime"], s["endDateTime"]) for s in data] == [(at(19).isoformat(), at(22).isoformat())]
+
+    def test_write_next_to_event_after_warm_state(self, client: TestClient, party: dict):
+        """Test entries written onto an event's day after the day state was built leave the event out."""
+        group = party["group"]
+        url = f"/api/groups/{group.id}/availability"
+        self.schedule(client, group.id, party["headers"]["gm"], at(18, 20), 180)
+        for name in ("gm", "alice"):
+            client.post(url, json={"startDateTime": at(18).isoformat(), "endDateTime": at(23).isoformat()},
+                        headers=party["headers"][name])
+        params = {"min_players": 2, "duration_hours": 1}
+        assert len(client.get(f"{url}/overlaps", params=params, headers=party["headers"]["gm"]).json()) == 1
+
+        for name in ("gm", "alice"):
+            client.post(url, json={"startDateTime": at(18, 20).isoformat(), "endDateTime": at(23, 20).isoformat()},
+                        headers=party["headers"][name])
+        data = client.get(f"{url}/overlaps", params=params, headers=party["headers"]["gm"]).json()
+
+        assert [(s["startDateTime"], s["endDateTime"]) for s in data] == [
+            (at(18).isoformat(), at(23).isoformat()),
+            (at(21, 20).isoformat(), at(23, 20).isoformat()),
+        ]
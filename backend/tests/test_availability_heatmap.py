@@ -0,0 +1,103 @@
+"""Tests for the availability heatmap."""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.routers.availability_heatmap import availability_heatmap
+from tests.test_availability import add_availability
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 5, 10, hour, minute)
+
+
+def entry(name: str, start: datetime, end: datetime) -> SimpleNamespace:
+    user = SimpleNamespace(id=name, name=name, email=f"{name}@example.com", image=None)
+    return SimpleNamespace(userId=name, user=user, startDateTime=start, endDateTime=end)
+
+
+class TestAvailabilityHeatmap:
+    """Tests for availability_heatmap."""
+
+    def test_counts(self):
+        """Test overlapping entries count a player once and partial slots are left out."""
+        entries = [
+            entry("alice", at(18), at(20)),
+            entry("alice", at(19), at(21, 10)),
+            entry("bob", at(18, 45), at(22)),
+        ]
+
+        heatmap = availability_heatmap(entries, {}, at(18), at(22), 60)
+
+        assert heatmap["counts"] == [1, 2, 2, 1]
+        assert "masks" not in heatmap
+
+    def test_busy_and_masks(self):
+        """Test events are cut out and masks mark who is free in each slot."""
+        entries = [entry("alice", at(18), at(22)), entry("bob", at(18), at(22))]
+
+        heatmap = availability_heatmap(entries, {"bob": [(at(19), at(20))]}, at(18), at(22), 60, with_masks=True)
+
+        assert heatmap["counts"] == [2, 1, 2, 2]
+        assert [member["id"] for member in heatmap["members"]] == ["alice", "bob"]
+        assert heatmap["maskBytes"] == 1
+        assert list(base64.b64decode(heatmap["masks"])) == [0b11, 0b01, 0b11, 0b11]
+
+
+class TestHeatmapEndpoint:
+    """Tests for /availability/heatmap."""
+
+    def test_week_of_half_hours(self, client: TestClient, db: Session, party: dict):
+        """Test the endpoint counts the group's players per slot."""
+        group = party["group"]
+        add_availability(db, group, party["alice"], at(18), at(20))
+        add_availability(db, group, party["bob"], at(19), at(21))
+        url = f"/api/groups/{group.id}/availability/heatmap"
+
+        data = client.get(
+            url,
+            params={"start_date": at(18).isoformat(), "end_date": at(21).isoformat()},
+            headers=party["headers"]["gm"],
+        ).json()
+        week = client.get(
+            url, params={"start_date": at(0).isoformat(), "resolution": "15m"}, headers=party["headers"]["gm"]
+        ).json()
+
+        assert data["resolutionMinutes"] == 30
+        assert data["counts"] == [1, 1, 2, 2, 1, 1]
+        assert week["slotCount"] == 7 * 96
+        assert sum(week["counts"]) == 16
+
+    def test_utc_query(self, client: TestClient, db: Session, party: dict):
+        """Test "Z" and offset bounds select the same slots as naive UTC ones, with and without a start."""
+        group = party["group"]
+        add_availability(db, group, party["alice"], at(18), at(20))
+        add_availability(db, group, party["bob"], at(19), at(21))
+        url = f"/api/groups/{group.id}/availability/heatmap"
+        headers = party["headers"]["gm"]
+
+        naive = client.get(url, params={"start_date": at(18).isoformat(), "end_date": at(21).isoformat()}, headers=headers)
+        aware = client.get(
+            url, params={"start_date": "2025-05-10T18:00:00Z", "end_date": "2025-05-10T23:00:00+02:00"}, headers=headers
+        )
+        end_only = client.get(url, params={"end_date": "2025-05-10T21:00:00Z"}, headers=headers)
+
+        assert aware.status_code == 200
+        assert aware.json()["counts"] == naive.json()["counts"] == [1, 1, 2, 2, 1, 1]
+        assert end_only.status_code == 200
+
+    def test_range_too_large(self, client: TestClient, party: dict):
+        """Test ranges with too many slots are rejected."""
+        response = client.get(
+            f"/api/groups/{party['group'].id}/availability/heatmap",
+            params={"start_date": "2025-01-01T00:00:00", "end_date": "2026-01-01T00:00:00"},
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 400
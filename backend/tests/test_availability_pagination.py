@@ -0,0 +1,167 @@
+"""Tests for keyset pages and NDJSON streams of availability."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_pages import decode_cursor, encode_cursor, seek, sort_key
+from tests.test_availability import add_availability
+from tests.test_availability_sql import POSTGRES_URL, pg_db  # noqa: F401
+
+TUESDAY = 1 << 1
+WINDOW = {"start_date": "2025-05-01T00:00:00", "end_date": "2025-05-31T23:59:59"}
+
+
+def at(day: int, hour: int = 18) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def seed(client: TestClient, db: Session, party: dict) -> None:
+    """Rows of two members on the same starts, and a Tuesday rule of a third."""
+    group = party["group"]
+    for day in (5, 6, 12, 13):
+        add_availability(db, group, party["alice"], at(day), at(day, 22))
+        add_availability(db, group, party["bob"], at(day), at(day, 21))
+    response = client.post(
+        f"/api/groups/{group.id}/availability/rules",
+        json={
+            "weekdays": TUESDAY, "startTime": "18:00:00", "endTime": "23:00:00",
+            "validFrom": "2025-05-01", "validUntil": "2025-05-14",
+        },
+        headers=party["headers"]["gm"],
+    )
+    assert response.status_code == 201
+
+
+class TestPages:
+    """Tests for limit and cursor on GET /groups/{id}/availability."""
+
+    def test_pages_cover_the_full_list(self, client: TestClient, db: Session, party: dict):
+        """Test pages across rows and rule occurrences add up to the full list in order."""
+        seed(client, db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = party["headers"]["gm"]
+        full = client.get(url, params=WINDOW, headers=headers).json()
+
+        pages, cursor = [], None
+        while True:
+            params = {**WINDOW, "limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = client.get(url, params=params, headers=headers)
+            assert response.status_code == 200
+            pages.append(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert len(full) == 10
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+        assert [a["id"] for page in pages for a in page] == [a["id"] for a in full]
+        assert [(a["startDateTime"], a["id"]) for a in full] == sorted((a["startDateTime"], a["id"]) for a in full)
+
+    def test_unexpanded_rules_on_first_page(self, client: TestClient, db: Session, party: dict):
+        """Test rules are listed once, with the first page."""
+        seed(client, db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        params = {**WINDOW, "rules": "unexpanded", "limit": 5}
+        headers = party["headers"]["gm"]
+
+        first = client.get(url, params=params, headers=headers)
+        second = client.get(url, params={**params, "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+
+        assert ["weekdays" in a for a in first.json()] == [False] * 5 + [True]
+        assert len(second.json()) == 3
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_invalid_cursor(self, client: TestClient, party: dict):
+        """Test a malformed cursor is rejected."""
+        response = client.get(
+            f"/api/groups/{party['group'].id}/availability",
+            params={"cursor": "not a cursor"},
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "invalid_cursor"
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes to the start and id it was made from."""
+        class Entry:
+            startDateTime = at(6)
+            id = "rule-1@2025-05-06"
+
+        assert decode_cursor(encode_cursor(Entry)) == (at(6), "rule-1@2025-05-06")
+
+
+class TestStream:
+    """Tests for Accept: application/x-ndjson."""
+
+    def test_lines_match_the_list(self, client: TestClient, db: Session, party: dict):
+        """Test the stream has one line per entry of the JSON list, in order."""
+        seed(client, db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = party["headers"]["gm"]
+        full = client.get(url, params=WINDOW, headers=headers).json()
+
+        response = client.get(url, params=WINDOW, headers={**headers, "Accept": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line) for line in response.text.splitlines()] == full
+
+    def test_pages(self, client: TestClient, db: Session, party: dict):
+        """Test limit and cursor page the lines like the JSON list."""
+        seed(client, db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = party["headers"]["gm"]
+        full = client.get(url, params=WINDOW, headers=headers).json()
+
+        lines, cursor = [], None
+        while True:
+            params = {**WINDOW, "limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = client.get(url, params=params, headers={**headers, "Accept": "application/x-ndjson"})
+            page = [json.loads(line) for line in response.text.splitlines()]
+            assert response.status_code == 200
+            assert len(page) <= 3
+            lines += page
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert lines == full
+
+    def test_etag_per_representation(self, client: TestClient, db: Session, party: dict):
+        """Test the stream and the JSON list do not share an ETag."""
+        seed(client, db, party)
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = {**party["headers"]["gm"], "Accept": "application/x-ndjson"}
+        etag = client.get(url, headers=headers).headers["ETag"]
+
+        assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+        assert client.get(url, headers={**party["headers"]["gm"], "If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not set")
+def test_seek_on_postgres(pg_db: Session):  # noqa: F811
+    """Test the row-value seek and the server-side cursor on PostgreSQL."""
+    pg_db.add_all([
+        models.User(id="user-1", email="user-1@example.com"),
+        models.User(id="user-2", email="user-2@example.com"),
+        models.Group(id="group-1", ownerId="user-1", name="Party"),
+    ])
+    pg_db.flush()
+    for day in (5, 6):
+        for user_id in ("user-1", "user-2"):
+            pg_db.add(models.Availability(
+                userId=user_id, groupId="group-1", startDateTime=at(day), endDateTime=at(day, 22),
+            ))
+    pg_db.flush()
+    query = pg_db.query(models.Availability).filter(models.Availability.groupId == "group-1")
+    ordered = [sort_key(row) for row in seek(query, None)]
+
+    assert [sort_key(row) for row in seek(query, ordered[1]).yield_per(1)] == ordered[2:]
@@ -0,0 +1,94 @@
+"""Tests for the range lookups and the exclusion constraint on PostgreSQL.
+
+Set ``TEST_POSTGRES_URL`` to run these tests.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability_ranges import is_overlap_violation, set_exclusion
+from app.routers.availability_rows import load_entries
+from app.routers.availability_sql import find_availability_overlaps_sql
+from app.routers.availability_sweep import find_daily_overlaps
+from tests.test_availability import normalized
+from tests.test_availability_sql import POSTGRES_URL, load_group, pg_db  # noqa: F401
+
+pytestmark = pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not set")
+
+
+def at(hour: int, day: int = 10) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def seed(db: Session, intervals: list[tuple[datetime, datetime]]) -> None:
+    db.add_all([
+        models.User(id="user-1", email="user-1@example.com"),
+        models.Group(id="group-1", ownerId="user-1", name="Party"),
+    ])
+    db.flush()
+    db.add_all(
+        models.Availability(id=f"avail-{i}", userId="user-1", groupId="group-1", startDateTime=start, endDateTime=end)
+        for i, (start, end) in enumerate(intervals)
+    )
+    db.flush()
+
+
+def test_range_filters_match_comparisons(pg_db: Session):  # noqa: F811
+    """Test ``during &&`` selects what the two comparisons select, bounds included."""
+    intervals = [(at(9), at(12)), (at(12), at(14)), (at(18), at(23)), (at(20, 11), at(2, 12)), (at(1, 1), at(0, 30))]
+    seed(pg_db, intervals)
+    windows = [
+        (at(12), at(12)), (at(14), None), (None, at(9)), (at(23), at(20, 11)),
+        (at(0, 11), at(23, 11)), (at(0, 20), None), (at(13), at(10)),
+    ]
+
+    for start_date, end_date in windows:
+        expected = {
+            f"avail-{i}" for i, (start, end) in enumerate(intervals)
+            if (start_date is None or end >= start_date) and (end_date is None or start <= end_date)
+        }
+        assert {e.id for e in load_entries(pg_db, "group-1", start_date, end_date)} == expected, (start_date, end_date)
+
+
+def test_exclusion_constraint(pg_db: Session):  # noqa: F811
+    """Test enabling the constraint merges overlaps and then rejects them, but not touching rows."""
+    if pg_db.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'")).first() is None:
+        pytest.skip("btree_gist is not available")
+    seed(pg_db, [(at(9), at(12)), (at(11), at(13)), (at(18), at(20))])
+
+    merged = set_exclusion(pg_db, True)
+    pg_db.add(models.Availability(userId="user-1", groupId="group-1", startDateTime=at(20), endDateTime=at(21)))
+    pg_db.flush()
+
+    assert merged == {"group-1": 1}
+    with pytest.raises(IntegrityError) as excinfo, pg_db.begin_nested():
+        pg_db.add(models.Availability(userId="user-1", groupId="group-1", startDateTime=at(12), endDateTime=at(15)))
+        pg_db.flush()
+    assert is_overlap_violation(excinfo.value)
+
+    set_exclusion(pg_db, False)
+    pg_db.add(models.Availability(userId="user-1", groupId="group-1", startDateTime=at(12), endDateTime=at(15)))
+    pg_db.flush()
+
+
+def test_sql_engine_date_filters(pg_db: Session):  # noqa: F811
+    """Test the SQL engine's range filters select the same entries as the sweep's."""
+    group_id, entries = load_group(pg_db, 0)
+    first = min(entry.startDateTime for entry in entries)
+    windows = [(first + timedelta(days=2), first + timedelta(days=5)), (first + timedelta(days=3), None)]
+
+    for start_date, end_date in windows:
+        kept = [
+            entry for entry in entries
+            if entry.endDateTime >= start_date and (end_date is None or entry.startDateTime <= end_date)
+        ]
+        expected = find_daily_overlaps(kept, 2, 1, max_suggestions=50)
+        actual = find_availability_overlaps_sql(pg_db, group_id, 2, 1, start_date, end_date, max_suggestions=50)
+        assert normalized(actual) == normalized(expected)
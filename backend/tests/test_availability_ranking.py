@@ -0,0 +1,27 @@
+"""Tests for the shared suggestion ranking stage."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.routers.availability_ranking import top_k
+
+
+class TestTopK:
+    """Tests for top_k."""
+
+    @pytest.mark.parametrize("limit,offset", [(1, 0), (10, 0), (5, 7), (10, 95), (200, 0)])
+    def test_matches_sorted_slice(self, limit: int, offset: int):
+        """Test the heap selection equals sorting everything, ties included."""
+        rng = random.Random(limit * 100 + offset)
+        candidates = [(rng.randint(0, 5), i) for i in range(100)]
+
+        expected = sorted(candidates, key=lambda c: c[0])[offset:offset + limit]
+
+        assert top_k(iter(candidates), key=lambda c: c[0], limit=limit, offset=offset) == expected
+
+    def test_zero_limit(self):
+        """Test an empty page."""
+        assert top_k([3, 1, 2], key=lambda c: c, limit=0) == []
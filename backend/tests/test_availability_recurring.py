@@ -0,0 +1,196 @@
+"""Tests for recurring availability rules."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_recurring import expand_rule
+from tests.test_availability import add_availability
+
+TUESDAY = 1 << 1
+THURSDAY = 1 << 3
+
+
+def rule(**overrides) -> SimpleNamespace:
+    user = SimpleNamespace(id="user-1", name="Alice", email="alice@example.com", image=None)
+    fields = {
+        "id": "rule-1",
+        "userId": user.id,
+        "groupId": "group-1",
+        "user": user,
+        "weekdays": TUESDAY | THURSDAY,
+        "startTime": time(18),
+        "endTime": time(23),
+        "timezone": "UTC",
+        "validFrom": date(2025, 5, 1),
+        "validUntil": None,
+        "exceptions": [],
+        "notes": None,
+        "createdAt": datetime(2025, 5, 1),
+        "updatedAt": datetime(2025, 5, 1),
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+def spans(occurrences) -> list[tuple[str, str]]:
+    return [(o.startDateTime.isoformat(), o.endDateTime.isoformat()) for o in occurrences]
+
+
+class TestExpandRule:
+    """Tests for expand_rule."""
+
+    def test_weekday_mask_inside_window(self):
+        """Test only masked weekdays inside the window are expanded, in order."""
+        occurrences = expand_rule(rule(), datetime(2025, 5, 5), datetime(2025, 5, 15, 23, 59))
+
+        assert spans(occurrences) == [
+            ("2025-05-06T18:00:00", "2025-05-06T23:00:00"),
+            ("2025-05-08T18:00:00", "2025-05-08T23:00:00"),
+            ("2025-05-13T18:00:00", "2025-05-13T23:00:00"),
+            ("2025-05-15T18:00:00", "2025-05-15T23:00:00"),
+        ]
+        assert occurrences[0].id == "rule-1@2025-05-06"
+        assert occurrences[0].ruleId == "rule-1"
+
+    def test_validity_and_exceptions(self):
+        """Test dates outside validFrom/validUntil and exception dates are skipped."""
+        occurrences = expand_rule(
+            rule(validFrom=date(2025, 5, 7), validUntil=date(2025, 5, 15), exceptions=["2025-05-13"]),
+            datetime(2025, 5, 1),
+            datetime(2025, 6, 1),
+        )
+
+        assert [o.startDateTime.date().isoformat() for o in occurrences] == ["2025-05-08", "2025-05-15"]
+
+    def test_overnight_occurrence_reaches_into_window(self):
+        """Test an occurrence ending after midnight counts for a window starting that day."""
+        occurrences = expand_rule(
+            rule(weekdays=TUESDAY, startTime=time(21), endTime=time(2)),
+            datetime(2025, 5, 7),
+            datetime(2025, 5, 7, 12),
+        )
+
+        assert spans(occurrences) == [("2025-05-06T21:00:00", "2025-05-07T02:00:00")]
+
+    def test_local_time_across_dst(self):
+        """Test occurrences keep their local time when DST ends, and carry the local date."""
+        occurrences = expand_rule(
+            rule(weekdays=TUESDAY, startTime=time(0, 30), endTime=time(3), timezone="Europe/Berlin"),
+            datetime(2025, 10, 20),
+            datetime(2025, 10, 29),
+        )
+
+        # 00:30 CEST is 22:30 UTC the day before; 00:30 CET is 23:30 UTC
+        assert spans(occurrences) == [
+            ("2025-10-20T22:30:00", "2025-10-21T01:00:00"),
+            ("2025-10-27T23:30:00", "2025-10-28T02:00:00"),
+        ]
+        assert [o.id for o in occurrences] == ["rule-1@2025-10-21", "rule-1@2025-10-28"]
+
+
+class TestRuleEndpoints:
+    """Tests for recurring rules through the availability API."""
+
+    def create_rule(self, client: TestClient, group_id: str, headers: dict, **overrides):
+        payload = {
+            "weekdays": TUESDAY,
+            "startTime": "18:00:00",
+            "endTime": "23:00:00",
+            "validFrom": "2025-05-01",
+            "validUntil": "2025-05-31",
+            **overrides,
+        }
+        return client.post(f"/api/groups/{group_id}/availability/rules", json=payload, headers=headers)
+
+    def test_overlaps_use_rule_occurrences(self, client: TestClient, db: Session, party: dict):
+        """Test occurrences take part in overlaps like concrete rows."""
+        group = party["group"]
+        response = self.create_rule(client, group.id, party["headers"]["alice"], exceptions=["2025-05-13"])
+        assert response.status_code == 201
+        add_availability(db, group, party["gm"], datetime(2025, 5, 13, 17), datetime(2025, 5, 13, 23))
+        add_availability(db, group, party["gm"], datetime(2025, 5, 20, 17), datetime(2025, 5, 20, 23))
+
+        data = client.get(
+            f"/api/groups/{group.id}/availability/overlaps",
+            params={"start_date": "2025-05-01T00:00:00", "end_date": "2025-05-31T23:59:59"},
+            headers=party["headers"]["gm"],
+        ).json()
+
+        assert [(s["date"], s["startDateTime"], s["playerCount"]) for s in data] == [
+            ("2025-05-20", "2025-05-20T18:00:00", 2),
+        ]
+
+    def test_list_expanded_and_unexpanded(self, client: TestClient, party: dict):
+        """Test rules are listed as occurrences by default and as rules on request."""
+        group = party["group"]
+        rule_id = self.create_rule(client, group.id, party["headers"]["alice"]).json()["id"]
+        url = f"/api/groups/{group.id}/availability"
+        window = {"start_date": "2025-05-01T00:00:00", "end_date": "2025-05-14T00:00:00"}
+
+        expanded = client.get(url, params=window, headers=party["headers"]["gm"]).json()
+        unexpanded = client.get(url, params={**window, "rules": "unexpanded"}, headers=party["headers"]["gm"]).json()
+
+        assert [(a["startDateTime"], a["ruleId"]) for a in expanded] == [
+            ("2025-05-06T18:00:00", rule_id),
+            ("2025-05-13T18:00:00", rule_id),
+        ]
+        assert [(r["id"], r["weekdays"]) for r in unexpanded] == [(rule_id, TUESDAY)]
+
+    def test_update_and_delete_invalidate(self, client: TestClient, party: dict):
+        """Test rule writes are visible to the next overlaps read."""
+        group = party["group"]
+        url = f"/api/groups/{group.id}/availability/overlaps"
+        params = {"min_players": 1, "start_date": "2025-05-01T00:00:00", "end_date": "2025-05-31T23:59:59"}
+        rule_id = self.create_rule(client, group.id, party["headers"]["alice"]).json()["id"]
+        assert len(client.get(url, params=params, headers=party["headers"]["gm"]).json()) == 4
+
+        response = client.put(
+            f"/api/groups/{group.id}/availability/rules/{rule_id}",
+            json={"weekdays": TUESDAY | THURSDAY},
+            headers=party["headers"]["alice"],
+        )
+        assert response.status_code == 200
+        assert len(client.get(url, params=params, headers=party["headers"]["gm"]).json()) == 9
+
+        response = client.delete(
+            f"/api/groups/{group.id}/availability/rules/{rule_id}", headers=party["headers"]["alice"]
+        )
+        assert response.status_code == 204
+        assert client.get(url, params=params, headers=party["headers"]["gm"]).json() == []
+
+    def test_only_owner_can_edit(self, client: TestClient, db: Session, party: dict):
+        """Test another member cannot change a rule."""
+        group = party["group"]
+        rule_id = self.create_rule(client, group.id, party["headers"]["alice"]).json()["id"]
+
+        response = client.delete(
+            f"/api/groups/{group.id}/availability/rules/{rule_id}", headers=party["headers"]["bob"]
+        )
+
+        assert response.status_code == 403
+        assert db.query(models.AvailabilityRule).count() == 1
+
+    def test_timezone(self, client: TestClient, party: dict):
+        """Test rules default to UTC and unknown timezones are rejected."""
+        group_id, headers = party["group"].id, party["headers"]["alice"]
+
+        created = self.create_rule(client, group_id, headers)
+        local = self.create_rule(client, group_id, headers, timezone="Europe/Berlin")
+        unknown = self.create_rule(client, group_id, headers, timezone="Mars/Olympus")
+
+        assert created.json()["timezone"] == "UTC"
+        assert local.json()["timezone"] == "Europe/Berlin"
+        assert unknown.status_code == 400
+
+    def test_invalid_validity(self, client: TestClient, party: dict):
+        """Test validUntil before validFrom is rejected."""
+        response = self.create_rule(
+            client, party["group"].id, party["headers"]["alice"], validFrom="2025-06-01", validUntil="2025-05-01"
+        )
+
+        assert response.status_code == 400
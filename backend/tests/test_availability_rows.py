@@ -0,0 +1,78 @@
+"""Tests for the ORM-free availability reads."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.routers.availability_rows import (
+    encode_availability,
+    encode_listing,
+    listing_select,
+    load_entries,
+)
+
+
+def add(db: Session, group: models.Group, user: models.User, hour: int, notes: str | None = None) -> models.Availability:
+    avail = models.Availability(
+        userId=user.id, groupId=group.id, notes=notes,
+        startDateTime=datetime(2025, 5, 10, hour), endDateTime=datetime(2025, 5, 10, hour + 2),
+    )
+    db.add(avail)
+    db.commit()
+    return avail
+
+
+class TestEncoders:
+    """Tests for the compiled JSON encoders."""
+
+    def test_match_the_schemas(self, db: Session, party: dict):
+        """Test encoded rows equal the pydantic output, escapes and microseconds included."""
+        group, alice = party["group"], party["alice"]
+        alice.name = 'Alice "Ælfwynn" \\ Smith'
+        avail = add(db, group, alice, 18, "line\none\ttab ☃")
+        avail.updatedAt = datetime(2025, 5, 1, 12, 30, 15, 123456)
+        db.commit()
+
+        row = db.execute(listing_select(db, group.id)).one()
+        with_user = schemas.AvailabilityWithUserSchema.model_validate(avail)
+        plain = schemas.AvailabilitySchema.model_validate(avail)
+
+        assert encode_listing(row) == with_user.model_dump_json()
+        assert encode_availability(row) == plain.model_dump_json()
+
+
+class TestReads:
+    """Tests for the endpoints and the overlap loader."""
+
+    def test_list_mine(self, client: TestClient, db: Session, party: dict):
+        """Test the caller's entries are listed in order without users."""
+        group, alice = party["group"], party["alice"]
+        later = add(db, group, alice, 20)
+        earlier = add(db, group, alice, 12, "early")
+        add(db, group, party["bob"], 18)
+
+        data = client.get(f"/api/groups/{group.id}/availability/me", headers=party["headers"]["alice"]).json()
+
+        assert [(a["id"], a["notes"]) for a in data] == [(earlier.id, "early"), (later.id, None)]
+        assert "user" not in data[0]
+
+    def test_load_entries_shares_users(self, db: Session, party: dict):
+        """Test entries of one member share one user and filters apply."""
+        group, alice = party["group"], party["alice"]
+        for hour in (12, 16, 20):
+            add(db, group, alice, hour)
+        add(db, group, party["bob"], 18)
+
+        entries = load_entries(db, group.id, start_date=datetime(2025, 5, 10, 15))
+        mine = load_entries(db, group.id, user_ids=[alice.id])
+
+        assert [(e.userId, e.startDateTime.hour) for e in entries] == [
+            (alice.id, 16), (party["bob"].id, 18), (alice.id, 20),
+        ]
+        assert entries[0].user is entries[2].user
+        assert entries[1].user.name == party["bob"].name
+        assert len(mine) == 3
@@ -0,0 +1,89 @@
+"""Equivalence tests for the Postgres overlap engine.
+
+The engine only runs on PostgreSQL; set ``TEST_POSTGRES_URL`` to run these tests.
+Everything is written inside a transaction that is rolled back.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base, _normalize_database_url
+from app.routers.availability_sql import find_availability_overlaps_sql
+from app.routers.availability_sweep import find_daily_overlaps
+from tests.test_availability import normalized, random_availability
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture
+def pg_db() -> Generator[Session, None, None]:
+    engine = create_engine(_normalize_database_url(POSTGRES_URL))
+    connection = engine.connect()
+    transaction = connection.begin()
+    Base.metadata.create_all(bind=connection)
+    session = Session(bind=connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def load_group(db: Session, seed: int) -> tuple[str, list]:
+    """Store a random group and return its id with the reference entries."""
+    entries = random_availability(seed)
+    owner = models.User(id=f"owner-{seed}", email=f"owner-{seed}@example.com")
+    group = models.Group(id=f"group-{seed}", ownerId=owner.id, name="Party")
+    db.add_all([owner, group])
+    for user in {entry.user.id: entry.user for entry in entries}.values():
+        db.add(models.User(id=user.id, email=user.email, name=user.name))
+    for entry in entries:
+        db.add(models.Availability(
+            id=entry.id,
+            userId=entry.userId,
+            groupId=group.id,
+            startDateTime=entry.startDateTime,
+            endDateTime=entry.endDateTime,
+        ))
+    db.flush()
+    return group.id, entries
+
+
+class TestSqlEngine:
+    """The SQL engine returns the sweep's suggestions."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_sweep(self, pg_db: Session, seed: int):
+        """Test random groups produce identical suggestions."""
+        group_id, entries = load_group(pg_db, seed)
+
+        for min_players in (1, 2, 3):
+            for duration_hours in (1, 3):
+                expected = find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+                actual = find_availability_overlaps_sql(
+                    pg_db, group_id, min_players, duration_hours, max_suggestions=50
+                )
+                assert normalized(actual) == normalized(expected)
+
+    def test_date_filters_and_offset(self, pg_db: Session):
+        """Test date filters and paging match the sweep over the filtered rows."""
+        group_id, entries = load_group(pg_db, 7)
+        start = entries[len(entries) // 3].startDateTime
+        end = entries[2 * len(entries) // 3].startDateTime
+        filtered = [e for e in entries if e.endDateTime >= start and e.startDateTime <= end]
+
+        expected = find_daily_overlaps(filtered, 1, 1, max_suggestions=5, offset=2)
+        actual = find_availability_overlaps_sql(pg_db, group_id, 1, 1, start, end, max_suggestions=5, offset=2)
+
+        assert normalized(actual) == normalized(expected)
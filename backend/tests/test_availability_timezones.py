@@ -0,0 +1,78 @@
+"""Tests for bucketing availability by local days of a timezone."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.routers.availability_strategies import STRATEGIES
+from app.routers.availability_timezones import local_days
+from tests.test_availability import add_availability
+
+
+class TestLocalDays:
+    """Tests for LocalDays."""
+
+    def test_dst_day_is_shorter(self):
+        """Test the day clocks spring forward lasts 23 hours between its UTC boundaries."""
+        days = local_days("Europe/Berlin", datetime(2025, 3, 29), datetime(2025, 4, 1))
+
+        segments = list(days.clip(datetime(2025, 3, 29, 20), datetime(2025, 3, 31, 1)))
+
+        assert segments == [
+            (date(2025, 3, 29), datetime(2025, 3, 29, 20), datetime(2025, 3, 29, 23)),
+            (date(2025, 3, 30), datetime(2025, 3, 29, 23), datetime(2025, 3, 30, 22)),
+            (date(2025, 3, 31), datetime(2025, 3, 30, 22), datetime(2025, 3, 31, 1)),
+        ]
+
+    def test_end_at_local_midnight(self):
+        """Test an interval ending at local midnight stays on its day, across a year end."""
+        days = local_days("America/New_York", datetime(2024, 12, 31, 20), datetime(2025, 1, 1, 5))
+
+        segments = list(days.clip(datetime(2024, 12, 31, 20), datetime(2025, 1, 1, 5)))
+
+        assert segments == [(date(2024, 12, 31), datetime(2024, 12, 31, 20), datetime(2025, 1, 1, 5))]
+
+
+class TestOverlapsTimezone:
+    """Tests for the tz parameter of /overlaps."""
+
+    def test_utc_days_by_default(self, client: TestClient, db: Session, party: dict):
+        """Test without a tz the same evening is split at UTC midnight."""
+        group = party["group"]
+        for name in ("gm", "alice", "bob"):
+            add_availability(db, group, party[name], datetime(2025, 5, 10, 22), datetime(2025, 5, 11, 3))
+
+        data = client.get(f"/api/groups/{group.id}/availability/overlaps", headers=party["headers"]["gm"]).json()
+
+        assert [(s["date"], s["startDateTime"]) for s in data] == [("2025-05-11", "2025-05-11T00:00:00")]
+
+    @pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+    def test_local_evening_is_one_day(self, client: TestClient, db: Session, party: dict, strategy: str):
+        """Test a New York evening past UTC midnight is suggested on its local date."""
+        group = party["group"]
+        for name in ("gm", "alice", "bob"):
+            add_availability(db, group, party[name], datetime(2025, 5, 10, 22), datetime(2025, 5, 11, 3))
+        url = f"/api/groups/{group.id}/availability/overlaps"
+
+        local = client.get(
+            url, params={"strategy": strategy, "tz": "America/New_York"}, headers=party["headers"]["gm"]
+        ).json()
+
+        assert [(s["date"], s["startDateTime"], s["endDateTime"]) for s in local] == [
+            ("2025-05-10", "2025-05-10T22:00:00", "2025-05-11T03:00:00"),
+        ]
+
+    def test_unknown_timezone(self, client: TestClient, party: dict):
+        """Test an unknown timezone is rejected."""
+        response = client.get(
+            f"/api/groups/{party['group'].id}/availability/overlaps",
+            params={"tz": "Mars/Olympus"},
+            headers=party["headers"]["gm"],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "unknown_timezone"
@@ -0,0 +1,88 @@
+"""Tests for the vectorized engine reading epoch offsets from the database."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.availability_strategies import PreparedAvailability, run_strategy
+from app.routers.availability_sweep import find_daily_overlaps
+from app.routers.availability_vectorized import find_availability_overlaps_vectorized_db, load_epochs
+from tests.test_availability import normalized
+from tests.test_availability_sql import POSTGRES_URL, load_group, pg_db  # noqa: F401
+
+
+def check_matches_sweep(db: Session, seed: int) -> None:
+    group_id, entries = load_group(db, seed)
+    start, end = entries[len(entries) // 3].startDateTime, entries[2 * len(entries) // 3].startDateTime
+
+    for min_players in (1, 2, 3):
+        for duration_hours in (1, 3):
+            expected = find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+            actual = find_availability_overlaps_vectorized_db(db, group_id, min_players, duration_hours, max_suggestions=50)
+            assert normalized(actual) == normalized(expected)
+
+    kept = [entry for entry in entries if entry.endDateTime >= start and entry.startDateTime <= end]
+    expected = find_daily_overlaps(kept, 2, 1, max_suggestions=5, offset=2)
+    actual = find_availability_overlaps_vectorized_db(db, group_id, 2, 1, start, end, max_suggestions=5, offset=2)
+    assert normalized(actual) == normalized(expected)
+
+
+def check_epochs(db: Session) -> None:
+    db.add_all([
+        models.User(id="user-1", email="user-1@example.com"),
+        models.Group(id="group-1", ownerId="user-1", name="Party"),
+    ])
+    db.flush()
+    times = [datetime(1970, 1, 1), datetime(2025, 5, 10, 18, 30, 15, 250), datetime(2031, 12, 31, 23, 59, 59, 999999)]
+    for value in times:
+        db.add(models.Availability(
+            userId="user-1", groupId="group-1", startDateTime=value, endDateTime=value + timedelta(hours=1),
+        ))
+    db.flush()
+
+    user_ids, starts, ends = load_epochs(db, "group-1")
+
+    assert user_ids == ["user-1"] * 3
+    assert starts.tolist() == [(value - datetime(1970, 1, 1)) // timedelta(microseconds=1) for value in times]
+    assert (ends - starts).tolist() == [3_600_000_000] * 3
+
+
+class TestDatabaseOffsets:
+    """The vectorized engine on rows read as epoch offsets."""
+
+    def test_epochs(self, db: Session):
+        """Test SQLite computes exact offsets, microseconds included."""
+        check_epochs(db)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_sweep(self, db: Session, seed: int):
+        """Test random groups produce the sweep's suggestions, with date filters and paging."""
+        check_matches_sweep(db, seed)
+
+    def test_strategy_reads_offsets(self, db: Session):
+        """Test the strategy does not load the entries."""
+        group_id, entries = load_group(db, 3)
+        prepared = PreparedAvailability(db, group_id)
+
+        actual = run_strategy("vectorized", prepared, 2, 1, 50)
+
+        assert prepared._entries is None
+        assert normalized(actual) == normalized(find_daily_overlaps(entries, 2, 1, max_suggestions=50))
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not set")
+class TestDatabaseOffsetsOnPostgres:
+    """The same on PostgreSQL."""
+
+    def test_epochs(self, pg_db: Session):  # noqa: F811
+        """Test PostgreSQL computes exact offsets, microseconds included."""
+        check_epochs(pg_db)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_sweep(self, pg_db: Session, seed: int):  # noqa: F811
+        """Test random groups produce the sweep's suggestions, with date filters and paging."""
+        check_matches_sweep(pg_db, seed)
@@ -0,0 +1,98 @@
+"""Tests for the per-user busy index and event conflict warnings."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.busy_index import BusyInterval, UserBusyIndex
+
+
+def at(hour: int, day: int = 10) -> datetime:
+    return datetime(2025, 5, day, hour)
+
+
+def interval(event_id: str, start: datetime, end: datetime) -> BusyInterval:
+    return BusyInterval(start, end, event_id, "group-1", "Party", "Session")
+
+
+def schedule(client: TestClient, group_id: str, headers: dict, start: datetime, minutes: int) -> dict:
+    response = client.post(
+        f"/api/groups/{group_id}/events",
+        json={"scheduledAt": start.isoformat(), "durationMinutes": minutes, "title": "Session"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestUserBusyIndex:
+    """Tests for UserBusyIndex."""
+
+    def test_overlapping(self):
+        """Test a long event starting well before the query is still found."""
+        index = UserBusyIndex([
+            interval("late", at(20), at(22)),
+            interval("long", at(8), at(19)),
+            interval("early", at(9), at(10)),
+        ])
+
+        assert [i.eventId for i in index.overlapping(at(18), at(21))] == ["long", "late"]
+        assert [i.eventId for i in index.overlapping(at(10), at(11))] == ["long"]
+        assert not index.is_busy(at(22), at(23))
+
+
+class TestEventConflicts:
+    """Tests for conflict warnings and /users/me/busy."""
+
+    def test_create_and_update_warn_about_members(self, client: TestClient, party: dict, make_group):
+        """Test scheduling over a member's event in another group returns a conflict."""
+        group = party["group"]
+        other = make_group(party["bob"], [], name="Other")
+        schedule(client, other.id, party["headers"]["bob"], at(18), 180)
+
+        created = schedule(client, group.id, party["headers"]["gm"], at(20), 120)
+
+        assert [(c["userId"], c["groupName"], c["endDateTime"]) for c in created["conflicts"]] == [
+            (party["bob"].id, "Other", "2025-05-10T21:00:00"),
+        ]
+
+        updated = client.put(
+            f"/api/groups/{group.id}/events/{created['id']}",
+            json={"scheduledAt": at(21).isoformat()},
+            headers=party["headers"]["gm"],
+        ).json()
+        assert updated["conflicts"] == []
+
+    def test_own_group_events_are_not_conflicts(self, client: TestClient, party: dict):
+        """Test scheduling over the group's own event, or moving an event over itself, warns about nothing."""
+        group, headers = party["group"], party["headers"]["gm"]
+        first = schedule(client, group.id, headers, at(18), 180)
+
+        second = schedule(client, group.id, headers, at(20), 120)
+        moved = client.put(
+            f"/api/groups/{group.id}/events/{first['id']}", json={"scheduledAt": at(19).isoformat()}, headers=headers
+        ).json()
+
+        assert second["conflicts"] == []
+        assert moved["conflicts"] == []
+
+    def test_my_busy_follows_event_writes(self, client: TestClient, party: dict, make_group):
+        """Test the endpoint lists events of all groups and sees later writes."""
+        group = party["group"]
+        other = make_group(party["bob"], [], name="Other")
+        url = "/api/users/me/busy"
+        headers = party["headers"]["bob"]
+        first = schedule(client, group.id, party["headers"]["gm"], at(18, 11), 120)
+        assert [b["eventId"] for b in client.get(url, headers=headers).json()] == [first["id"]]
+
+        second = schedule(client, other.id, headers, at(12), 60)
+        busy = client.get(url, headers=headers).json()
+        assert [(b["eventId"], b["groupName"]) for b in busy] == [(second["id"], "Other"), (first["id"], "Party")]
+
+        filtered = client.get(url, params={"start_date": at(0, 11).isoformat()}, headers=headers).json()
+        assert [b["eventId"] for b in filtered] == [first["id"]]
+
+        client.delete(f"/api/groups/{group.id}/events/{first['id']}", headers=party["headers"]["gm"])
+        assert [b["eventId"] for b in client.get(url, headers=headers).json()] == [second["id"]]
@@ -0,0 +1,95 @@
+"""Tests for conditional GET of group resources."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import etags
+from app.routers import availability
+
+
+def revalidate(client: TestClient, url: str, headers: dict, etag: str):
+    return client.get(url, headers={**headers, "If-None-Match": etag})
+
+
+class TestConditionalGet:
+    """Tests for ETag and If-None-Match."""
+
+    @pytest.mark.parametrize("path", ["", "/availability", "/availability/overlaps", "/events"])
+    def test_not_modified_until_write(self, client: TestClient, party: dict, path: str):
+        """Test an unchanged group answers 304 and an availability write changes the ETag."""
+        group = party["group"]
+        url = f"/api/groups/{group.id}{path}"
+        headers = party["headers"]["gm"]
+
+        first = client.get(url, headers=headers)
+        etag = first.headers["ETag"]
+        unchanged = revalidate(client, url, headers, etag)
+
+        assert first.status_code == 200
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+
+        client.post(
+            f"/api/groups/{group.id}/availability",
+            json={"startDateTime": "2025-05-10T18:00:00", "endDateTime": "2025-05-10T22:00:00"},
+            headers=party["headers"]["alice"],
+        )
+        changed = revalidate(client, url, headers, etag)
+
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_overlaps_not_recomputed(self, client: TestClient, party: dict, monkeypatch: pytest.MonkeyPatch):
+        """Test a matching ETag is answered before any strategy runs."""
+        url = f"/api/groups/{party['group'].id}/availability/overlaps"
+        headers = party["headers"]["gm"]
+        etag = client.get(url, headers=headers).headers["ETag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("strategy ran")
+
+        monkeypatch.setattr(availability, "run_strategy", fail)
+
+        assert revalidate(client, url, headers, etag).status_code == 304
+        assert revalidate(client, url, headers, f'W/"other", {etag}').status_code == 304
+
+    def test_group_detail_follows_invites_and_profiles(self, client: TestClient, party: dict):
+        """Test invites and a member's new name change the group detail ETag."""
+        url = f"/api/groups/{party['group'].id}"
+        headers = party["headers"]["gm"]
+        etag = client.get(url, headers=headers).headers["ETag"]
+
+        client.post(f"{url}/invites", json={}, headers=headers)
+        after_invite = revalidate(client, url, headers, etag)
+        assert after_invite.status_code == 200
+
+        etag = after_invite.headers["ETag"]
+        client.put("/api/users/me", json={"name": "Alice the Bold"}, headers=party["headers"]["alice"])
+        assert revalidate(client, url, headers, etag).status_code == 200
+
+    def test_query_and_non_members(self, client: TestClient, party: dict, make_user):
+        """Test the ETag depends on the query and non-members are refused before revalidation."""
+        url = f"/api/groups/{party['group'].id}/events"
+        headers = party["headers"]["gm"]
+        etag = client.get(url, headers=headers).headers["ETag"]
+        _, stranger_headers = make_user("stranger@example.com")
+
+        assert client.get(url, params={"start_date": "2025-01-01T00:00:00"}, headers=headers).headers["ETag"] != etag
+        assert "ETag" not in client.get(url, params={"upcoming_only": True}, headers=headers).headers
+        assert revalidate(client, url, party["headers"]["alice"], etag).status_code == 304
+        assert revalidate(client, url, stranger_headers, etag).status_code == 403
+
+    def test_changes_once_per_cache_ttl(self, client: TestClient, party: dict, monkeypatch: pytest.MonkeyPatch):
+        """Test the ETag expires with the overlap caches, for writes made outside the server."""
+        url = f"/api/groups/{party['group'].id}/availability"
+        headers = party["headers"]["gm"]
+        now = 1_000 * etags._TTL_SECONDS
+        monkeypatch.setattr(etags.time, "time", lambda: now)
+        etag = client.get(url, headers=headers).headers["ETag"]
+
+        now += etags._TTL_SECONDS - 1
+        assert revalidate(client, url, headers, etag).status_code == 304
+        now += 1
+        assert revalidate(client, url, headers, etag).status_code == 200
@@ -0,0 +1,104 @@
+"""Tests for the overlap suggestion cache."""
+
+from __future__ import annotations
+
+from app.overlap_cache import OverlapCache, WriteVersions
+
+
+def key(group_id: str, min_players: int = 2) -> tuple:
+    return (group_id, min_players, 3, None, None)
+
+
+class TestOverlapCache:
+    """Tests for OverlapCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted."""
+        cache = OverlapCache(max_entries=4, ttl_seconds=60)
+
+        assert cache.get(key("g1")) is None
+        cache.set(key("g1"), ["suggestion"])
+
+        assert cache.get(key("g1")) == ["suggestion"]
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted beyond the bound."""
+        cache = OverlapCache(max_entries=2, ttl_seconds=60)
+        cache.set(key("g1"), [1])
+        cache.set(key("g2"), [2])
+        cache.get(key("g1"))
+
+        cache.set(key("g3"), [3])
+
+        assert cache.get(key("g2")) is None
+        assert cache.get(key("g1")) == [1]
+        assert cache.get(key("g3")) == [3]
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test expired entries are treated as misses."""
+        cache = OverlapCache(max_entries=4, ttl_seconds=0)
+        cache.set(key("g1"), [1])
+
+        assert cache.get(key("g1")) is None
+        assert cache.stats()["size"] == 0
+
+    def test_invalidate_group(self):
+        """Test invalidation drops every query shape of one group only."""
+        cache = OverlapCache(max_entries=8, ttl_seconds=60)
+        cache.set(key("g1", 2), [1])
+        cache.set(key("g1", 3), [2])
+        cache.set(key("g2", 2), [3])
+
+        cache.invalidate_group("g1")
+
+        assert cache.get(key("g1", 2)) is None
+        assert cache.get(key("g1", 3)) is None
+        assert cache.get(key("g2", 2)) == [3]
+
+    def test_invalidate_prefix(self):
+        """Test keys starting with a user id are dropped like a group's."""
+        cache = OverlapCache(max_entries=8, ttl_seconds=60)
+        cache.set(("user-1",), [1])
+        cache.set(("user-2",), [2])
+
+        cache.invalidate_prefix("user-1")
+
+        assert cache.get(("user-1",)) is None
+        assert cache.get(("user-2",)) == [2]
+
+
+class TestWriteVersions:
+    """Tests for WriteVersions."""
+
+    def test_bounded(self):
+        """Test only the most recently written keys are kept."""
+        versions = WriteVersions(max_keys=2)
+        for key in ("g1", "g2", "g3", "g1", "g4"):
+            versions.bump(key)
+
+        assert len(versions) == 2
+
+    def test_write_changes_version_after_eviction(self):
+        """Test a version captured before a write never matches after it, even once the key is forgotten."""
+        versions = WriteVersions(max_keys=2)
+        never_written = versions.get("g1")
+        versions.bump("g1")
+        written_once = versions.get("g1")
+        versions.bump("g1")
+
+        versions.bump("g2")
+        versions.bump("g3")
+
+        assert versions.get("g1") not in (never_written, written_once)
+
+    def test_untouched_keys_keep_their_version(self):
+        """Test a key written before others keeps its version while it is held."""
+        versions = WriteVersions(max_keys=4)
+        versions.bump("g1")
+        captured = versions.get("g1")
+
+        versions.bump("g2")
+
+        assert versions.get("g1") == captured
@@ -0,0 +1,68 @@
+"""Tests for the overlap process pool."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+
+from app.overlap_pool import OverlapPool, OverlapPoolBusy, OverlapPoolTimeout
+from app.routers.availability_sweep import find_daily_overlaps
+from tests.test_availability import normalized, random_availability
+
+
+@pytest.fixture(scope="module")
+def pool() -> Generator[OverlapPool, None, None]:
+    pool = OverlapPool(workers=2, min_entries=1, max_queue=8, timeout_seconds=60)
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+class TestOverlapPool:
+    """Tests for OverlapPool."""
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_matches_sweep(self, pool: OverlapPool, seed: int):
+        """Test chunked workers return the in-process sweep's suggestions."""
+        entries = random_availability(seed)
+
+        for min_players, duration_hours in ((1, 1), (2, 3)):
+            expected = find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+            actual = pool.find_daily_overlaps(entries, min_players, duration_hours, max_suggestions=50)
+            assert normalized(actual) == normalized(expected)
+
+    def test_offset(self, pool: OverlapPool):
+        """Test pages of the merged ranking match the sweep."""
+        entries = random_availability(3)
+
+        assert pool.find_daily_overlaps(entries, 1, 1, 4, 3) == find_daily_overlaps(entries, 1, 1, 4, 3)
+        assert pool.stats()["queue_depth"] == 0
+
+    def test_should_offload(self):
+        """Test only large naive groups are offloaded."""
+        pool = OverlapPool(workers=2, min_entries=10, max_queue=8, timeout_seconds=1)
+        entries = random_availability(0)
+
+        assert pool.should_offload(entries) == (len(entries) >= 10)
+        assert not pool.should_offload([])
+        assert not OverlapPool(workers=0, min_entries=1, max_queue=8, timeout_seconds=1).should_offload(entries)
+
+    def test_full_queue_is_rejected(self):
+        """Test submissions beyond the queue bound raise instead of waiting."""
+        pool = OverlapPool(workers=2, min_entries=1, max_queue=0, timeout_seconds=1)
+
+        with pytest.raises(OverlapPoolBusy):
+            pool.find_daily_overlaps(random_availability(1), 1, 1)
+        assert pool.stats() == {"queue_depth": 0, "submitted": 0, "rejected": 1, "timeouts": 0}
+
+    def test_timeout(self):
+        """Test a computation exceeding the timeout raises."""
+        pool = OverlapPool(workers=1, min_entries=1, max_queue=8, timeout_seconds=0)
+        try:
+            with pytest.raises(OverlapPoolTimeout):
+                pool.find_daily_overlaps(random_availability(1), 1, 1)
+            assert pool.stats()["timeouts"] == 1
+        finally:
+            pool.shutdown()
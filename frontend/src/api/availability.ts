@@ -1,13 +1,23 @@
 import apiClient from './client';
 import type {
+  AvailabilityBulkRequest,
+  AvailabilityBulkResponse,
   AvailabilityCreateRequest,
   AvailabilityUpdateRequest,
+  AvailabilityHeatmapParams,
   AvailabilityListParams,
   AvailabilityOverlapsParams,
+  AvailabilityRuleCreateRequest,
+  AvailabilityRuleUpdateRequest,
 } from '../types/api';
 import type {
   Availability,
+  AvailabilityHeatmap,
+  AvailabilityRule,
+  AvailabilityRuleWithUser,
   AvailabilityWithUser,
+  ColumnarAvailability,
+  ColumnarSuggestions,
   OverlapSuggestion,
 } from '../types/models';
 
@@ -18,12 +28,27 @@ export const availabilityApi = {
       { params }
     ),
 
+  listWithRules: (groupId: string, params?: AvailabilityListParams) =>
+    apiClient.get<(AvailabilityWithUser | AvailabilityRuleWithUser)[]>(
+      `/groups/${groupId}/availability`,
+      { params: { ...params, rules: 'unexpanded' } }
+    ),
+
+  listColumnar: (groupId: string, params?: AvailabilityListParams) =>
+    apiClient.get<ColumnarAvailability>(
+      `/groups/${groupId}/availability`,
+      { params: { ...params, format: 'columnar' } }
+    ),
+
   listMine: (groupId: string) =>
     apiClient.get<Availability[]>(`/groups/${groupId}/availability/me`),
 
   create: (groupId: string, data: AvailabilityCreateRequest) =>
     apiClient.post<Availability>(`/groups/${groupId}/availability`, data),
 
+  bulkUpsert: (groupId: string, data: AvailabilityBulkRequest) =>
+    apiClient.put<AvailabilityBulkResponse>(`/groups/${groupId}/availability/bulk`, data),
+
   update: (
     groupId: string,
     availId: string,
@@ -37,9 +62,35 @@ export const availabilityApi = {
   delete: (groupId: string, availId: string) =>
     apiClient.delete(`/groups/${groupId}/availability/${availId}`),
 
+  createRule: (groupId: string, data: AvailabilityRuleCreateRequest) =>
+    apiClient.post<AvailabilityRule>(`/groups/${groupId}/availability/rules`, data),
+
+  updateRule: (
+    groupId: string,
+    ruleId: string,
+    data: AvailabilityRuleUpdateRequest
+  ) =>
+    apiClient.put<AvailabilityRule>(
+      `/groups/${groupId}/availability/rules/${ruleId}`,
+      data
+    ),
+
+  deleteRule: (groupId: string, ruleId: string) =>
+    apiClient.delete(`/groups/${groupId}/availability/rules/${ruleId}`),
+
+  getHeatmap: (groupId: string, params?: AvailabilityHeatmapParams) =>
+    apiClient.get<AvailabilityHeatmap>(`/groups/${groupId}/availability/heatmap`, { params }),
+
   getOverlaps: (groupId: string, params?: AvailabilityOverlapsParams) =>
     apiClient.get<OverlapSuggestion[]>(
       `/groups/${groupId}/availability/overlaps`,
-      { params }
+      // Repeat list params as required_user_ids=a&required_user_ids=b
+      { params, paramsSerializer: { indexes: null } }
+    ),
+
+  getOverlapsColumnar: (groupId: string, params?: AvailabilityOverlapsParams) =>
+    apiClient.get<ColumnarSuggestions>(
+      `/groups/${groupId}/availability/overlaps`,
+      { params: { ...params, format: 'columnar' }, paramsSerializer: { indexes: null } }
     ),
 };
@@ -4,7 +4,7 @@ import type {
   EventUpdateRequest,
   EventListParams,
 } from '../types/api';
-import type { Event } from '../types/models';
+import type { Event, EventWithConflicts } from '../types/models';
 
 export const eventsApi = {
   list: (groupId: string, params?: EventListParams) =>
@@ -14,10 +14,10 @@ export const eventsApi = {
     apiClient.get<Event>(`/groups/${groupId}/events/${eventId}`),
 
   create: (groupId: string, data: EventCreateRequest) =>
-    apiClient.post<Event>(`/groups/${groupId}/events`, data),
+    apiClient.post<EventWithConflicts>(`/groups/${groupId}/events`, data),
 
   update: (groupId: string, eventId: string, data: EventUpdateRequest) =>
-    apiClient.put<Event>(`/groups/${groupId}/events/${eventId}`, data),
+    apiClient.put<EventWithConflicts>(`/groups/${groupId}/events/${eventId}`, data),
 
   delete: (groupId: string, eventId: string) =>
     apiClient.delete(`/groups/${groupId}/events/${eventId}`),
@@ -1,4 +1,6 @@
 import apiClient from './client';
+import type { MyBusyParams, MySuggestionsParams } from '../types/api';
+import type { BusyInterval, GroupSuggestion } from '../types/models';
 
 export const usersApi = {
   updateProfile: (data: { name?: string; image?: string }) =>
@@ -14,4 +16,10 @@ export const usersApi = {
 
   changePassword: (data: { currentPassword: string; newPassword: string }) =>
     apiClient.post('/users/me/password', data),
+
+  getMyBusy: (params?: MyBusyParams) =>
+    apiClient.get<BusyInterval[]>('/users/me/busy', { params }),
+
+  getMySuggestions: (params?: MySuggestionsParams) =>
+    apiClient.get<GroupSuggestion[]>('/users/me/suggestions', { params }),
 };
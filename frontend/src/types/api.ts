@@ -69,16 +69,57 @@ export interface AvailabilityCreateRequest {
   notes?: string;
 }
 
+export interface AvailabilityBulkRequest {
+  items: AvailabilityCreateRequest[]; // at most 500
+  // Replace own entries starting in [replaceStart, replaceEnd); every item must start in it
+  replaceStart?: string;
+  replaceEnd?: string;
+}
+
+export interface AvailabilityBulkResponse {
+  items: {
+    index: number;
+    status: 'created' | 'updated' | 'invalid' | 'overlap' | 'out_of_range';
+    id: string | null;
+  }[];
+  deleted: number;
+}
+
 export interface AvailabilityUpdateRequest {
   startDateTime?: string;
   endDateTime?: string;
   notes?: string;
 }
 
+export interface AvailabilityRuleCreateRequest {
+  weekdays: number;
+  startTime: string;
+  endTime: string;
+  timezone?: string; // IANA, defaults to "UTC"
+  validFrom: string;
+  validUntil?: string | null;
+  exceptions?: string[];
+  notes?: string;
+}
+
+export type AvailabilityRuleUpdateRequest = Partial<AvailabilityRuleCreateRequest>;
+
 // Query params
 export interface AvailabilityListParams {
   start_date?: string;
   end_date?: string;
+  // Page size; the X-Next-Cursor response header requests the next page
+  limit?: number;
+  cursor?: string;
+}
+
+export type OverlapStrategy = 'sweep-per-day' | 'merged-windows' | 'by-days' | 'vectorized' | 'sql' | 'bitset' | 'pareto';
+
+export interface AvailabilityHeatmapParams {
+  resolution?: '15m' | '30m' | '1h';
+  start_date?: string;
+  end_date?: string;
+  masks?: boolean;
 }
 
 export interface AvailabilityOverlapsParams {
@@ -86,6 +127,28 @@ export interface AvailabilityOverlapsParams {
   duration_hours?: number;
   start_date?: string;
   end_date?: string;
+  strategy?: OverlapStrategy;
+  limit?: number;
+  offset?: number;
+  required_user_ids?: string[];
+  optional_user_ids?: string[];
+  require_gm?: boolean;
+  tz?: string; // IANA timezone whose local days group suggestions, e.g. 'Europe/Berlin'
+}
+
+export interface MySuggestionsParams {
+  min_players?: number;
+  duration_hours?: number;
+  start_date?: string;
+  end_date?: string;
+  limit?: number;
+  offset?: number;
+  tz?: string;
+}
+
+export interface MyBusyParams {
+  start_date?: string;
+  end_date?: string;
 }
 
 export interface EventListParams {
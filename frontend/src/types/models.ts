@@ -36,6 +36,24 @@ export interface Invite {
   createdAt: string;
 }
 
+export interface BusyInterval {
+  eventId: string;
+  groupId: string;
+  groupName: string;
+  title: string;
+  startDateTime: string;
+  endDateTime: string;
+}
+
+export interface EventConflict extends BusyInterval {
+  userId: string;
+}
+
+// Returned by create/update: members already booked in another event at that time
+export interface EventWithConflicts extends Event {
+  conflicts: EventConflict[];
+}
+
 export interface Event {
   id: string;
   groupId: string;
@@ -56,12 +74,33 @@ export interface Availability {
   notes: string | null;
   createdAt: string;
   updatedAt: string;
+  ruleId?: string | null; // set on occurrences expanded from a recurring rule
 }
 
 export interface AvailabilityWithUser extends Availability {
   user: MembershipUser;
 }
 
+export interface AvailabilityRule {
+  id: string;
+  userId: string;
+  groupId: string;
+  weekdays: number; // bit 0 = Monday ... bit 6 = Sunday
+  startTime: string; // HH:MM:SS
+  endTime: string; // at or before startTime: ends the next day
+  timezone: string; // IANA timezone of the times and dates
+  validFrom: string; // YYYY-MM-DD
+  validUntil: string | null;
+  exceptions: string[];
+  notes: string | null;
+  createdAt: string;
+  updatedAt: string;
+}
+
+export interface AvailabilityRuleWithUser extends AvailabilityRule {
+  user: MembershipUser;
+}
+
 export interface GroupBase {
   id: string;
   ownerId: string;
@@ -83,4 +122,56 @@ export interface OverlapSuggestion {
   playerCount: number;
   duration_hours: number;
   availablePlayers: MembershipUser[];
+  alternatives?: OverlapAlternative[]; // 'pareto' strategy only
+}
+
+// A smaller subset of players that can play longer on the same day
+export type OverlapAlternative = Omit<OverlapSuggestion, 'date' | 'alternatives'>;
+
+// format=columnar: users once, then one array element per entry; times in epoch seconds (UTC)
+export interface ColumnarAvailability {
+  users: MembershipUser[];
+  id: string[];
+  user: number[]; // index into users
+  start: number[];
+  end: number[];
+  notes: (string | null)[];
+  ruleId: (string | null)[];
+  rules?: AvailabilityRuleWithUser[]; // rules=unexpanded, first page only
+}
+
+export interface ColumnarWindows {
+  start: number[];
+  end: number[];
+  players: number[][]; // indexes into users
+}
+
+export interface ColumnarSuggestions extends ColumnarWindows {
+  users: Omit<MembershipUser, 'isGM'>[];
+  date: (string | null)[]; // null for suggestions without a date
+  alternatives?: ColumnarWindows[]; // 'pareto' strategy only, one table per suggestion
+}
+
+export interface AvailabilityHeatmap {
+  startDateTime: string;
+  resolutionMinutes: number;
+  slotCount: number;
+  counts: number[]; // free players per slot
+  // Only with masks=true: base64, maskBytes bytes per slot, bit i (LSB first) = members[i] is free
+  members?: MembershipUser[];
+  maskBytes?: number;
+  masks?: string;
+}
+
+export interface SuggestionConflict {
+  groupId: string;
+  groupName: string;
+  startDateTime: string;
+  endDateTime: string;
+}
+
+export interface GroupSuggestion extends OverlapSuggestion {
+  groupId: string;
+  groupName: string;
+  conflicts: SuggestionConflict[];
 }